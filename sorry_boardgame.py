@@ -17,11 +17,37 @@
 # future consideration: prompt user for confirmation of their play if their selected play has a score significantly lower than their possible play of highest score
 
 
+import argparse
+import asyncio
+import atexit
+import base64
+import collections
+import concurrent.futures
 import copy
+import hashlib
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+import os
 import random
+import signal
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
 from enum import Enum
 from os import system, name
 
+try:
+    import numpy
+    import numpy.lib.format
+except ImportError:  # NumPy is only required for generating training data, scoring plays with a PlayScoringModel, sharing tables across worker processes (see SharedTables), and generating the endgame tablebase
+    numpy = None
+
 
 class Color(Enum):  # maps color names to strings that, when printed, turn the subsequent text to that color
     # BLACK = '\033[0;30m'  # unused/unnecessary
@@ -29,8 +55,8 @@ class Color(Enum):  # maps color names to strings that, when printed, turn the s
     GREEN = '\033[0;32m'
     YELLOW = '\033[0;33m'
     BLUE = '\033[0;34m'
-    # PURPLE = '\033[0;35m'  # unused/unnecessary
-    # CYAN = '\033[0;36m'  # unused/unnecessary
+    PURPLE = '\033[0;35m'  # only seated on boards of more than four sides (see get_board_geometry())
+    CYAN = '\033[0;36m'  # only seated on boards of more than four sides (see get_board_geometry())
     # WHITE = '\033[0;37m'  # unused/unnecessary
     RESET = '\033[0;0m'
 
@@ -83,17 +109,21 @@ def get_text_color(letter):
         return Color.RED.value
     elif letter == Color.YELLOW.name[0]:
         return Color.YELLOW.value
+    elif letter == Color.PURPLE.name[0]:
+        return Color.PURPLE.value
+    elif letter == Color.CYAN.name[0]:
+        return Color.CYAN.value
     return Color.RESET.value
 
 
 class Player:
-    def __init__(self, player_color, player_type, max_hand_size):
+    def __init__(self, player_color, player_type, max_hand_size, card_select_method=None):  # card_select_method (if provided) skips prompting a human-controlled player for how they select cards (such as for remote players whose client does the selecting)
         self.name = player_color.name.lower().capitalize()
         self.player_type = player_type  # PlayerType.COMPUTER for computer-controlled or PlayerType.HUMAN for human-controlled
         self.pawns = dict.fromkeys((self.name[0] + str(i) for i in range(1, 5)), SpecialLocation.START.value)  # pawn label and pawn x and y coordinates (zero indexed, on the game board (see where the game board is printed) cells (not individual characters), and where down and right are positive) or SpecialLocation.START.value for start or SpecialLocation.HOME.value for home of each of the player's four pawns
         self.cards_in_hand = []
-        self.card_select_method = None if max_hand_size != 0 and self.player_type != PlayerType.COMPUTER else CardSelectMethod.BY_VALUE  # if there are no hands of cards or if this is a computer-controlled player, cards are selected by value
-        if self.player_type == PlayerType.HUMAN:
+        self.card_select_method = card_select_method if max_hand_size != 0 and self.player_type != PlayerType.COMPUTER else CardSelectMethod.BY_VALUE  # if there are no hands of cards or if this is a computer-controlled player, cards are selected by value
+        if self.player_type == PlayerType.HUMAN and not isinstance(self.card_select_method, CardSelectMethod):
             while self.card_select_method not in [CardSelectMethod.BY_INDEX.value, CardSelectMethod.BY_VALUE.value]:
                 self.card_select_method = input(f"{get_text_color(self.name[0])}{self.name}{Color.RESET.value}, do you want to select cards to play from your hand by their 1-{max_hand_size} index ({CardSelectMethod.BY_INDEX.value}) or by their value ({CardSelectMethod.BY_VALUE.value})? ")
             if self.card_select_method == CardSelectMethod.BY_INDEX.value:
@@ -325,27 +355,18 @@ def print_hand_of_cards(player):
     print(*player.cards_in_hand)
 
 
-def draw_card(draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players):  # returns the drawn card and how many times to show the last discard pile; adjusts the provided draw pile and discard pile by shuffling the discard pile back into the draw pile as necessary; also updates the last discard pile
+def draw_card(draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players, random_generator=random):  # returns the drawn card and how many times to show the last discard pile; adjusts the provided draw pile and discard pile by shuffling the discard pile back into the draw pile (with random_generator, a random.Random or the random module) as necessary; also updates the last discard pile
     if not draw_pile:
         draw_pile.extend(discard_pile)
         last_discard_pile.clear()
         last_discard_pile.extend(discard_pile)
         discard_pile.clear()
-        random.shuffle(draw_pile)
-        print("Shuffled discard pile back into the draw pile.")
+        random_generator.shuffle(draw_pile)  # (see draw_card_into_hand() for publishing the reshuffle)
     return draw_pile.pop(), (num_times_to_show_last_discard_pile if discard_pile else num_players - 1)  # num_players - 1 show as not to show the last discard pile to the player that played the last card into it
 
 
 def get_teammate_letter(player_letter):  # returns an empty string on error
-    if player_letter == Color.BLUE.name[0]:
-        return Color.GREEN.name[0]
-    elif player_letter == Color.GREEN.name[0]:
-        return Color.BLUE.name[0]
-    elif player_letter == Color.RED.name[0]:
-        return Color.YELLOW.name[0]
-    elif player_letter == Color.YELLOW.name[0]:
-        return Color.RED.name[0]
-    return ''
+    return STANDARD_BOARD.teammate_letters.get(player_letter, '')
 
 
 def bump_pawns_at_coordinates(all_pawns, coordinates):  # moves all pawns in all_pawns that are currently located at coordinates found in the coordinates list parameter (consisting of dictionaries of ordered (x, y) pairs) to their SpecialLocation.START.value location
@@ -386,7 +407,7 @@ def binary_search(value_to_find, array_to_search, access_array=None):  # array_t
     return current_index if min_index != max_index else None
 
 
-def move_pawn(num_spaces, label_of_pawn_to_move, all_pawns, name_of_player_making_move=None):  # takes the number of spaces to move the pawn of label label_of_pawn_to_move and an adjusted dictionary of all the pawns (having moved bumped pawns back to their SpecialLocation.START.value); returns (if name_of_player_making_move is provided) whether the movement was valid
+def move_pawn(num_spaces, label_of_pawn_to_move, all_pawns, name_of_player_making_move=None, slides_taken=None):  # takes the number of spaces to move the pawn of label label_of_pawn_to_move and an adjusted dictionary of all the pawns (having moved bumped pawns back to their SpecialLocation.START.value); returns (if name_of_player_making_move is provided) whether the movement was valid; (if slides_taken is provided) appends a (pawn label, slide start location, slide end location) tuple to slides_taken if the pawn rides a slide
     is_movement_forward = (num_spaces > 0)
     while num_spaces != 0:
         if all_pawns[label_of_pawn_to_move] == SpecialLocation.HOME.value:
@@ -394,14 +415,7 @@ def move_pawn(num_spaces, label_of_pawn_to_move, all_pawns, name_of_player_makin
                 return False
             return
         elif all_pawns[label_of_pawn_to_move] == SpecialLocation.START.value:  # note that movements from the SpecialLocation.START.value are accepted, but anticipate the movement to be nonnegative
-            if label_of_pawn_to_move[0] == Color.GREEN.name[0]:
-                all_pawns[label_of_pawn_to_move] = Location.GREEN_START_EXIT.value.copy()
-            elif label_of_pawn_to_move[0] == Color.RED.name[0]:
-                all_pawns[label_of_pawn_to_move] = Location.RED_START_EXIT.value.copy()
-            elif label_of_pawn_to_move[0] == Color.YELLOW.name[0]:
-                all_pawns[label_of_pawn_to_move] = Location.YELLOW_START_EXIT.value.copy()
-            elif label_of_pawn_to_move[0] == Color.BLUE.name[0]:  # this last condition check is actually redundant
-                all_pawns[label_of_pawn_to_move] = Location.BLUE_START_EXIT.value.copy()
+            all_pawns[label_of_pawn_to_move] = get_start_exit_location(label_of_pawn_to_move[0])
             break  # no further movement is allowed if the pawn is moved from its start location
         elif all_pawns[label_of_pawn_to_move][Coordinate.X] not in [Coordinate.MIN_X.value, Coordinate.MAX_X.value] and all_pawns[label_of_pawn_to_move][Coordinate.Y] not in [Coordinate.MIN_Y.value, Coordinate.MAX_Y.value]:  # if in a safe zone
             if label_of_pawn_to_move[0] == Color.GREEN.name[0]:
@@ -417,9 +431,9 @@ def move_pawn(num_spaces, label_of_pawn_to_move, all_pawns, name_of_player_makin
         elif all_pawns[label_of_pawn_to_move] == Location.GREEN_SAFETY_ZONE_ENTRANCE.value and label_of_pawn_to_move[0] == Color.GREEN.name[0]:  # if the pawn is green and at the entrance to the green player's safe zone
             all_pawns[label_of_pawn_to_move][Coordinate.Y if is_movement_forward else Coordinate.X] += (1 if is_movement_forward else -1)
         elif all_pawns[label_of_pawn_to_move] == Location.RED_SAFETY_ZONE_ENTRANCE.value and label_of_pawn_to_move[0] == Color.RED.name[0]:  # if the pawn is red and at the entrance to the red player's safe zone
-            all_pawns[label_of_pawn_to_move][Coordinate.X if is_movement_forward else Coordinate.Y] += (-1 if is_movement_forward else 1)
+            all_pawns[label_of_pawn_to_move][Coordinate.X if is_movement_forward else Coordinate.Y] -= 1  # backward from the entrance is up the right edge
         elif all_pawns[label_of_pawn_to_move] == Location.YELLOW_SAFETY_ZONE_ENTRANCE.value and label_of_pawn_to_move[0] == Color.YELLOW.name[0]:  # if the pawn is yellow and at the entrance to the yellow player's safe zone
-            all_pawns[label_of_pawn_to_move][Coordinate.X if is_movement_forward else Coordinate.Y] += (1 if is_movement_forward else -1)
+            all_pawns[label_of_pawn_to_move][Coordinate.X if is_movement_forward else Coordinate.Y] += 1  # backward from the entrance is down the left edge
         elif all_pawns[label_of_pawn_to_move] == Location.BLUE_SAFETY_ZONE_ENTRANCE.value and label_of_pawn_to_move[0] == Color.BLUE.name[0]:  # if the pawn is blue and at the entrance to the blue player's safe zone
             all_pawns[label_of_pawn_to_move][Coordinate.Y if is_movement_forward else Coordinate.X] += (-1 if is_movement_forward else 1)
         elif all_pawns[label_of_pawn_to_move][Coordinate.X] not in [Coordinate.MIN_X.value, Coordinate.MAX_X.value] and all_pawns[label_of_pawn_to_move][Coordinate.Y] == Coordinate.MIN_Y.value:  # if pawn is on top edge of board
@@ -448,6 +462,8 @@ def move_pawn(num_spaces, label_of_pawn_to_move, all_pawns, name_of_player_makin
             coordinate_to_update = list(slide_object[1].keys())[0]
             saved_pawn_location = all_pawns[label_of_pawn_to_move].copy()  # save the location of where the moved pawn belongs as bump_pawns_at_coordinates() will indiscriminately send it back to SpecialLocation.START.value
             saved_pawn_location[coordinate_to_update] += slide_locations[this_slide_location_index][1][coordinate_to_update]  # save the location of where the moved pawn belongs as bump_pawns_at_coordinates() will indiscriminately send it back to SpecialLocation.START.value
+            if slides_taken is not None:
+                slides_taken.append((label_of_pawn_to_move, all_pawns[label_of_pawn_to_move].copy(), saved_pawn_location.copy()))
             bump_pawns_at_coordinates(all_pawns, list(({Coordinate.X: x_value, Coordinate.Y: saved_pawn_location[Coordinate.Y]} for x_value in range(min(saved_pawn_location[Coordinate.X], all_pawns[label_of_pawn_to_move][Coordinate.X]), max(saved_pawn_location[Coordinate.X], all_pawns[label_of_pawn_to_move][Coordinate.X]) + 1)) if saved_pawn_location[Coordinate.Y] in [Coordinate.MIN_Y.value, Coordinate.MAX_Y.value] else ({Coordinate.X: saved_pawn_location[Coordinate.X], Coordinate.Y: y_value} for y_value in range(min(saved_pawn_location[Coordinate.Y], all_pawns[label_of_pawn_to_move][Coordinate.Y]), max(saved_pawn_location[Coordinate.Y], all_pawns[label_of_pawn_to_move][Coordinate.Y]) + 1))))
             all_pawns[label_of_pawn_to_move] = saved_pawn_location
             if name_of_player_making_move is not None:
@@ -528,29 +544,68 @@ def is_some_valid_split_for_seven(pawn_targets, name_of_player_to_play, all_pawn
     return False
 
 
-def is_some_valid_move_for_ten(pawn_targets, name_of_player_to_play, all_pawns, are_teams):  # card value is assumed to be '10'; returns a boolean
-    return is_valid_target(pawn_targets, '10', name_of_player_to_play, all_pawns, are_teams, None, True) or is_valid_target(pawn_targets, '10', name_of_player_to_play, all_pawns, are_teams, None, False)
-
-
-def is_some_valid_swap_for_eleven(existing_pawn_target, name_of_player_to_play, all_pawns, are_teams):  # card value is assumed to be '11'; returns a boolean
-    for pawn_label in all_pawns:
-        if pawn_label != existing_pawn_target and is_valid_target([existing_pawn_target, pawn_label], '11', name_of_player_to_play, all_pawns, are_teams, None, False):
-            return True
-    return False
-
-
-def is_some_valid_play_for_sorry(existing_pawn_target, name_of_player_to_play, all_pawns, are_teams):  # card value is assumed to be 'Sorry'; returns a boolean
-    for pawn_label in all_pawns:
-        if pawn_label != existing_pawn_target and is_valid_target([existing_pawn_target, pawn_label], 'Sorry', name_of_player_to_play, all_pawns, are_teams, None, False):
-            return True
-    return False
-
-
-def add_play_score_attribute(play, hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile):  # adds a 'play_score' attribute with a corresponding score to the play dictionary parameter according to the estimated value of executing the play using the rest of the parameters
-    play['play_score'] = random.randrange(100)  # primitive (random) solution  # TODO: better scoring heuristics
-
-
-def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile=None):  # hand_of_cards is required as valid moves (e.g. discarding is only allowed when the only other valid play is playing an eleven as a swap) depend on other whether other cards have moves; do_return_whether_is_some is a boolean representing whether (if True) to return whether there is at least one valid play instead of returning an array of the enumerated valid plays; the presence of discard_pile parameter indicates to score each possible play (for a computer-controlled player)
+def add_play_score_attribute(play, hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator=random, model=None):  # adds a 'play_score' attribute with a corresponding score to the play dictionary parameter according to the estimated value of executing the play using the rest of the parameters; if a PlayScoringModel is given, scoring is instead left to add_play_score_attributes_in_batch() so every play of the turn is scored at once
+    if model is not None:
+        return
+    play['play_score'] = random_generator.randrange(100)  # primitive (random) solution  # TODO: better scoring heuristics
+
+
+class PlayScoringModel:  # a multilayer perceptron (a linear model if it has a single layer) with ReLU hidden layers scoring plays by their features (see write_position_features() and write_play_features())
+    def __init__(self, layer_weights, layer_biases):  # takes lists of NumPy weight matrices (inputs by outputs) and bias vectors, one of each per layer, the last layer having a single output
+        self.layer_weights = layer_weights
+        self.layer_biases = layer_biases
+
+    def score(self, features):  # takes a matrix with a row of features per play; returns a vector of scores
+        activations = features
+        for layer_index in range(len(self.layer_weights)):
+            activations = activations @ self.layer_weights[layer_index] + self.layer_biases[layer_index]
+            if layer_index != len(self.layer_weights) - 1:
+                numpy.maximum(activations, 0, out=activations)
+        return activations[:, 0]
+
+
+play_scoring_model = None  # the PlayScoringModel computer-controlled players score plays with (None for the built-in scoring); loaded once per process and only read afterward (worker processes attach to its arrays as SharedTables; see create_process_pool())
+play_scoring_model_path = None
+
+
+def read_play_scoring_model(path):  # returns the PlayScoringModel held by a .npz file of arrays named weights_0, biases_0, weights_1, biases_1, and so on; raises ValueError if the file holds no such model
+    if numpy is None:
+        raise RuntimeError("play scoring models require NumPy")
+    layer_weights = []
+    layer_biases = []
+    with numpy.load(path) as model_file:
+        while f"weights_{len(layer_weights)}" in model_file:
+            layer_weights.append(numpy.ascontiguousarray(model_file[f"weights_{len(layer_weights)}"], numpy.float32))
+            layer_biases.append(numpy.ascontiguousarray(model_file[f"biases_{len(layer_biases)}"], numpy.float32))
+    if not layer_weights or layer_weights[0].shape[0] != POSITION_FEATURE_WIDTH + PLAY_FEATURE_WIDTH or layer_weights[-1].shape[1] != 1 or any(layer_weights[layer_index].shape[1] != layer_weights[layer_index + 1].shape[0] for layer_index in range(len(layer_weights) - 1)) or any(layer_biases[layer_index].shape != (layer_weights[layer_index].shape[1],) for layer_index in range(len(layer_weights))):
+        raise ValueError(f"{path} does not hold a play scoring model taking {POSITION_FEATURE_WIDTH + PLAY_FEATURE_WIDTH} features")
+    for array in layer_weights + layer_biases:
+        array.setflags(write=False)
+    return PlayScoringModel(layer_weights, layer_biases)
+
+
+def load_play_scoring_model(path):  # loads the PlayScoringModel (used by every computer-controlled player of this process) of a .npz file (see read_play_scoring_model()); does nothing if the file was already loaded
+    global play_scoring_model, play_scoring_model_path
+    if path == play_scoring_model_path:
+        return
+    play_scoring_model = read_play_scoring_model(path)
+    play_scoring_model_path = path
+
+
+def add_play_score_attributes_in_batch(possible_plays, hand_of_cards, name_of_player_to_play, all_pawns, discard_pile, model):  # adds a 'play_score' attribute to every possible play using the given PlayScoringModel, featurizing the plays into one matrix so they are scored by a single pass through the model
+    if not possible_plays:
+        return
+    features = numpy.empty((len(possible_plays), POSITION_FEATURE_WIDTH + PLAY_FEATURE_WIDTH), numpy.float32)
+    write_position_features(features[0], hand_of_cards, name_of_player_to_play, all_pawns, discard_pile)
+    features[1:, :POSITION_FEATURE_WIDTH] = features[0, :POSITION_FEATURE_WIDTH]  # every play of the turn starts from the same position
+    for play_index in range(len(possible_plays)):
+        write_play_features(features[play_index, POSITION_FEATURE_WIDTH:], possible_plays[play_index])
+    scores = model.score(features)
+    for play_index in range(len(possible_plays)):
+        possible_plays[play_index]['play_score'] = float(scores[play_index])
+
+
+def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile=None, random_generator=random, model=None):  # hand_of_cards is required as valid moves (e.g. discarding is only allowed when the only other valid play is playing an eleven as a swap) depend on other whether other cards have moves; do_return_whether_is_some is a boolean representing whether (if True) to return whether there is at least one valid play instead of returning an array of the enumerated valid plays; the presence of discard_pile parameter indicates to score each possible play (for a computer-controlled player), with model (a PlayScoringModel) if provided, otherwise by the built-in scoring
     possible_plays = []  # an array containing dictionaries of the (first) card to play (card_to_play), an array of any and all pawn targets (pawn_targets) called for by the play, (if discard_pile is not None and not do_return_whether_is_some) a score (play_score) of the play, and (if the card to play is a ten) a boolean (is_card_a_ten_as_backward_one) specifying to use the ten to move a/the pawn backwards by one
     for card in hand_of_cards:
         if card in ['1', '2', '3', '4', '5', '8', '11', '12']:
@@ -559,7 +614,7 @@ def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, a
                     if do_return_whether_is_some:
                         return True
                     possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label]})
-                    add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                    add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
             if card == '2':
                 can_2_validly_move_some_pawn = False  # to be corrected as necessary
                 for possible_play in reversed(possible_plays):  # reversed possible_plays to improve time complexity as really only the last/latest element of possible_plays should be checked for 'card_to_play' equaling '2'
@@ -570,7 +625,7 @@ def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, a
                     if do_return_whether_is_some:
                         return True
                     possible_plays.append({'card_to_play': card, 'pawn_targets': []})  # playing a 2 purely as a draw (without moving a pawn and hence an empty pawn_targets array) is a valid play if and only if the 2 cannot validly move a pawn
-                    add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                    add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
             elif card == '11':
                 for pawn_label_1 in all_pawns:
                     for pawn_label_2 in all_pawns:
@@ -578,7 +633,7 @@ def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, a
                             if do_return_whether_is_some:
                                 return True
                             possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label_1, pawn_label_2]})
-                            add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                            add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
         elif card == '7':
             if can_sevens_be_split_across_more_than_two_pawns:
                 pawn_indices = [0] * int(card)  # the indices of the pawns in movable_pawns to assign each movement distance to (for a total distance of seven)
@@ -595,7 +650,7 @@ def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, a
                     if not is_valid_target(possible_plays[len(possible_plays) - 1]['pawn_targets'], card, name_of_player_to_play, all_pawns, are_teams, can_sevens_be_split_across_more_than_two_pawns, None):  # remove the possible play if it is invalid
                         possible_plays.pop()
                     else:
-                        add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                        add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
                     pawn_indices[0] += 1
                     for i in range(len(pawn_indices) - 1):
                         if pawn_indices[i] == len(movable_pawns):
@@ -611,7 +666,7 @@ def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, a
                     if not is_valid_target(possible_plays[len(possible_plays) - 1]['pawn_targets'], card, name_of_player_to_play, all_pawns, are_teams, can_sevens_be_split_across_more_than_two_pawns, None):  # remove the possible play if it is invalid
                         possible_plays.pop()
                     else:
-                        add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                        add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
                     for movement_count in range(1, int(card)):
                         for movable_pawns_index_2 in range(len(movable_pawns)):
                             possible_plays.append({'card_to_play': card, 'pawn_targets': {movable_pawns[movable_pawns_index_1]: movement_count}})
@@ -620,19 +675,19 @@ def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, a
                             if not is_valid_target(possible_plays[len(possible_plays) - 1]['pawn_targets'], card, name_of_player_to_play, all_pawns, are_teams, can_sevens_be_split_across_more_than_two_pawns, None):  # remove the possible play if it is invalid
                                 possible_plays.pop()
                             else:
-                                add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                                add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
         elif card == '10':
             for pawn_label in all_pawns:
                 if is_valid_target([pawn_label], card, name_of_player_to_play, all_pawns, are_teams, None, True):
                     if do_return_whether_is_some:
                         return True
                     possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label], 'is_card_a_ten_as_backward_one': True})
-                    add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                    add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
                 if is_valid_target([pawn_label], card, name_of_player_to_play, all_pawns, are_teams, None, False):
                     if do_return_whether_is_some:
                         return True
                     possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label], 'is_card_a_ten_as_backward_one': False})
-                    add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                    add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
         elif card == 'Sorry':
             for pawn_label_1 in all_pawns:
                 for pawn_label_2 in all_pawns:
@@ -640,7 +695,7 @@ def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, a
                         if do_return_whether_is_some:
                             return True
                         possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label_1, pawn_label_2]})
-                        add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+                        add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
     is_only_valid_plays_eleven_as_swap = True  # to be corrected as necessary
     for possible_play in possible_plays:
         if possible_play['card_to_play'] != '11' or len(possible_play['pawn_targets']) != 2:
@@ -651,75 +706,34 @@ def enumerate_possible_plays(hand_of_cards, name_of_player_to_play, all_pawns, a
     if not possible_plays or is_only_valid_plays_eleven_as_swap:  # discarding is only an option if there are no valid plays other than possibly using an eleven as a swap
         for card in hand_of_cards:
             possible_plays.append({'card_to_play': card, 'pawn_targets': ['d']})
-            add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
+            add_play_score_attribute(possible_plays[len(possible_plays) - 1], hand_of_cards, name_of_player_to_play, all_pawns, are_teams, do_return_whether_is_some, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile, random_generator, model)
+    if model is not None and discard_pile is not None:
+        add_play_score_attributes_in_batch(possible_plays, hand_of_cards, name_of_player_to_play, all_pawns, discard_pile, model)
     return possible_plays
 
 
-def determine_default_action(card_value, other_chosen_pawn_targets, all_possible_plays, all_pawns, name_of_player_making_play, are_teams):  # takes the already selected pawn targets (if existent), card, available/possible plays, the positions of every pawn (used if the card is a '1', '2', or 'Sorry' to determine which (if any) pawn would be moved from SpecialLocation.START.value and which (if any) pawn would be moved to SpecialLocation.START.value in generating the string explaining the default action), the name of the player making the play (used if the card is an '11' to determine if the first targeted pawn belongs to the player making the play (where hence the default action should be to move that pawn forward) or not (where hence the default action should be to swap with a friendly pawn if there is only one friendly pawn available to swap with)), and whether there are teams; (if only one valid pawn choice (including no pawns) exists for the given card to play and any pawn(s) selected) returns the remaining pawn target(s) of that choice, 'd' for discard, or None otherwise, and also returns a string to show the user to explain the default choice in more detail; requires card and pawn choices to be at least a part of some valid/possible play
-    num_possible_plays_with_selections = 0
+def determine_default_action(card_value, other_chosen_pawn_targets, all_possible_plays, all_pawns, name_of_player_making_play, are_teams, possible_play_trie=None):  # takes the already selected pawn targets (if existent), card, available/possible plays, the positions of every pawn (used if the card is a '1', '2', or 'Sorry' to determine which (if any) pawn would be moved from SpecialLocation.START.value and which (if any) pawn would be moved to SpecialLocation.START.value in generating the string explaining the default action), the name of the player making the play (used if the card is an '11' to determine if the first targeted pawn belongs to the player making the play (where hence the default action should be to move that pawn forward) or not (where hence the default action should be to swap with a friendly pawn if there is only one friendly pawn available to swap with)), and whether there are teams; (if only one valid pawn choice (including no pawns) exists for the given card to play and any pawn(s) selected) returns the remaining pawn target(s) of that choice, 'd' for discard, or None otherwise, and also returns a string to show the user to explain the default choice in more detail; requires card and pawn choices to be at least a part of some valid/possible play
     default_action = []  # return no additional pawn targets if default choice is to use the '11' as a forward movement of a single pawn
     is_card_a_ten_as_backward_one = None
+    if possible_play_trie is None:
+        possible_play_trie = PossiblePlayTrie(all_possible_plays)
     if card_value != '11' or not other_chosen_pawn_targets or (other_chosen_pawn_targets[0][0] != name_of_player_making_play[0] and (not are_teams or other_chosen_pawn_targets[0][0] != get_teammate_letter(name_of_player_making_play[0]))):  # otherwise default action is to be playing the '11' as is (moving one pawn forward eleven spaces)
-        if card_value != '7' and (card_value not in ['11', 'Sorry'] or other_chosen_pawn_targets):  # if order of pawn targets doesn't matter and card is not a 'Sorry' nor '11' with no pawn targets chosen yet
-            for possible_play in all_possible_plays:
-                if possible_play['card_to_play'] == card_value:
-                    is_this_possible_play_an_option = True  # to be corrected as necessary
-                    for pawn_target in other_chosen_pawn_targets:
-                        if pawn_target not in possible_play['pawn_targets']:
-                            is_this_possible_play_an_option = False
-                            break
-                    if num_possible_plays_with_selections != 0:  # if some default play has already been determined
-                        if len(default_action) + len(other_chosen_pawn_targets) == len(possible_play['pawn_targets']):  # if the default play and this new possible play may be equivalent
-                            is_play_equivalent = True  # to be corrected as necessary
-                            for pawn_target in possible_play['pawn_targets']:
-                                if pawn_target not in other_chosen_pawn_targets and pawn_target not in default_action:
-                                    is_play_equivalent = False
-                            if is_play_equivalent:
-                                if card_value == '10' and default_action and is_card_a_ten_as_backward_one != possible_play['is_card_a_ten_as_backward_one']:
-                                    is_card_a_ten_as_backward_one = None
-                                is_this_possible_play_an_option = False  # equivalent plays are disregarded
-                    if is_this_possible_play_an_option:
-                        num_possible_plays_with_selections += 1
-                        if num_possible_plays_with_selections != 1:  # if there are multiple possible plays knowing the chosen card and existing pawn choices
-                            return None, ""
-                        if card_value == '10' and 'is_card_a_ten_as_backward_one' in possible_play:
-                            is_card_a_ten_as_backward_one = possible_play['is_card_a_ten_as_backward_one']
-                        default_action = copy.deepcopy(possible_play['pawn_targets'])
-                        for pawn_target in other_chosen_pawn_targets:
-                            default_action.remove(pawn_target)  # remove existing pawn targets from pawn targets to add
-        elif card_value in ['11', 'Sorry']:  # '11's and 'Sorry's (with no chosen pawn targets yet) are handled separately as a default first pawn choice may present itself (if there is only one friendly pawn in home or only one opponent pawn that could be bumped)
-            for possible_play in all_possible_plays:
-                if possible_play['card_to_play'] == card_value:
-                    num_possible_plays_with_selections += 1
-                    if num_possible_plays_with_selections == 1:
-                        default_action += copy.deepcopy(possible_play['pawn_targets'])  # to be corrected as necessary (there are no other_chosen_pawn_targets to immediately remove)
-                    else:
-                        for possible_pawn_target in default_action:
-                            if possible_pawn_target not in possible_play['pawn_targets']:  # to be a valid default pawn target, the pawn must appear in all possible plays
-                                default_action.remove(possible_pawn_target)
+        if card_value in ['11', 'Sorry'] and not other_chosen_pawn_targets:  # '11's and 'Sorry's (with no chosen pawn targets yet) are handled separately as a default first pawn choice may present itself (if there is only one friendly pawn in home or only one opponent pawn that could be bumped)
+            card_node = possible_play_trie.get_node(card_value, [])
+            if card_node is not None:
+                first_possible_play = next(iter(card_node.completions.values()))[0]
+                default_action = [pawn_target for pawn_target in first_possible_play['pawn_targets'] if pawn_target in card_node.children and len(card_node.children[pawn_target].completions) == len(card_node.completions)]  # to be a valid default pawn target, the pawn must appear in all possible plays, which (as both orders of a swap are possible plays) is when every possible play passes through the pawn as the first choice
             if not default_action:
                 return None, ""
-        else:  # order of pawn targets does matter
-            for possible_play in all_possible_plays:
-                if possible_play['card_to_play'] == card_value:
-                    is_this_possible_play_an_option = True  # to be corrected as necessary
-                    for i in range(len(other_chosen_pawn_targets)):  # .items() is left out in case other_chosen_pawn_targets is empty
-                        if list(other_chosen_pawn_targets.items())[i] != list(possible_play['pawn_targets'].items())[i]:
-                            is_this_possible_play_an_option = False
-                            break
-                    if num_possible_plays_with_selections != 0:  # if some default play has already been determined
-                        if len(default_action) + len(other_chosen_pawn_targets) == len(possible_play['pawn_targets']):  # if the default play and this new possible play may be equivalent
-                            is_play_equivalent = True  # to be corrected as necessary
-                            for i in range(len(possible_play['pawn_targets'])):
-                                if (list(possible_play['pawn_targets'].items())[i] if isinstance(possible_play['pawn_targets'], dict) else possible_play['pawn_targets'][i]) != (list(other_chosen_pawn_targets.items())[i] if i < len(other_chosen_pawn_targets) else (list(default_action.items())[i - len(other_chosen_pawn_targets)]) if isinstance(default_action, dict) else default_action[i - len(other_chosen_pawn_targets)]):  # possible_play['pawn_targets'] may be a list even for a '7' if it regards discarding; default_action may be a list even for a '7' if it regards discarding
-                                    is_play_equivalent = False
-                            if is_play_equivalent:
-                                is_this_possible_play_an_option = False  # equivalent plays are disregarded
-                    if is_this_possible_play_an_option:
-                        num_possible_plays_with_selections += 1
-                        if num_possible_plays_with_selections != 1:  # if there are multiple possible plays knowing the chosen card and existing pawn choices
-                            return None, ""
-                        default_action = (dict(list(possible_play['pawn_targets'].items())[len(other_chosen_pawn_targets):]) if isinstance(possible_play['pawn_targets'], dict) else possible_play['pawn_targets'][len(other_chosen_pawn_targets):])  # possible_play['pawn_targets'] may be a list even for a '7' if it regards discarding; default_action may be a list even for a '7' if it regards discarding
+        elif possible_play_trie.is_valid_prefix(card_value, other_chosen_pawn_targets):  # order of pawn targets only matters for a '7', and other possible plays with more than one pawn target are possible in either order
+            only_completion = possible_play_trie.get_only_completion(card_value, other_chosen_pawn_targets)
+            if only_completion is None:  # if there are multiple possible plays knowing the chosen card and existing pawn choices
+                return None, ""
+            completion_pawn_targets = only_completion[0]['pawn_targets']
+            default_action = dict(list(completion_pawn_targets.items())[len(other_chosen_pawn_targets):]) if isinstance(completion_pawn_targets, dict) else [pawn_target for pawn_target in completion_pawn_targets if pawn_target not in other_chosen_pawn_targets]  # possible_play['pawn_targets'] may be a list even for a '7' if it regards discarding
+            if card_value == '10':
+                ten_directions = {possible_play.get('is_card_a_ten_as_backward_one') for possible_play in only_completion}
+                is_card_a_ten_as_backward_one = ten_directions.pop() if len(ten_directions) == 1 else None
         if 'd' in default_action:
             return default_action, f"discarding this {card_value}"
     explanation_string = ""
@@ -771,33 +785,810 @@ def determine_default_action(card_value, other_chosen_pawn_targets, all_possible
     return default_action, explanation_string
 
 
-def play_card(card_to_play, pawn_targets, all_pawns, is_card_a_ten_as_backward_one=False):  # takes the card to play, a list of all the (labels of the) pawns to target (alternatively a dictionary of all the labels of the pawns to target mapped to how much to move each for the card 7), a to-be-adjusted dictionary of all the existing pawns, and (optionally) a flag indicating to treat the card (which must be a ten, but is not verified) as a movement backward by one; behavior is undefined if the play is invalid (see is_valid_target()) including if excessive or not enough pawn targets are provided
+def play_card(card_to_play, pawn_targets, all_pawns, is_card_a_ten_as_backward_one=False, slides_taken=None):  # takes the card to play, a list of all the (labels of the) pawns to target (alternatively a dictionary of all the labels of the pawns to target mapped to how much to move each for the card 7), a to-be-adjusted dictionary of all the existing pawns, (optionally) a flag indicating to treat the card (which must be a ten, but is not verified) as a movement backward by one, and (optionally) a list to record slides ridden in (see move_pawn()); behavior is undefined if the play is invalid (see is_valid_target()) including if excessive or not enough pawn targets are provided
     if card_to_play in ['1', '2'] and all_pawns[pawn_targets[0]] == SpecialLocation.START.value:
-        if pawn_targets[0][0] == Color.BLUE.name[0]:
-            bump_pawns_at_coordinates(all_pawns, [Location.BLUE_START_EXIT.value])
-            all_pawns[pawn_targets[0]] = Location.BLUE_START_EXIT.value.copy()
-        elif pawn_targets[0][0] == Color.GREEN.name[0]:
-            bump_pawns_at_coordinates(all_pawns, [Location.GREEN_START_EXIT.value])
-            all_pawns[pawn_targets[0]] = Location.GREEN_START_EXIT.value.copy()
-        elif pawn_targets[0][0] == Color.RED.name[0]:
-            bump_pawns_at_coordinates(all_pawns, [Location.RED_START_EXIT.value])
-            all_pawns[pawn_targets[0]] = Location.RED_START_EXIT.value.copy()
-        elif pawn_targets[0][0] == Color.YELLOW.name[0]:
-            bump_pawns_at_coordinates(all_pawns, [Location.YELLOW_START_EXIT.value])
-            all_pawns[pawn_targets[0]] = Location.YELLOW_START_EXIT.value.copy()
+        bump_pawns_at_coordinates(all_pawns, [get_start_exit_location(pawn_targets[0][0])])
+        all_pawns[pawn_targets[0]] = get_start_exit_location(pawn_targets[0][0])
     elif card_to_play == '7':
         for pawn_label in pawn_targets:
-            move_pawn(pawn_targets[pawn_label], pawn_label, all_pawns)
+            move_pawn(pawn_targets[pawn_label], pawn_label, all_pawns, None, slides_taken)
     elif card_to_play == 'Sorry' or (card_to_play == '11' and len(pawn_targets) == 2):
         all_pawns[pawn_targets[0]], all_pawns[pawn_targets[1]] = all_pawns[pawn_targets[1]], all_pawns[pawn_targets[0]]
         if all_pawns[pawn_targets[0]] != SpecialLocation.START.value:
-            move_pawn(0, pawn_targets[0], all_pawns)  # simulate a movement of zero to adjust in case an arrow was landed on
+            move_pawn(0, pawn_targets[0], all_pawns, None, slides_taken)  # simulate a movement of zero to adjust in case an arrow was landed on
         if all_pawns[pawn_targets[1]] != SpecialLocation.START.value:
-            move_pawn(0, pawn_targets[1], all_pawns)  # simulate a movement of zero to adjust in case an arrow was landed on
+            move_pawn(0, pawn_targets[1], all_pawns, None, slides_taken)  # simulate a movement of zero to adjust in case an arrow was landed on
     elif card_to_play == '4' or is_card_a_ten_as_backward_one:
-        move_pawn((-4 if not is_card_a_ten_as_backward_one else -1), pawn_targets[0], all_pawns)
+        move_pawn((-4 if not is_card_a_ten_as_backward_one else -1), pawn_targets[0], all_pawns, None, slides_taken)
     elif card_to_play in ['1', '2', '3', '5', '8', '10', '11', '12']:
-        move_pawn(int(card_to_play), pawn_targets[0], all_pawns)
+        move_pawn(int(card_to_play), pawn_targets[0], all_pawns, None, slides_taken)
+
+
+BoardGeometry = collections.namedtuple('BoardGeometry', ['side_colors', 'squares_per_side', 'slides', 'safety_zone_depth', 'start_exit_offset', 'safety_zone_entrance_offset', 'team_pairings'])  # side_colors are the Color members seated along each side (clockwise from the top side, which is also the order of play); every side has the same slides ((offset, length) pairs), start exit, and safety zone entrance, with offsets counted clockwise in squares from the side's first corner; team_pairings are pairs of Color members
+
+
+def get_board_geometry(num_sides, squares_per_side=None, slides=None, safety_zone_depth=None):  # returns the geometry of the standard board (four sides) or of a larger board of the same sides (five or six, seating purple and cyan players as well, with players on opposite sides being teammates on a six-sided board), with each side's number of squares, slides ((offset, length) pairs), and safety zone depth being the standard board's (see Location) unless provided; raises ValueError for an unsupported number of sides
+    if not 3 <= num_sides <= 6:
+        raise ValueError("boards have three to six sides")
+    side_colors = [Color.GREEN, Color.RED, Color.BLUE, Color.YELLOW, Color.PURPLE, Color.CYAN][:num_sides]
+    team_pairings = [(side_colors[side], side_colors[side + num_sides // 2]) for side in range(num_sides // 2)] if num_sides % 2 == 0 else []
+    return BoardGeometry(side_colors, squares_per_side if squares_per_side is not None else Coordinate.MAX_X.value, list(slides) if slides is not None else [(1, 3), (9, 4)], safety_zone_depth if safety_zone_depth is not None else 5, 4, 2, team_pairings)
+
+
+class CompiledBoard:  # lookup tables compiled from a BoardGeometry; pawns on a compiled board are located by square index (the outer track's squares clockwise from the top side's first corner, then each side's safety zone in turn) or SpecialLocation value, so moving a pawn is a couple of table lookups however many sides the board has; simulated, rated, and played out games and the console's listing of possible plays use compiled boards, while the console's and server's games and checkpoints stay on the standard board located by coordinates (see move_pawn() and play_card()), the reference engine compiled boards are cross-checked against (see EngineCrossChecker)
+    def __init__(self, geometry):  # raises ValueError if the geometry is inconsistent
+        num_sides = len(geometry.side_colors)
+        squares_per_side = geometry.squares_per_side
+        if any(offset < 1 or length < 1 or offset + length > squares_per_side for offset, length in geometry.slides) or not 0 < geometry.start_exit_offset < squares_per_side or not 0 <= geometry.safety_zone_entrance_offset < squares_per_side or geometry.safety_zone_depth < 0:
+            raise ValueError("slides, start exits, and safety zone entrances must lie within a side")
+        self.geometry = geometry
+        self.side_letters = [side_color.name[0] for side_color in geometry.side_colors]
+        self.track_length = num_sides * squares_per_side
+        self.home_progress = self.track_length + geometry.safety_zone_depth + 1  # a pawn's progress (see get_pawn_progress()) runs from 0 at its start, through 1 on the square just after its safety zone entrance, to this at its home
+        self.track_locations = frozenset(range(self.track_length))
+        self.square_locations = frozenset(range(self.track_length + num_sides * geometry.safety_zone_depth))  # every location other than a SpecialLocation
+        self.teammate_letters = {}
+        for first_color, second_color in geometry.team_pairings:
+            self.teammate_letters[first_color.name[0]] = second_color.name[0]
+            self.teammate_letters[second_color.name[0]] = first_color.name[0]
+        self.locations_by_progress = {}  # maps each side's letter to a list of the locations of its pawns' progresses
+        self.progresses_by_location = {}  # maps each side's letter to the inverse of its locations_by_progress list
+        self.start_exit_locations = {}
+        self.move_destinations = {}  # maps each side's letter to a dictionary mapping each location of its pawns to a list (indexed by the number of spaces to move plus home_progress) of where the move lands before riding any slide, or None if it would overshoot home
+        self.slides = {}  # maps each side's letter to a dictionary mapping each slide entrance its pawns ride (those not along its own side) to a tuple of the slide's end and the set of squares from its entrance to its end
+        for side in range(num_sides):
+            letter = self.side_letters[side]
+            safety_zone_entrance = side * squares_per_side + geometry.safety_zone_entrance_offset
+            locations = [SpecialLocation.START.value] + [(safety_zone_entrance + progress) % self.track_length for progress in range(1, self.track_length + 1)] + [self.track_length + side * geometry.safety_zone_depth + depth for depth in range(geometry.safety_zone_depth)] + [SpecialLocation.HOME.value]
+            self.locations_by_progress[letter] = locations
+            self.progresses_by_location[letter] = {locations[progress]: progress for progress in range(len(locations))}
+            self.start_exit_locations[letter] = side * squares_per_side + geometry.start_exit_offset
+            start_exit_progress = locations.index(self.start_exit_locations[letter])
+            self.move_destinations[letter] = {}
+            for progress in range(len(locations)):
+                destinations = []
+                for num_spaces in range(-self.home_progress, self.home_progress + 1):
+                    if num_spaces == 0:
+                        destinations.append(locations[progress])
+                    elif progress == 0:  # as with move_pawn(), any movement from the start only reaches the start exit
+                        destinations.append(locations[start_exit_progress])
+                    elif progress == self.home_progress or progress + num_spaces > self.home_progress:
+                        destinations.append(None)
+                    else:
+                        destination_progress = progress + num_spaces
+                        if destination_progress < 1:  # moving backward from just after the safety zone entrance continues around the track
+                            destination_progress = (destination_progress - 1) % self.track_length + 1
+                        destinations.append(locations[destination_progress])
+                self.move_destinations[letter][locations[progress]] = destinations
+            self.slides[letter] = {}
+            for slide_side in range(num_sides):
+                if slide_side != side:  # pawns don't ride the slides along their own side
+                    for offset, length in geometry.slides:
+                        slide_entrance = slide_side * squares_per_side + offset
+                        self.slides[letter][slide_entrance] = ((slide_entrance + length) % self.track_length, frozenset((slide_entrance + square) % self.track_length for square in range(length + 1)))
+
+
+def get_board_geometry_key(geometry):  # returns a hashable key two geometries share only if they compile to the same board
+    return tuple(geometry.side_colors), geometry.squares_per_side, tuple(tuple(slide) for slide in geometry.slides), geometry.safety_zone_depth, geometry.start_exit_offset, geometry.safety_zone_entrance_offset, tuple(tuple(team_pairing) for team_pairing in geometry.team_pairings)
+
+
+STANDARD_BOARD = CompiledBoard(get_board_geometry(4))
+compiled_boards = {get_board_geometry_key(STANDARD_BOARD.geometry): STANDARD_BOARD}  # CompiledBoards by the key of their geometry (see get_compiled_board())
+
+
+def get_compiled_board(num_sides, squares_per_side=None, slides=None, safety_zone_depth=None):  # returns the CompiledBoard of get_board_geometry() with the given arguments, compiling it the first time it is requested; raises ValueError for an unsupported or inconsistent geometry
+    geometry = get_board_geometry(num_sides, squares_per_side, slides, safety_zone_depth)
+    geometry_key = get_board_geometry_key(geometry)
+    if geometry_key not in compiled_boards:
+        compiled_boards[geometry_key] = CompiledBoard(geometry)
+    return compiled_boards[geometry_key]
+
+
+CARD_MOVEMENTS = {'1': [1], '2': [2], '3': [3], '4': [-4], '5': [5], '7': [1, 2, 3, 4, 5, 6, 7], '8': [8], '10': [10, -1], '11': [11], '12': [12]}  # the distances each card can move a single pawn (a '7' by splitting it); 'Sorry's and '11's as swaps can reach any pawn on the track (see ThreatMap)
+board_reaches = {}  # reach tables of CompiledBoards (see get_board_reach()), by the key of their geometry (see get_board_geometry_key())
+
+
+def get_board_reach(board):  # returns, for each side's letter, a dictionary mapping each location of its pawns to the tuple of (square, card) pairs such a pawn could bump a pawn on with a move of that card (landing there or sliding over it), computing them the first time the board's are requested
+    geometry_key = get_board_geometry_key(board.geometry)
+    if geometry_key not in board_reaches:
+        reach = {}
+        for letter in board.side_letters:
+            reach[letter] = {}
+            for location, destinations in board.move_destinations[letter].items():
+                squares_and_cards = set()
+                for card, movements in CARD_MOVEMENTS.items():
+                    if location == SpecialLocation.HOME.value or (location == SpecialLocation.START.value and card not in ['1', '2']):
+                        continue
+                    for num_spaces in movements:
+                        destination = destinations[num_spaces + board.home_progress]
+                        if destination in board.track_locations:  # safety zones hold no other side's pawns
+                            slide = board.slides[letter].get(destination)
+                            squares_and_cards.update((square, card) for square in (slide[1] if slide is not None else [destination]))
+                reach[letter][location] = tuple(sorted(squares_and_cards))
+        board_reaches[geometry_key] = reach
+    return board_reaches[geometry_key]
+
+
+class ThreatMap:  # which cards the pawns of each side could bump a pawn on each square of a compiled board with on their next move, kept up to date by update() changing only the entries of the pawns that moved (including any bumped or swapped) and queried in constant time; own pawns blocking a move are ignored
+    def __init__(self, board=STANDARD_BOARD, all_pawns=None):
+        self.board = board
+        self.reach = get_board_reach(board)
+        draw_pile = create_draw_pile()
+        self.card_probabilities = {card: draw_pile.count(card) / len(draw_pile) for card in draw_pile}
+        self.pawn_locations = {}
+        self.threats = collections.defaultdict(collections.Counter)  # maps each square to a Counter of (side letter, card) pairs by how many of that side's pawns could bump a pawn there with that card
+        self.num_pawns_at_start = collections.Counter()  # by side letter (each could take the place of a pawn on any square with a 'Sorry')
+        self.num_pawns_on_track = collections.Counter()  # by side letter (each could swap places with a pawn on any other square of the track with an '11')
+        if all_pawns is not None:
+            self.update(all_pawns)
+
+    def move_pawn(self, pawn_label, location):  # records that the pawn is now at location (None to forget the pawn)
+        letter = pawn_label[0]
+        for threat_location, change in [(self.pawn_locations.get(pawn_label), -1), (location, 1)]:
+            if threat_location is None:
+                continue
+            for square, card in self.reach[letter][threat_location]:
+                self.threats[square][letter, card] += change
+            if threat_location == SpecialLocation.START.value:
+                self.num_pawns_at_start[letter] += change
+            elif threat_location in self.board.track_locations:
+                self.num_pawns_on_track[letter] += change
+        if location is None:
+            self.pawn_locations.pop(pawn_label, None)
+        else:
+            self.pawn_locations[pawn_label] = location
+
+    def update(self, all_pawns):  # brings the map up to date with all_pawns (located on the board), moving only the pawns whose locations changed
+        for pawn_label, location in all_pawns.items():
+            if self.pawn_locations.get(pawn_label) != location:
+                self.move_pawn(pawn_label, location)
+        for pawn_label in [pawn_label for pawn_label in self.pawn_locations if pawn_label not in all_pawns]:
+            self.move_pawn(pawn_label, None)
+
+    def get_threatening_cards(self, square, side_letters):  # returns the set of cards with which a pawn of any of the given sides could bump a pawn on square next turn
+        if square not in self.board.track_locations:
+            return set()
+        cards = {card for (letter, card), num_pawns in self.threats[square].items() if num_pawns > 0 and letter in side_letters}
+        if any(self.num_pawns_at_start[letter] > 0 for letter in side_letters):
+            cards.add('Sorry')
+        if any(self.num_pawns_on_track[letter] > 0 for letter in side_letters):
+            cards.add('11')
+        return cards
+
+    def get_exposure(self, pawn_label, are_teams=False):  # returns the chance that the next card drawn is one an opponent of the pawn could bump it with
+        opponent_letters = [letter for letter in self.board.side_letters if letter != pawn_label[0] and (not are_teams or self.board.teammate_letters.get(letter) != pawn_label[0])]
+        return sum(self.card_probabilities[card] for card in self.get_threatening_cards(self.pawn_locations.get(pawn_label), opponent_letters))
+
+
+def land_pawn_on_board(board, label_of_pawn_to_move, destination, all_pawns, name_of_player_making_move=None, slides_taken=None):  # puts the pawn at destination on the compiled board, riding any slide there and bumping any pawns it lands or slides on back to their SpecialLocation.START.value; returns whether no pawn of the player making the move (if name_of_player_making_move is provided) was landed on (as with move_pawn(), sliding into one's own pawns is allowed); (if slides_taken is provided) appends to slides_taken as move_pawn() does
+    if destination not in board.square_locations:
+        all_pawns[label_of_pawn_to_move] = destination
+        return True
+    slide = board.slides[label_of_pawn_to_move[0]].get(destination)
+    if slide is not None:
+        if slides_taken is not None:
+            slides_taken.append((label_of_pawn_to_move, destination, slide[0]))
+        for pawn_label in all_pawns:
+            if all_pawns[pawn_label] in slide[1]:
+                all_pawns[pawn_label] = SpecialLocation.START.value
+        all_pawns[label_of_pawn_to_move] = slide[0]
+        return True
+    is_bump_valid = True
+    for pawn_label in all_pawns:
+        if all_pawns[pawn_label] == destination and pawn_label != label_of_pawn_to_move:
+            all_pawns[pawn_label] = SpecialLocation.START.value
+            if name_of_player_making_move is not None and pawn_label[0] == name_of_player_making_move[0]:
+                is_bump_valid = False
+    all_pawns[label_of_pawn_to_move] = destination
+    return is_bump_valid
+
+
+def move_pawn_on_board(board, num_spaces, label_of_pawn_to_move, all_pawns, name_of_player_making_move=None, slides_taken=None):  # the compiled board counterpart of move_pawn() (all_pawns mapping pawn labels to compiled board locations); returns whether the movement was valid (overshooting home leaves the pawn where it is)
+    destination = board.move_destinations[label_of_pawn_to_move[0]][all_pawns[label_of_pawn_to_move]][num_spaces + board.home_progress]
+    if destination is None:
+        return False
+    return land_pawn_on_board(board, label_of_pawn_to_move, destination, all_pawns, name_of_player_making_move, slides_taken)
+
+
+def is_valid_move_on_board(board, num_spaces, label_of_pawn_to_move, all_pawns, pawns_by_location, name_of_player_making_move):  # returns what move_pawn_on_board() would (with name_of_player_making_move) without moving anything, knowing which pawn is at each location not a SpecialLocation
+    destination = board.move_destinations[label_of_pawn_to_move[0]][all_pawns[label_of_pawn_to_move]][num_spaces + board.home_progress]
+    if destination is None:
+        return False
+    pawn_label_at_destination = pawns_by_location.get(destination)
+    return pawn_label_at_destination is None or pawn_label_at_destination == label_of_pawn_to_move or pawn_label_at_destination[0] != name_of_player_making_move[0] or destination in board.slides[label_of_pawn_to_move[0]]
+
+
+def is_valid_split_seven_on_board(board, pawn_targets, all_pawns, name_of_player_making_move):  # returns whether moving each pawn target (whose locations are known to be neither SpecialLocation) the distance it is mapped to, in order, is valid
+    all_pawns_copy = dict(all_pawns)  # locations on a compiled board are immutable, so a shallow copy suffices
+    for pawn_label in pawn_targets:
+        if not move_pawn_on_board(board, pawn_targets[pawn_label], pawn_label, all_pawns_copy, name_of_player_making_move):
+            return False
+    return True
+
+
+def get_seven_splits(num_pawns, remaining_distance=7):  # yields every way (as a list of each pawn's distance, zero for pawns not moved) to split remaining_distance across num_pawns pawns
+    if num_pawns == 1:
+        yield [remaining_distance]
+    elif num_pawns > 1:
+        for distance in range(remaining_distance, -1, -1):
+            for other_distances in get_seven_splits(num_pawns - 1, remaining_distance - distance):
+                yield [distance] + other_distances
+
+
+def is_valid_swap_on_board(board, pawn_targets, card_value, name_of_player_to_play, all_pawns, friendly_letters):  # returns what is_valid_target() would for a pair of pawn targets of an '11' (as a swap) or 'Sorry' card on a compiled board, knowing the letters of every side whose pawns the player can move
+    if pawn_targets[0][0] == pawn_targets[1][0]:
+        return False
+    if card_value == '11':
+        return all_pawns[pawn_targets[0]] in board.track_locations and all_pawns[pawn_targets[1]] in board.track_locations and ((pawn_targets[0][0] != name_of_player_to_play[0] and pawn_targets[1][0] in friendly_letters) or (pawn_targets[1][0] != name_of_player_to_play[0] and pawn_targets[0][0] in friendly_letters))
+    if pawn_targets[0][0] != name_of_player_to_play[0] and pawn_targets[1][0] in friendly_letters:
+        return all_pawns[pawn_targets[1]] == SpecialLocation.START.value and all_pawns[pawn_targets[0]] in board.track_locations
+    elif pawn_targets[1][0] != name_of_player_to_play[0] and pawn_targets[0][0] in friendly_letters:
+        return all_pawns[pawn_targets[0]] == SpecialLocation.START.value and all_pawns[pawn_targets[1]] in board.track_locations
+    return False
+
+
+def enumerate_possible_plays_on_board(board, hand_of_cards, name_of_player_to_play, all_pawns, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, discard_pile=None, random_generator=random, model=None):  # the compiled board counterpart of enumerate_possible_plays() (always returning the list of plays), finding the same plays (though each split of a '7' across more than two pawns only once) without copying every pawn for each move considered; the presence of discard_pile indicates to score each possible play (with model, if provided, only on the standard board, which its features describe)
+    friendly_letters = [name_of_player_to_play[0], board.teammate_letters.get(name_of_player_to_play[0])] if are_teams else [name_of_player_to_play[0]]
+    pawns_by_location = {all_pawns[pawn_label]: pawn_label for pawn_label in all_pawns if all_pawns[pawn_label] in board.square_locations}
+    pawns_on_track = [pawn_label for pawn_label in all_pawns if all_pawns[pawn_label] in board.track_locations]  # the only pawns an '11' can swap or a 'Sorry' can send back to start (each list keeps the order of all_pawns so plays are found in the same order as enumerate_possible_plays() finds them)
+    friendly_pawns_on_track = [pawn_label for pawn_label in pawns_on_track if pawn_label[0] in friendly_letters]
+    friendly_pawns_at_start = [pawn_label for pawn_label in all_pawns if pawn_label[0] in friendly_letters and all_pawns[pawn_label] == SpecialLocation.START.value]
+    possible_plays = []
+    for card in hand_of_cards:
+        if card in ['1', '2', '3', '4', '5', '8', '11', '12']:
+            num_spaces = -4 if card == '4' else int(card)
+            for pawn_label in all_pawns:
+                if pawn_label[0] in friendly_letters and (all_pawns[pawn_label] in board.square_locations or (card in ['1', '2'] and all_pawns[pawn_label] == SpecialLocation.START.value)) and is_valid_move_on_board(board, num_spaces, pawn_label, all_pawns, pawns_by_location, name_of_player_to_play):
+                    possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label]})
+            if card == '2':
+                if not any(possible_play['card_to_play'] == '2' for possible_play in possible_plays) and (not is_immediate_draw_after_playing_a_2 or len(hand_of_cards) > 1):  # as in enumerate_possible_plays()
+                    possible_plays.append({'card_to_play': card, 'pawn_targets': []})
+            elif card == '11':
+                for pawn_label_1 in pawns_on_track:
+                    for pawn_label_2 in (pawns_on_track if pawn_label_1[0] in friendly_letters else friendly_pawns_on_track):  # one of the swapped pawns must be friendly
+                        if is_valid_swap_on_board(board, [pawn_label_1, pawn_label_2], card, name_of_player_to_play, all_pawns, friendly_letters):
+                            possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label_1, pawn_label_2]})
+        elif card == '7':
+            movable_pawns = [pawn_label for pawn_label in all_pawns if pawn_label[0] in friendly_letters and all_pawns[pawn_label] in board.square_locations]
+            if can_sevens_be_split_across_more_than_two_pawns:
+                for seven_split in get_seven_splits(len(movable_pawns)):
+                    pawn_targets = {movable_pawns[i]: seven_split[i] for i in range(len(movable_pawns)) if seven_split[i] != 0}
+                    if is_valid_split_seven_on_board(board, pawn_targets, all_pawns, name_of_player_to_play):
+                        possible_plays.append({'card_to_play': card, 'pawn_targets': pawn_targets})
+            else:
+                for pawn_label_1 in movable_pawns:
+                    if is_valid_move_on_board(board, 7, pawn_label_1, all_pawns, pawns_by_location, name_of_player_to_play):
+                        possible_plays.append({'card_to_play': card, 'pawn_targets': {pawn_label_1: 7}})
+                    for movement_count in range(1, 7):
+                        for pawn_label_2 in movable_pawns:
+                            if pawn_label_2 != pawn_label_1 and is_valid_split_seven_on_board(board, {pawn_label_1: movement_count, pawn_label_2: 7 - movement_count}, all_pawns, name_of_player_to_play):
+                                possible_plays.append({'card_to_play': card, 'pawn_targets': {pawn_label_1: movement_count, pawn_label_2: 7 - movement_count}})
+        elif card == '10':
+            for pawn_label in all_pawns:
+                if pawn_label[0] in friendly_letters and all_pawns[pawn_label] in board.square_locations:
+                    if is_valid_move_on_board(board, -1, pawn_label, all_pawns, pawns_by_location, name_of_player_to_play):
+                        possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label], 'is_card_a_ten_as_backward_one': True})
+                    if is_valid_move_on_board(board, 10, pawn_label, all_pawns, pawns_by_location, name_of_player_to_play):
+                        possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label], 'is_card_a_ten_as_backward_one': False})
+        elif card == 'Sorry':
+            for pawn_label_1 in all_pawns:
+                for pawn_label_2 in (pawns_on_track if pawn_label_1 in friendly_pawns_at_start else friendly_pawns_at_start if all_pawns[pawn_label_1] in board.track_locations else []):  # a friendly pawn at its start takes the place of a pawn on the track
+                    if is_valid_swap_on_board(board, [pawn_label_1, pawn_label_2], card, name_of_player_to_play, all_pawns, friendly_letters):
+                        possible_plays.append({'card_to_play': card, 'pawn_targets': [pawn_label_1, pawn_label_2]})
+    if all(possible_play['card_to_play'] == '11' and len(possible_play['pawn_targets']) == 2 for possible_play in possible_plays):  # discarding is only an option if there are no valid plays other than possibly using an eleven as a swap
+        for card in hand_of_cards:
+            possible_plays.append({'card_to_play': card, 'pawn_targets': ['d']})
+    if discard_pile is not None:
+        if model is not None and board is STANDARD_BOARD:
+            add_play_score_attributes_in_batch(possible_plays, hand_of_cards, name_of_player_to_play, get_coordinate_pawns(all_pawns), discard_pile, model)
+        else:
+            for possible_play in possible_plays:
+                possible_play['play_score'] = random_generator.randrange(100)
+    return possible_plays
+
+
+def play_card_on_board(board, card_to_play, pawn_targets, all_pawns, is_card_a_ten_as_backward_one=False, slides_taken=None):  # the compiled board counterpart of play_card()
+    if card_to_play == '7':
+        for pawn_label in pawn_targets:
+            move_pawn_on_board(board, pawn_targets[pawn_label], pawn_label, all_pawns, None, slides_taken)
+    elif card_to_play == 'Sorry' or (card_to_play == '11' and len(pawn_targets) == 2):
+        all_pawns[pawn_targets[0]], all_pawns[pawn_targets[1]] = all_pawns[pawn_targets[1]], all_pawns[pawn_targets[0]]  # compiled board locations are shared by every side's pawns
+        for pawn_label in pawn_targets:
+            if all_pawns[pawn_label] != SpecialLocation.START.value:
+                land_pawn_on_board(board, pawn_label, all_pawns[pawn_label], all_pawns, None, slides_taken)  # in case a slide was landed on
+    elif card_to_play == '4' or is_card_a_ten_as_backward_one:
+        move_pawn_on_board(board, (-4 if not is_card_a_ten_as_backward_one else -1), pawn_targets[0], all_pawns, None, slides_taken)
+    elif card_to_play in ['1', '2', '3', '5', '8', '10', '11', '12']:
+        move_pawn_on_board(board, int(card_to_play), pawn_targets[0], all_pawns, None, slides_taken)  # a '1' or '2' moves a pawn from its start to its start exit
+
+
+def create_draw_pile():  # returns an unshuffled list of every card in the deck
+    return ['1'] * 5 + ['2'] * 4 + ['3'] * 4 + ['4'] * 4 + ['5'] * 4 + ['7'] * 4 + ['8'] * 4 + ['10'] * 4 + ['11'] * 4 + ['12'] * 4 + ['Sorry'] * 4  # distribution collected from an owned version of the game
+
+
+def get_start_exit_location(player_letter):  # returns a copy of the coordinates a pawn of the given player lands on when leaving its SpecialLocation.START.value, or None on error
+    if player_letter == Color.BLUE.name[0]:
+        return Location.BLUE_START_EXIT.value.copy()
+    elif player_letter == Color.GREEN.name[0]:
+        return Location.GREEN_START_EXIT.value.copy()
+    elif player_letter == Color.RED.name[0]:
+        return Location.RED_START_EXIT.value.copy()
+    elif player_letter == Color.YELLOW.name[0]:
+        return Location.YELLOW_START_EXIT.value.copy()
+    return None
+
+
+def get_all_pawns(players):  # returns a dictionary of every pawn label mapped to its location (sharing the location objects of the players' own pawn dictionaries)
+    all_pawns = {}
+    for player in players:
+        all_pawns.update(player.pawns)
+    return all_pawns
+
+
+def update_player_pawns(players, all_pawns):  # copies any adjustments made to all_pawns back into the players' own pawn dictionaries
+    players_by_letter = {player.name[0]: player for player in players}
+    for pawn in all_pawns:
+        if pawn[0] in players_by_letter:
+            players_by_letter[pawn[0]].pawns[pawn] = all_pawns[pawn]
+
+
+def get_victors(players):  # returns the names of every player having all of their pawns at SpecialLocation.HOME.value
+    victors = []
+    for player in players:
+        if all(player.pawns[pawn] == SpecialLocation.HOME.value for pawn in player.pawns):
+            victors.append(player.name)
+    return victors
+
+
+class GameEventType(Enum):
+    CARD_DRAWN = 'card_drawn'
+    CARD_PLAYED = 'card_played'  # pawn_label is 'd' if the card was discarded
+    PAWN_MOVED = 'pawn_moved'  # to_location is where the pawn landed before riding any slide
+    SLIDE = 'slide'
+    BUMP = 'bump'
+    SWAP = 'swap'
+    RESHUFFLE = 'reshuffle'
+    GAME_WON = 'game_won'
+
+
+GameEvent = collections.namedtuple('GameEvent', ['event_type', 'player_name', 'card', 'pawn_label', 'from_location', 'to_location'], defaults=[None, None, None, None, None])  # locations are compact (see get_compact_location())
+
+
+class OverflowPolicy(Enum):  # what publishing does when a subscriber's queue is full
+    DROP_NEWEST = 'drop_newest'  # the published event is not queued for the subscriber
+    DROP_OLDEST = 'drop_oldest'  # the subscriber's oldest queued event is discarded to make room
+    BLOCK = 'block'  # the publisher waits for room (up to the subscription's block timeout, after which the published event is dropped)
+
+
+def get_compact_location(location):  # returns an (x, y) tuple for board coordinates, otherwise the SpecialLocation value as is
+    return (location[Coordinate.X], location[Coordinate.Y]) if isinstance(location, dict) else location
+
+
+class GameEventSubscription:  # a bounded queue of events delivered to one subscriber of a GameEventBus
+    def __init__(self, max_queue_size, overflow_policy, block_timeout, on_event_available):  # on_event_available (if not None) is called (from the publishing thread) after each event is queued, such as to wake an asyncio task
+        self.events = collections.deque()
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.on_event_available = on_event_available
+        self.num_dropped_events = 0
+        self.condition = threading.Condition()
+
+    def put(self, event):  # returns whether the event was queued
+        with self.condition:
+            if len(self.events) >= self.max_queue_size:
+                if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+                    self.events.popleft()
+                    self.num_dropped_events += 1
+                elif self.overflow_policy == OverflowPolicy.BLOCK and self.condition.wait_for(lambda: len(self.events) < self.max_queue_size, self.block_timeout):
+                    pass  # room was made
+                else:
+                    self.num_dropped_events += 1
+                    return False
+            self.events.append(event)
+            self.condition.notify_all()
+        if self.on_event_available is not None:
+            self.on_event_available()
+        return True
+
+    def get(self, timeout=None):  # returns the oldest queued event, waiting up to timeout seconds (forever if None) for one; returns None on timeout
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.events, timeout):
+                return None
+            event = self.events.popleft()
+            self.condition.notify_all()
+            return event
+
+    def get_all_nowait(self):  # returns (and removes) every queued event without waiting
+        with self.condition:
+            events = list(self.events)
+            self.events.clear()
+            self.condition.notify_all()
+            return events
+
+
+class GameEventBus:  # delivers published game events to any number of subscribers, each with its own bounded queue so a slow subscriber cannot stall the game (unless it subscribed with OverflowPolicy.BLOCK)
+    def __init__(self):
+        self.subscriptions = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, max_queue_size=1024, overflow_policy=OverflowPolicy.DROP_OLDEST, block_timeout=None, on_event_available=None):  # returns the new GameEventSubscription
+        subscription = GameEventSubscription(max_queue_size, overflow_policy, block_timeout, on_event_available)
+        with self.lock:
+            self.subscriptions = self.subscriptions + [subscription]  # replaced rather than appended to so publish() can iterate without holding the lock
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions = [other_subscription for other_subscription in self.subscriptions if other_subscription is not subscription]
+
+    def publish(self, event):
+        for subscription in self.subscriptions:
+            subscription.put(event)
+
+
+def publish_game_event(event_bus, event_type, player_name=None, card=None, pawn_label=None, from_location=None, to_location=None):  # publishes the event to event_bus (if it is not None)
+    if event_bus is not None:
+        event_bus.publish(GameEvent(event_type, player_name, card, pawn_label, get_compact_location(from_location), get_compact_location(to_location)))
+
+
+def publish_pawn_events(event_bus, player_name, play, pawn_locations_before_play, all_pawns, slides_taken):  # publishes the pawn movements, swaps, slides, and bumps that resulted from the given play, knowing every pawn's location from before it and the slides ridden during it
+    card_to_play = play['card_to_play']
+    pawn_targets = list(play['pawn_targets'])  # the keys of a '7's dictionary of pawn targets
+    for pawn_label in pawn_targets:
+        landing_location = all_pawns[pawn_label]
+        for slide in slides_taken:
+            if slide[0] == pawn_label:
+                landing_location = slide[1]
+        if card_to_play == '11' and len(pawn_targets) == 2:
+            publish_game_event(event_bus, GameEventType.SWAP, player_name, card_to_play, pawn_label, pawn_locations_before_play[pawn_label], landing_location)
+        elif card_to_play != 'Sorry' or pawn_locations_before_play[pawn_label] == SpecialLocation.START.value:  # the other target of a 'Sorry' is bumped rather than moved
+            publish_game_event(event_bus, GameEventType.PAWN_MOVED, player_name, card_to_play, pawn_label, pawn_locations_before_play[pawn_label], landing_location)
+    for slide in slides_taken:
+        publish_game_event(event_bus, GameEventType.SLIDE, player_name, card_to_play, slide[0], slide[1], slide[2])
+    for pawn_label in all_pawns:
+        if all_pawns[pawn_label] == SpecialLocation.START.value and pawn_locations_before_play[pawn_label] != SpecialLocation.START.value:
+            publish_game_event(event_bus, GameEventType.BUMP, player_name, card_to_play, pawn_label, pawn_locations_before_play[pawn_label], SpecialLocation.START.value)
+
+
+def draw_card_into_hand(event_bus, player, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players, random_generator=random):  # draws a card (see draw_card()) into the player's hand, publishing any reshuffle and the draw to event_bus (if it is not None) rather than announcing them; returns the drawn card and how many times to show the last discard pile
+    if not draw_pile:
+        publish_game_event(event_bus, GameEventType.RESHUFFLE, player.name)
+    drawn_card, num_times_to_show_last_discard_pile = draw_card(draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players, random_generator)
+    player.cards_in_hand.append(drawn_card)
+    publish_game_event(event_bus, GameEventType.CARD_DRAWN, player.name, drawn_card)
+    return drawn_card, num_times_to_show_last_discard_pile
+
+
+def draw_card_for_game_state(game_state):  # draws a card into the hand of the player whose turn it is (see draw_card_into_hand()); returns the drawn card
+    drawn_card, game_state.num_times_to_show_last_discard_pile = draw_card_into_hand(game_state.event_bus, game_state.players[game_state.players_turn], game_state.draw_pile, game_state.discard_pile, game_state.last_discard_pile, game_state.num_times_to_show_last_discard_pile, len(game_state.players), get_random_generator(game_state))
+    return drawn_card
+
+
+def play_card_and_publish_events(event_bus, player_name, play, all_pawns, board=None):  # plays the card of a possible play (see enumerate_possible_plays()) on all_pawns (with play_card_on_board() if board is provided, otherwise play_card()), publishing the card played and the pawn movements, swaps, slides, and bumps that resulted to event_bus (if it is not None)
+    card_to_play = play['card_to_play']
+    pawn_targets = play['pawn_targets']
+    publish_game_event(event_bus, GameEventType.CARD_PLAYED, player_name, card_to_play, 'd' if 'd' in pawn_targets else None)
+    if 'd' not in pawn_targets and pawn_targets:
+        pawn_locations_before_play = {pawn_label: copy.copy(all_pawns[pawn_label]) for pawn_label in all_pawns} if event_bus is not None else None
+        slides_taken = []
+        if board is not None:
+            play_card_on_board(board, card_to_play, pawn_targets, all_pawns, play.get('is_card_a_ten_as_backward_one', False), slides_taken)
+        else:
+            play_card(card_to_play, pawn_targets, all_pawns, play.get('is_card_a_ten_as_backward_one', False), slides_taken)
+        if event_bus is not None:
+            publish_pawn_events(event_bus, player_name, play, pawn_locations_before_play, all_pawns, slides_taken)
+
+
+class GameState:  # the state of a game that can be advanced one play at a time without prompting anyone (mirrors the local variables of sorry_boardgame())
+    def __init__(self, players, hand_size, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, event_bus=None, board=None, random_generator=None):  # players are expected in order of play; event_bus (if provided) is a GameEventBus the game's progress is published to; board (if provided) is the CompiledBoard the game is played on (with pawns located as on a compiled board), otherwise the game is played on the standard board with pawns located by coordinates; random_generator (if provided) is the random.Random that shuffles, picks the first player, and then draws and scores for the game, otherwise the random module does
+        self.event_bus = event_bus
+        self.random_generator = random_generator  # the random.Random the game's draws and computer-controlled players' scoring use (None for the random module), such as one seeded for a game being played out
+        self.board = board
+        self.players = players
+        self.hand_size = hand_size
+        self.are_teams = are_teams
+        self.can_sevens_be_split_across_more_than_two_pawns = can_sevens_be_split_across_more_than_two_pawns
+        self.is_immediate_draw_after_playing_a_2 = is_immediate_draw_after_playing_a_2 or hand_size == 0
+        self.is_card_after_playing_a_2_force_played = self.is_immediate_draw_after_playing_a_2 and (is_card_after_playing_a_2_force_played or hand_size == 0)
+        self.draw_pile = create_draw_pile()
+        get_random_generator(self).shuffle(self.draw_pile)
+        self.discard_pile = []
+        self.last_discard_pile = []
+        self.num_times_to_show_last_discard_pile = 0
+        self.players_turn = get_random_generator(self).randrange(len(players))
+        self.num_played_2s = 0  # how many '2's have been played so far this turn
+        self.forced_card = []  # (if not empty) holds the only card allowed to be played next this turn
+        self.is_game_won = False
+        for deal in range(hand_size):  # deal the same way sorry_boardgame() does
+            player_to_start_deal_to = (self.players_turn + len(players) - 1) % len(players)
+            for player_to_deal_to_offset in range(len(players)):
+                players[(player_to_start_deal_to + player_to_deal_to_offset) % len(players)].cards_in_hand.append(self.draw_pile.pop())
+        begin_turn(self)
+
+    def __getstate__(self):  # a copy of the game pickled for another process (such as a server's bot process) leaves the event bus behind, as its subscribers are this process's
+        state = dict(self.__dict__)
+        state['event_bus'] = None
+        return state
+
+
+def new_game_state(player_types, hand_size=5, are_teams=False, can_sevens_be_split_across_more_than_two_pawns=False, is_immediate_draw_after_playing_a_2=True, is_card_after_playing_a_2_force_played=False, is_faster_play=False, event_bus=None, board=None, random_generator=None):  # takes a dictionary mapping Color members to PlayerType members (with absent colors being nonexistent), the rule settings sorry_boardgame() otherwise prompts for, (optionally) a GameEventBus, (optionally) a CompiledBoard to play on instead of the standard board, and (optionally) the random.Random the game is dealt and played with (see GameState); returns a GameState ready for its first play
+    players = []
+    for player_color in ([Color.BLUE, Color.YELLOW, Color.GREEN, Color.RED] if board is None else board.geometry.side_colors):  # in order of play
+        if player_types.get(player_color, PlayerType.NONEXISTENT) != PlayerType.NONEXISTENT:
+            players.append(Player(player_color, player_types[player_color], hand_size, CardSelectMethod.BY_VALUE))
+    if is_faster_play:
+        for player in players:
+            player.pawns[player.name[0] + '1'] = get_start_exit_location(player.name[0]) if board is None else board.start_exit_locations[player.name[0]]
+    can_have_teams = len(players) == (4 if board is None else len(board.geometry.side_colors)) and (board is None or bool(board.teammate_letters))  # teams require every side to be seated
+    return GameState(players, hand_size, are_teams and can_have_teams, can_sevens_be_split_across_more_than_two_pawns and are_teams and can_have_teams, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, event_bus, board, random_generator)
+
+
+def restore_game_state(players, hand_size, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, players_turn, num_played_2s=0, forced_card=None, is_game_won=False, event_bus=None, board=None):  # returns a GameState holding an already dealt game (such as one being played by sorry_boardgame() or one loaded from a checkpoint) as is
+    game_state = GameState.__new__(GameState)  # bypasses GameState.__init__() as that shuffles and deals a new game
+    game_state.event_bus = event_bus
+    game_state.random_generator = None
+    game_state.board = board
+    game_state.players = players
+    game_state.hand_size = hand_size
+    game_state.are_teams = are_teams
+    game_state.can_sevens_be_split_across_more_than_two_pawns = can_sevens_be_split_across_more_than_two_pawns
+    game_state.is_immediate_draw_after_playing_a_2 = is_immediate_draw_after_playing_a_2
+    game_state.is_card_after_playing_a_2_force_played = is_card_after_playing_a_2_force_played
+    game_state.draw_pile = draw_pile
+    game_state.discard_pile = discard_pile
+    game_state.last_discard_pile = last_discard_pile
+    game_state.num_times_to_show_last_discard_pile = num_times_to_show_last_discard_pile
+    game_state.players_turn = players_turn
+    game_state.num_played_2s = num_played_2s
+    game_state.forced_card = forced_card if forced_card is not None else []
+    game_state.is_game_won = is_game_won
+    return game_state
+
+
+def begin_turn(game_state):  # prepares the player whose turn it is to play (when there are no hands of cards, this is drawing the card to be played)
+    game_state.num_played_2s = 0
+    game_state.forced_card = []
+    if game_state.hand_size == 0:
+        game_state.forced_card = [draw_card_for_game_state(game_state)]
+
+
+def get_random_generator(game_state):  # returns the random.Random the game uses (see GameState), otherwise the random module
+    return game_state.random_generator if game_state.random_generator is not None else random
+
+
+def get_possible_plays_for_game_state(game_state, do_score=False, model=None):  # returns the possible plays (see enumerate_possible_plays()) of the player whose turn it is, scored for a computer-controlled player if do_score (with model, a PlayScoringModel, if provided)
+    player_to_play = game_state.players[game_state.players_turn]
+    if game_state.board is not None:
+        return enumerate_possible_plays_on_board(game_state.board, game_state.forced_card if game_state.forced_card else player_to_play.cards_in_hand, player_to_play.name, get_all_pawns(game_state.players), game_state.are_teams, game_state.can_sevens_be_split_across_more_than_two_pawns, game_state.is_immediate_draw_after_playing_a_2, game_state.discard_pile if do_score else None, get_random_generator(game_state), model)
+    return enumerate_possible_plays(game_state.forced_card if game_state.forced_card else player_to_play.cards_in_hand, player_to_play.name, get_all_pawns(game_state.players), game_state.are_teams, False, game_state.can_sevens_be_split_across_more_than_two_pawns, game_state.is_immediate_draw_after_playing_a_2, game_state.is_card_after_playing_a_2_force_played, game_state.discard_pile if do_score else None, get_random_generator(game_state), model)
+
+
+def select_play_with_max_score(possible_plays):  # returns the index of the (first) possible play of highest 'play_score', or None if there are no possible plays
+    max_score = None
+    index_of_play_with_max_score = None
+    for index in range(len(possible_plays)):
+        if max_score is None or possible_plays[index]['play_score'] > max_score:
+            max_score = possible_plays[index]['play_score']
+            index_of_play_with_max_score = index
+    return index_of_play_with_max_score
+
+
+def rescore_computer_plays(game_state, possible_plays, do_evaluate_by_rollouts=True, num_rollouts=None, time_limit=None):  # rescores a computer-controlled player's possible plays by playing out games (if a RolloutEvaluator is in use and do_evaluate_by_rollouts, unless the PolicyCache in use has the best play of the position) and then, in an endgame it covers, by the loaded EndgameTablebase (if any); num_rollouts and time_limit (if provided) override the RolloutEvaluator's for this turn only, and a turn played out fewer times is not cached
+    if rollout_evaluator is not None and do_evaluate_by_rollouts:
+        is_position_cached = policy_cache is not None and len(possible_plays) > 1 and game_state.board in [None, STANDARD_BOARD]
+        best_play, best_score = policy_cache.get_best_play(game_state, possible_plays) if is_position_cached else (None, None)
+        if best_play is not None:
+            for possible_play in possible_plays:
+                possible_play['play_score'] = best_score if possible_play is best_play else best_score - 1  # the other plays are only known to score lower
+        else:
+            rollout_evaluator.score_possible_plays(game_state, possible_plays, num_rollouts, time_limit)
+            if is_position_cached and (num_rollouts is None or num_rollouts >= rollout_evaluator.num_rollouts):
+                best_play = possible_plays[select_play_with_max_score(possible_plays)]
+                policy_cache.add_best_play(game_state, best_play, best_play['play_score'])
+    if endgame_tablebase is not None:
+        endgame_tablebase.score_possible_plays(game_state, possible_plays)
+
+
+def choose_computer_play(game_state, do_evaluate_by_rollouts=True, num_rollouts=None, time_limit=None):  # returns the possible play a computer-controlled player would make for the player whose turn it is (see rescore_computer_plays()); does not adjust game_state (so it is safe to run in a worker thread or process)
+    possible_plays = get_possible_plays_for_game_state(game_state, True, play_scoring_model)
+    rescore_computer_plays(game_state, possible_plays, do_evaluate_by_rollouts, num_rollouts, time_limit)
+    return possible_plays[select_play_with_max_score(possible_plays)]
+
+
+def get_play_pawn_targets_in_order(pawn_targets):  # returns pawn targets in a form where two plays compare equal only if their pawn targets would be applied identically (the order of a '7's split matters)
+    return list(pawn_targets.items()) if isinstance(pawn_targets, dict) else list(pawn_targets)
+
+
+def find_possible_play(possible_plays, requested_play):  # returns the element of possible_plays matching the requested play (a dictionary in the same form as a possible play, possibly missing 'is_card_a_ten_as_backward_one'), or None if the requested play is not a possible play
+    try:
+        requested_pawn_targets = get_play_pawn_targets_in_order(requested_play['pawn_targets'])
+        for possible_play in possible_plays:
+            if possible_play['card_to_play'] == requested_play['card_to_play'] and get_play_pawn_targets_in_order(possible_play['pawn_targets']) == requested_pawn_targets and possible_play.get('is_card_a_ten_as_backward_one', False) == bool(requested_play.get('is_card_a_ten_as_backward_one', False)):
+                return possible_play
+    except (KeyError, TypeError, AttributeError):  # malformed requested play
+        pass
+    return None
+
+
+def get_play_path(pawn_targets):  # returns the choices (after the card) making up pawn targets in the order they are chosen: each pawn label, each followed by its distance for a '7' split (pawn targets as a dictionary)
+    return [choice for pawn_target in pawn_targets.items() for choice in pawn_target] if isinstance(pawn_targets, dict) else list(pawn_targets)
+
+
+def get_play_completion_key(pawn_targets):  # returns a hashable key two plays share only if determine_default_action() treats them as the same choice (the order of a '7's split matters, the order of other pawn targets does not)
+    return tuple(pawn_targets.items()) if isinstance(pawn_targets, dict) else tuple(sorted(pawn_targets))
+
+
+PossiblePlayTrieNode = collections.namedtuple('PossiblePlayTrieNode', ['children', 'completions', 'plays'])  # children maps the next choice (see get_play_path()) to its node; completions maps the completion key (see get_play_completion_key()) of every possible play passing through the node to those plays (more than one for a '10' playable both ways or a repeated play); plays are the possible plays ending at the node
+
+
+class PossiblePlayTrie:  # the possible plays (see enumerate_possible_plays()) of a turn indexed by card, then by each choice of get_play_path(), so whether a partly chosen play is some play's prefix, what can be chosen next, and whether only one play remains are each answered by walking as many nodes as choices were made
+    def __init__(self, possible_plays):
+        self.cards = {}  # maps each card to the root node of its plays
+        for possible_play in possible_plays:
+            completion_key = get_play_completion_key(possible_play['pawn_targets'])
+            node = self.cards.get(possible_play['card_to_play'])
+            if node is None:
+                node = self.cards[possible_play['card_to_play']] = PossiblePlayTrieNode({}, {}, [])
+            node.completions.setdefault(completion_key, []).append(possible_play)
+            for choice in get_play_path(possible_play['pawn_targets']):
+                if choice not in node.children:
+                    node.children[choice] = PossiblePlayTrieNode({}, {}, [])
+                node = node.children[choice]
+                node.completions.setdefault(completion_key, []).append(possible_play)
+            node.plays.append(possible_play)
+
+    def get_node(self, card_value, pawn_targets):  # returns the node reached by the card and the pawn targets chosen so far (a list, or a dictionary for a '7'), or None if no possible play starts with them
+        try:
+            node = self.cards.get(card_value)
+            for choice in get_play_path(pawn_targets):
+                if node is None:
+                    break
+                node = node.children.get(choice)
+        except TypeError:  # malformed (unhashable) choice
+            return None
+        return node
+
+    def is_valid_prefix(self, card_value, pawn_targets):
+        return self.get_node(card_value, pawn_targets) is not None
+
+    def get_next_choices(self, card_value, pawn_targets):  # returns the choices that continue the pawn targets chosen so far toward some possible play
+        node = self.get_node(card_value, pawn_targets)
+        return list(node.children) if node is not None else []
+
+    def get_completions(self, card_value, pawn_targets):  # returns every possible play starting with the card and the pawn targets chosen so far
+        node = self.get_node(card_value, pawn_targets)
+        return [possible_play for possible_plays in node.completions.values() for possible_play in possible_plays] if node is not None else []
+
+    def get_only_completion(self, card_value, pawn_targets):  # returns the possible plays of the only choice (see get_play_completion_key()) that completes the pawn targets chosen so far, or None if there is no such choice or more than one
+        node = self.get_node(card_value, pawn_targets)
+        if node is None or len(node.completions) != 1:
+            return None
+        return next(iter(node.completions.values()))
+
+    def find_possible_play(self, requested_play):  # returns what find_possible_play() would for the plays of the trie
+        try:
+            node = self.get_node(requested_play['card_to_play'], requested_play['pawn_targets'])
+            if node is not None:
+                requested_pawn_targets = get_play_pawn_targets_in_order(requested_play['pawn_targets'])
+                for possible_play in node.plays:
+                    if get_play_pawn_targets_in_order(possible_play['pawn_targets']) == requested_pawn_targets and possible_play.get('is_card_a_ten_as_backward_one', False) == bool(requested_play.get('is_card_a_ten_as_backward_one', False)):
+                        return possible_play
+        except (KeyError, TypeError, AttributeError):  # malformed requested play
+            pass
+        return None
+
+
+def apply_play_to_game_state(game_state, play):  # takes a possible play (see enumerate_possible_plays()) for the player whose turn it is and applies it, continuing the turn after a '2' and otherwise finishing the turn (drawing, checking for a win, and passing play on); returns whether the turn is over
+    players = game_state.players
+    player_to_play = players[game_state.players_turn]
+    all_pawns = get_all_pawns(players)
+    card_to_play = play['card_to_play']
+    pawn_targets = play['pawn_targets']
+    play_card_and_publish_events(game_state.event_bus, player_to_play.name, play, all_pawns, game_state.board)
+    if 'd' not in pawn_targets and pawn_targets:
+        update_player_pawns(players, all_pawns)
+    player_to_play.cards_in_hand.remove(card_to_play)
+    game_state.discard_pile.append(card_to_play)
+    if card_to_play == '2' and 'd' not in pawn_targets:  # continue the player's turn by having them choose an additional card to play
+        game_state.num_played_2s += 1
+        game_state.forced_card = []
+        if game_state.is_immediate_draw_after_playing_a_2:
+            drawn_card = draw_card_for_game_state(game_state)
+            if game_state.is_card_after_playing_a_2_force_played:
+                game_state.forced_card = [drawn_card]
+        return False
+    if game_state.hand_size != 0:
+        for i in range(1 + (game_state.num_played_2s if not game_state.is_immediate_draw_after_playing_a_2 else 0)):  # also draw the extra card(s) for having played some number of '2's if they weren't drawn immediately
+            draw_card_for_game_state(game_state)
+    teammate_letter = (game_state.board if game_state.board is not None else STANDARD_BOARD).teammate_letters.get(player_to_play.name[0])
+    game_state.is_game_won = all(player_to_play.pawns[pawn] == SpecialLocation.HOME.value for pawn in player_to_play.pawns) and (not game_state.are_teams or all(player.pawns[pawn] == SpecialLocation.HOME.value for player in players if player.name[0] == teammate_letter for pawn in player.pawns))
+    if game_state.is_game_won:
+        for victor in get_victors(players):
+            publish_game_event(game_state.event_bus, GameEventType.GAME_WON, victor)
+    else:
+        game_state.players_turn = (game_state.players_turn + 1) % len(players)
+        begin_turn(game_state)
+    return True
+
+
+def serialize_pawn_locations(all_pawns):  # returns all_pawns in a JSON-compatible form (each location being an [x, y] list or SpecialLocation value)
+    return {pawn_label: ([location[Coordinate.X], location[Coordinate.Y]] if isinstance(location, dict) else location) for pawn_label, location in all_pawns.items()}
+
+
+class SpeculativeAnalysis:  # analyzes (in a background thread, such as while a human-controlled player is prompted for their play) the possible plays of the player to play and, if the next player is computer-controlled, that player's scored possible plays for every position the play could lead to (starting with the plays of the card the player selects, once known), all on STANDARD_BOARD, and then rescores those plays as rescore_computer_plays() would on the next player's turn
+    def __init__(self, hand_of_cards, name_of_player_to_play, all_pawns, discard_pile, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, next_player=None, game_state=None):  # next_player (if provided and computer-controlled) is the player whose turn follows, expected to keep their current hand; game_state (if provided) is the GameState of the position (see restore_game_state()), copied here so the next player's plays can be rescored by playing out games and by the endgame tablebase (whichever are in use) from the position each play leads to
+        self.hand_of_cards = list(hand_of_cards)
+        self.name_of_player_to_play = name_of_player_to_play
+        self.board_pawns = get_standard_board_pawns(all_pawns)
+        self.discard_pile = list(discard_pile)
+        self.are_teams = are_teams
+        self.can_sevens_be_split_across_more_than_two_pawns = can_sevens_be_split_across_more_than_two_pawns
+        self.is_immediate_draw_after_playing_a_2 = is_immediate_draw_after_playing_a_2
+        self.next_player_hand = list(next_player.cards_in_hand) if next_player is not None and next_player.player_type == PlayerType.COMPUTER and next_player.name != name_of_player_to_play else None
+        self.next_player_name = next_player.name if next_player is not None else None
+        self.possible_plays = None
+        self.next_player_possible_plays = {}  # maps a tuple of the locations of every pawn (in the order of all_pawns) after a play and the card played to the next player's scored possible plays
+        self.game_state = copy.deepcopy(game_state) if self.next_player_hand is not None and (rollout_evaluator is not None or endgame_tablebase is not None) else None  # (only needed to rescore the next player's plays)
+        self.next_player_rescored_plays = {}  # maps the same keys as next_player_possible_plays to the next player's possible plays rescored by rescore_computer_plays()
+        self.selected_card = None
+        self.is_cancelled = threading.Event()
+        self.are_possible_plays_analyzed = threading.Event()
+        self.thread = threading.Thread(target=self.analyze, daemon=True)
+        self.thread.start()
+
+    def analyze(self):
+        try:
+            self.possible_plays = enumerate_possible_plays_on_board(STANDARD_BOARD, self.hand_of_cards, self.name_of_player_to_play, self.board_pawns, self.are_teams, self.can_sevens_be_split_across_more_than_two_pawns, self.is_immediate_draw_after_playing_a_2)
+        finally:
+            self.are_possible_plays_analyzed.set()  # even on failure, so get_possible_plays() never waits forever (returning None instead)
+        if self.next_player_hand is None:
+            return
+        plays_to_analyze = [possible_play for possible_play in self.possible_plays if possible_play['card_to_play'] != '2' or 'd' in possible_play['pawn_targets']]  # playing a '2' (other than to discard it) continues the turn, so the next player's turn is not reached
+        plays_to_rescore = []  # (play, position) pairs of the positions analyzed, rescored once every position is scored as they take much longer
+        while plays_to_analyze and not self.is_cancelled.is_set():
+            selected_card = self.selected_card
+            play = plays_to_analyze.pop(next((index for index in range(len(plays_to_analyze)) if plays_to_analyze[index]['card_to_play'] == selected_card), 0))
+            board_pawns_after_play = dict(self.board_pawns)
+            if 'd' not in play['pawn_targets']:
+                play_card_on_board(STANDARD_BOARD, play['card_to_play'], play['pawn_targets'], board_pawns_after_play, play.get('is_card_a_ten_as_backward_one', False))
+            position = (tuple(board_pawns_after_play.values()), play['card_to_play'])
+            if position not in self.next_player_possible_plays:
+                self.next_player_possible_plays[position] = enumerate_possible_plays_on_board(STANDARD_BOARD, self.next_player_hand, self.next_player_name, board_pawns_after_play, self.are_teams, self.can_sevens_be_split_across_more_than_two_pawns, self.is_immediate_draw_after_playing_a_2, self.discard_pile + [play['card_to_play']], random, play_scoring_model)
+                plays_to_rescore.append((play, position))
+        if self.game_state is None:
+            return
+        while plays_to_rescore and not self.is_cancelled.is_set():
+            selected_card = self.selected_card
+            play, position = plays_to_rescore.pop(next((index for index in range(len(plays_to_rescore)) if plays_to_rescore[index][0]['card_to_play'] == selected_card), 0))
+            game_state_after_play = copy.deepcopy(self.game_state)
+            game_state_after_play.random_generator = random.Random()  # only a reshuffle draws from it, after which the position is not looked up anyway (the discard pile differs)
+            apply_play_to_game_state(game_state_after_play, play)
+            if not game_state_after_play.is_game_won:
+                rescored_plays = [dict(possible_play) for possible_play in self.next_player_possible_plays[position]]
+                rescore_computer_plays(game_state_after_play, rescored_plays)
+                self.next_player_rescored_plays[position] = rescored_plays
+
+    def select_card(self, card):  # prioritizes analyzing the positions the plays of the selected card lead to
+        self.selected_card = card
+
+    def cancel(self):  # stops the analysis once the position being analyzed or rescored (if any) is done; what was already analyzed stays available
+        self.is_cancelled.set()
+        self.thread.join()
+
+    def get_possible_plays(self, hand_of_cards, all_pawns):  # returns the analyzed possible plays (see enumerate_possible_plays()) if they were analyzed for the given hand and position (waiting for them if need be, as they are analyzed first), otherwise None
+        if list(hand_of_cards) != self.hand_of_cards or get_standard_board_pawns(all_pawns) != self.board_pawns:
+            return None
+        self.are_possible_plays_analyzed.wait()
+        return self.possible_plays
+
+    def get_next_player_possible_plays(self, hand_of_cards, name_of_player_to_play, all_pawns, discard_pile):  # returns the analyzed scored possible plays of the next player if the given player, hand, position, and discard pile (holding the card played last) were analyzed, otherwise None, and whether they were also rescored (see rescore_computer_plays())
+        if self.next_player_hand is None or name_of_player_to_play != self.next_player_name or list(hand_of_cards) != self.next_player_hand or not discard_pile or discard_pile[:-1] != self.discard_pile:
+            return None, False
+        position = (tuple(get_standard_board_pawns(all_pawns).values()), discard_pile[-1])
+        if position in self.next_player_rescored_plays:
+            return self.next_player_rescored_plays[position], True
+        return self.next_player_possible_plays.get(position), False
 
 
 def get_player_type(player_name, default_enum):  # takes the player's name (as a string) and an enum mapping the word to show to indicate the default option to the value to assign if the default option is chosen; returns the selected PlayerType
@@ -822,82 +1613,118 @@ def get_user_confirmation(message):  # returns True on confirmation and False on
     return input_string in valid_confirmation_strings
 
 
-def sorry_boardgame():  # returns zero on success and nonzero (some other integer) on failure
-    clear_console()  # clearing console at the beginning appears to be required for coloring
+class ConsoleGameEventRenderer:  # a subscriber of a GameEventBus printing what the console game announces of the events published to it (reshuffles of the discard pile and the victors), the rest being shown by the board and discard pile printers
+    def __init__(self, event_bus):
+        self.subscription = event_bus.subscribe()
 
-    num_players = 0
-    blue_player_type = get_player_type(Color.BLUE.name.lower(), PlayerType.HUMAN)
-    num_players += (blue_player_type != PlayerType.NONEXISTENT)
-    green_player_type = get_player_type(Color.GREEN.name.lower(), PlayerType.COMPUTER)
-    num_players += (green_player_type != PlayerType.NONEXISTENT)
-    red_player_type = get_player_type(Color.RED.name.lower(), PlayerType.NONEXISTENT)
-    num_players += (red_player_type != PlayerType.NONEXISTENT)
-    yellow_player_type = get_player_type(Color.YELLOW.name.lower(), PlayerType.NONEXISTENT)
-    num_players += (yellow_player_type != PlayerType.NONEXISTENT)
-    print()
+    def render_events(self):  # prints the events published since the last call
+        victors = []
+        for event in self.subscription.get_all_nowait():
+            if event.event_type == GameEventType.RESHUFFLE:
+                print("Shuffled discard pile back into the draw pile.")
+            elif event.event_type == GameEventType.GAME_WON:
+                victors.append(event.player_name)
+        if victors:
+            print(victors[0] + (" and " + victors[1] if len(victors) == 2 else ""), "won! Congratulations!")
 
-    are_teams = False   # teaming is only allowed in four-player games
-    can_sevens_be_split_across_more_than_two_pawns = False   # the ability to split sevens among more than two pawns is only allowed in four-player games
-    # if num_players == 0:  # deprecated for being excessively strict an unclear as to whether the the program should exit with or without an error code
-        # return 1  # deprecated for being excessively strict an unclear as to whether the the program should exit with or without an error code
-    if num_players == 1:
-        if not get_user_confirmation("There is only one player. Are you sure you want to continue?"):
-            return 0
-    elif num_players == 4:
-        are_teams = get_user_confirmation("Is play in teams?")
-        if are_teams:
-            can_sevens_be_split_across_more_than_two_pawns = get_user_confirmation("Can sevens be split across more than two pawns?")
-
-    draw_pile = ['1'] * 5 + ['2'] * 4 + ['3'] * 4 + ['4'] * 4 + ['5'] * 4 + ['7'] * 4 + ['8'] * 4 + ['10'] * 4 + ['11'] * 4 + ['12'] * 4 + ['Sorry'] * 4  # distribution collected from an owned version of the game
-    hand_size = None
-    while hand_size is None or not isinstance(hand_size, int) or hand_size < 0 or hand_size > len(draw_pile) / num_players:  # must have enough cards in the deck to deal
-        hand_size = input("Hand size (default is 5): ")
+
+def sorry_boardgame(checkpoint_path=None):  # (if checkpoint_path is provided) offers to resume the game saved there and saves the game there after every turn; returns zero on success and nonzero (some other integer) on failure
+    clear_console()  # clearing console at the beginning appears to be required for coloring
+
+    resumed_game_state = None
+    if checkpoint_path is not None and os.path.exists(checkpoint_path) and get_user_confirmation("Resume the saved game?"):
         try:
-            hand_size = int(hand_size)
-        except ValueError:
-            if not hand_size:
-                hand_size = 5
-    is_immediate_draw_after_playing_a_2 = (hand_size == 0) or get_user_confirmation("Can players immediately draw after playing a 2?")
-    is_card_after_playing_a_2_force_played = is_immediate_draw_after_playing_a_2 and (hand_size == 0 or get_user_confirmation("Must players play the card they just drew after playing a 2?"))
-
-    players = []  # blue, yellow, green, red (in order of play)
-    if blue_player_type != PlayerType.NONEXISTENT:
-        players.append(Player(Color.BLUE, blue_player_type, hand_size))
-    if yellow_player_type != PlayerType.NONEXISTENT:
-        players.append(Player(Color.YELLOW, yellow_player_type, hand_size))
-    if green_player_type != PlayerType.NONEXISTENT:
-        players.append(Player(Color.GREEN, green_player_type, hand_size))
-    if red_player_type != PlayerType.NONEXISTENT:
-        players.append(Player(Color.RED, red_player_type, hand_size))
-    if get_user_confirmation("Faster play (each player begins the game with one pawn out of start)?"):
+            resumed_game_state, do_show_card_descriptions = load_checkpoint(checkpoint_path)
+        except ValueError as error:
+            print(f"Could not resume the saved game: {error}")
+    if resumed_game_state is None:
+        num_players = 0
+        blue_player_type = get_player_type(Color.BLUE.name.lower(), PlayerType.HUMAN)
+        num_players += (blue_player_type != PlayerType.NONEXISTENT)
+        green_player_type = get_player_type(Color.GREEN.name.lower(), PlayerType.COMPUTER)
+        num_players += (green_player_type != PlayerType.NONEXISTENT)
+        red_player_type = get_player_type(Color.RED.name.lower(), PlayerType.NONEXISTENT)
+        num_players += (red_player_type != PlayerType.NONEXISTENT)
+        yellow_player_type = get_player_type(Color.YELLOW.name.lower(), PlayerType.NONEXISTENT)
+        num_players += (yellow_player_type != PlayerType.NONEXISTENT)
+        print()
+
+        are_teams = False   # teaming is only allowed in four-player games
+        can_sevens_be_split_across_more_than_two_pawns = False   # the ability to split sevens among more than two pawns is only allowed in four-player games
+        # if num_players == 0:  # deprecated for being excessively strict an unclear as to whether the the program should exit with or without an error code
+            # return 1  # deprecated for being excessively strict an unclear as to whether the the program should exit with or without an error code
+        if num_players == 1:
+            if not get_user_confirmation("There is only one player. Are you sure you want to continue?"):
+                return 0
+        elif num_players == 4:
+            are_teams = get_user_confirmation("Is play in teams?")
+            if are_teams:
+                can_sevens_be_split_across_more_than_two_pawns = get_user_confirmation("Can sevens be split across more than two pawns?")
+
+        draw_pile = create_draw_pile()
+        hand_size = None
+        while hand_size is None or not isinstance(hand_size, int) or hand_size < 0 or hand_size > len(draw_pile) / num_players:  # must have enough cards in the deck to deal
+            hand_size = input("Hand size (default is 5): ")
+            try:
+                hand_size = int(hand_size)
+            except ValueError:
+                if not hand_size:
+                    hand_size = 5
+        is_immediate_draw_after_playing_a_2 = (hand_size == 0) or get_user_confirmation("Can players immediately draw after playing a 2?")
+        is_card_after_playing_a_2_force_played = is_immediate_draw_after_playing_a_2 and (hand_size == 0 or get_user_confirmation("Must players play the card they just drew after playing a 2?"))
+
+        players = []  # blue, yellow, green, red (in order of play)
+        if blue_player_type != PlayerType.NONEXISTENT:
+            players.append(Player(Color.BLUE, blue_player_type, hand_size))
+        if yellow_player_type != PlayerType.NONEXISTENT:
+            players.append(Player(Color.YELLOW, yellow_player_type, hand_size))
+        if green_player_type != PlayerType.NONEXISTENT:
+            players.append(Player(Color.GREEN, green_player_type, hand_size))
+        if red_player_type != PlayerType.NONEXISTENT:
+            players.append(Player(Color.RED, red_player_type, hand_size))
+        if get_user_confirmation("Faster play (each player begins the game with one pawn out of start)?"):
+            for player in players:
+                player.pawns[player.name[0] + '1'] = get_start_exit_location(player.name[0])
+        do_show_card_descriptions = get_user_confirmation(f"Turn on card descriptions during play (recommended with novice players)?")
+        print()
+
         for player in players:
-            if player.name[0] == Color.BLUE.name[0]:
-                player.pawns[player.name[0] + '1'] = Location.BLUE_START_EXIT.value.copy()
-            elif player.name[0] == Color.GREEN.name[0]:
-                player.pawns[player.name[0] + '1'] = Location.GREEN_START_EXIT.value.copy()
-            elif player.name[0] == Color.RED.name[0]:
-                player.pawns[player.name[0] + '1'] = Location.RED_START_EXIT.value.copy()
-            elif player.name[0] == Color.YELLOW.name[0]:  # this last condition check is actually redundant
-                player.pawns[player.name[0] + '1'] = Location.YELLOW_START_EXIT.value.copy()
-    do_show_card_descriptions = get_user_confirmation(f"Turn on card descriptions during play (recommended with novice players)?")
-    print()
+            if player.player_type != PlayerType.NONEXISTENT:
+                print(f"{get_text_color(player.name[0])}{player.name}{Color.RESET.value} is", (PlayerType.COMPUTER.name.lower() if player.player_type == PlayerType.COMPUTER else PlayerType.HUMAN.name.lower()) + "-controlled")
 
-    for player in players:
-        if player.player_type != PlayerType.NONEXISTENT:
-            print(f"{get_text_color(player.name[0])}{player.name}{Color.RESET.value} is", (PlayerType.COMPUTER.name.lower() if player.player_type == PlayerType.COMPUTER else PlayerType.HUMAN.name.lower()) + "-controlled")
-
-    discard_pile = []
-    random.shuffle(draw_pile)
-    last_discard_pile = discard_pile.copy()  # to show the other players what was played just before the discard pile got reshuffled in case the pile was (re)shuffled since the player last saw it (to know what the other players played)
-    num_times_to_show_last_discard_pile = 0  # for showing the other players what was played just before the discard pile got reshuffled in case the pile was (re)shuffled since the player last saw it (to know what the other players played)
-    players_turn = random.randrange(num_players)
-    input(f"{get_text_color(players[players_turn].name[0])}{players[players_turn].name}{Color.RESET.value} (randomly) goes first! Press enter to begin the game.")  # input() rather than print() so the console can immediately be cleared afterward
-    clear_console()
-    for deal in range(hand_size):  # player right of the first player deals (given random deck shuffling and lack of cheating by having the computer deal, doing the deal this (the usual) way is only for appearances)
-        player_to_start_deal_to = (players_turn + num_players - 1) % num_players  # deal starts with the player left of the dealer
-        for player_to_deal_to_offset in range(num_players):
-            players[(player_to_start_deal_to + player_to_deal_to_offset) % num_players].cards_in_hand.append(draw_pile.pop())
+        discard_pile = []
+        random.shuffle(draw_pile)
+        last_discard_pile = discard_pile.copy()  # to show the other players what was played just before the discard pile got reshuffled in case the pile was (re)shuffled since the player last saw it (to know what the other players played)
+        num_times_to_show_last_discard_pile = 0  # for showing the other players what was played just before the discard pile got reshuffled in case the pile was (re)shuffled since the player last saw it (to know what the other players played)
+        players_turn = random.randrange(num_players)
+        input(f"{get_text_color(players[players_turn].name[0])}{players[players_turn].name}{Color.RESET.value} (randomly) goes first! Press enter to begin the game.")  # input() rather than print() so the console can immediately be cleared afterward
+        clear_console()
+        for deal in range(hand_size):  # player right of the first player deals (given random deck shuffling and lack of cheating by having the computer deal, doing the deal this (the usual) way is only for appearances)
+            player_to_start_deal_to = (players_turn + num_players - 1) % num_players  # deal starts with the player left of the dealer
+            for player_to_deal_to_offset in range(num_players):
+                players[(player_to_start_deal_to + player_to_deal_to_offset) % num_players].cards_in_hand.append(draw_pile.pop())
+    else:
+        players = resumed_game_state.players
+        num_players = len(players)
+        hand_size = resumed_game_state.hand_size
+        are_teams = resumed_game_state.are_teams
+        can_sevens_be_split_across_more_than_two_pawns = resumed_game_state.can_sevens_be_split_across_more_than_two_pawns
+        is_immediate_draw_after_playing_a_2 = resumed_game_state.is_immediate_draw_after_playing_a_2
+        is_card_after_playing_a_2_force_played = resumed_game_state.is_card_after_playing_a_2_force_played
+        draw_pile = resumed_game_state.draw_pile
+        discard_pile = resumed_game_state.discard_pile
+        last_discard_pile = resumed_game_state.last_discard_pile
+        num_times_to_show_last_discard_pile = resumed_game_state.num_times_to_show_last_discard_pile
+        players_turn = resumed_game_state.players_turn
+        if hand_size == 0 and resumed_game_state.forced_card and resumed_game_state.num_played_2s == 0:  # the card drawn for the turn (see begin_turn()) goes back on the draw pile as it is drawn at the start of each turn below
+            players[players_turn].cards_in_hand.remove(resumed_game_state.forced_card[0])
+            draw_pile.append(resumed_game_state.forced_card[0])
+        input(f"Resuming with {get_text_color(players[players_turn].name[0])}{players[players_turn].name}'s{Color.RESET.value} turn. Press enter to continue the game.")
+        clear_console()
     is_game_won = False
+    speculative_analysis = None
+    event_bus = GameEventBus()  # the game's progress is published here rather than printed as it happens
+    console_event_renderer = ConsoleGameEventRenderer(event_bus)
 
     while not is_game_won:
         player_to_play = players[players_turn]
@@ -921,6 +1748,8 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
             num_times_to_show_last_discard_pile -= 1
             print_last_discard_pile(last_discard_pile)
         print_discard_pile(discard_pile)
+        if player_to_play.player_type == PlayerType.HUMAN and hand_size != 0:  # analyze the human's possible plays and the next player's replies to them while the human is prompted (with no hands of cards, this waits for the card to play to be drawn)
+            speculative_analysis = SpeculativeAnalysis(player_to_play.cards_in_hand, player_to_play.name, all_pawns, discard_pile, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, players[(players_turn + 1) % num_players], restore_game_state(players, hand_size, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, players_turn))
         input(f"{get_text_color(player_to_play.name[0])}{player_to_play.name}'s{Color.RESET.value} turn (press enter to continue)") if player_to_play.player_type == PlayerType.HUMAN else print(f"{get_text_color(player_to_play.name[0])}{player_to_play.name}'s{Color.RESET.value} turn")
         if player_to_play.player_type == PlayerType.HUMAN:
             print_hand_of_cards(player_to_play)
@@ -928,9 +1757,11 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
         is_valid_play = False
         card_to_play = None
         if hand_size == 0:  # immediately draw the card if there are no hands of cards
-            drawn_card, num_times_to_show_last_discard_pile = draw_card(draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
-            player_to_play.cards_in_hand.append(drawn_card)
+            drawn_card, num_times_to_show_last_discard_pile = draw_card_into_hand(event_bus, player_to_play, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
+            console_event_renderer.render_events()
             card_to_play = player_to_play.cards_in_hand[0]
+            if player_to_play.player_type == PlayerType.HUMAN:
+                speculative_analysis = SpeculativeAnalysis(player_to_play.cards_in_hand, player_to_play.name, all_pawns, discard_pile, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2)  # the next player's card is not drawn yet, so their replies are not analyzed
         is_card_a_ten_as_backward_one = False
         pawn_targets = []  # labels of pawn(s) to target (or contains 'd' if card is to be discarded); may also temporarily contain 'c' if play is not yet valid
         num_played_2s = 0  # count played '2's rather than have a boolean flag in case not is_immediate_draw_after_playing_a_2 so the correct number of extra draws can be known
@@ -956,7 +1787,9 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                     if card_to_play in player_to_play.cards_in_hand:
                         selected_card_has_some_valid_play = False  # to be corrected as necessary
                         is_no_valid_movement_for_2 = True  # to be corrected as necessary
-                        possible_plays = enumerate_possible_plays(player_to_play.cards_in_hand, player_to_play.name, all_pawns, are_teams, False, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played)
+                        possible_plays = speculative_analysis.get_possible_plays(player_to_play.cards_in_hand, all_pawns) if speculative_analysis is not None else None
+                        if possible_plays is None:
+                            possible_plays = enumerate_possible_plays_on_board(STANDARD_BOARD, player_to_play.cards_in_hand, player_to_play.name, get_standard_board_pawns(all_pawns), are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2)  # (as SpeculativeAnalysis does)
                         for possible_play in possible_plays:
                             if possible_play['card_to_play'] == card_to_play:
                                 selected_card_has_some_valid_play = True
@@ -975,6 +1808,12 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                                 do_no_movement_for_2 = True
                             else:
                                 card_to_play = None
+                if speculative_analysis is not None:
+                    speculative_analysis.select_card(card_to_play)
+                possible_plays = speculative_analysis.get_possible_plays(player_to_play.cards_in_hand, all_pawns) if speculative_analysis is not None else None  # (again) as the card may have been forced or drawn rather than chosen above
+                if possible_plays is None:
+                    possible_plays = enumerate_possible_plays_on_board(STANDARD_BOARD, player_to_play.cards_in_hand, player_to_play.name, get_standard_board_pawns(all_pawns), are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2)
+                possible_play_trie = PossiblePlayTrie(possible_plays)  # answers which pawn targets can still complete a play as they are chosen
 
                 num_times_eleven_prompted_validly = 0  # an 11 is the only card that might have a valid move with both one and multiple (two) pawn targets, or might have an invalid first pawn target (since it would be assumed that one target is for a forward pawn movement but two targets are for a swap, unless the user is to be prompted an extra time) so its pawn targeting begets the extra loop condition
                 seven_remaining_distance = 7  # only utilized when card_to_play == '7'
@@ -985,8 +1824,9 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                         pawn_target = None  # reset
                         if pawn_targets and card_to_play not in ['7', '10', '11', 'Sorry'] and not is_valid_target(pawn_targets, card_to_play, player_to_play.name, all_pawns, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_card_a_ten_as_backward_one):  # if an invalid pawn_target was already provided for a card that requires exactly one pawn target and has no mistaking for what the move is intended to be (otherwise no possible moves with the last chosen pawn target has the last chosen pawn target removed separately), throw out the old/invalid pawn target
                             pawn_targets.pop()
-                        is_some_possible_play = enumerate_possible_plays(player_to_play.cards_in_hand, player_to_play.name, all_pawns, are_teams, True, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played)
-                        default_choice, default_choice_string = determine_default_action(card_to_play, pawn_targets, possible_plays, all_pawns, player_to_play.name, are_teams)
+                        analyzed_possible_plays = speculative_analysis.get_possible_plays(player_to_play.cards_in_hand, all_pawns) if speculative_analysis is not None else None
+                        is_some_possible_play = enumerate_possible_plays(player_to_play.cards_in_hand, player_to_play.name, all_pawns, are_teams, True, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played) if analyzed_possible_plays is None else any('d' not in possible_play['pawn_targets'] for possible_play in analyzed_possible_plays)
+                        default_choice, default_choice_string = determine_default_action(card_to_play, pawn_targets, possible_plays, all_pawns, player_to_play.name, are_teams, possible_play_trie)
                         while pawn_target is None or (pawn_target not in all_pawns and pawn_target != 'c' and (pawn_target != 'd' or pawn_targets or is_some_possible_play) and (default_choice is None or pawn_target)):
                             pawn_target = input(f"Label of {'the (first)' if not pawn_targets else 'another'} pawn to target with card (such as {player_to_play.name[0]}1){',' if (num_played_2s == 0 or not is_card_after_playing_a_2_force_played) + (not pawn_targets and not is_some_possible_play) + (default_choice is not None) > 1 else (' or' if (num_played_2s == 0 or not is_card_after_playing_a_2_force_played) + (not pawn_targets and not is_some_possible_play) + (default_choice is not None) == 1 else '')}{' cancel/redo card choice (c)' if num_played_2s == 0 or not is_card_after_playing_a_2_force_played else ''}{',' if (num_played_2s == 0 or not is_card_after_playing_a_2_force_played) and ((not pawn_targets and not is_some_possible_play) or default_choice is not None) else ''}{' or' if (pawn_targets or is_some_possible_play) and default_choice is not None else ''}{' discard card (d)' if (not pawn_targets and not is_some_possible_play) else ''}{',' if (not pawn_targets and not is_some_possible_play) and default_choice is not None else ''}{' or' if default_choice is not None else ''}{f' go with the default choice of {default_choice_string} (input nothing)' if default_choice is not None else ''}: ")
                         if not pawn_target:
@@ -1016,7 +1856,7 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                                             pawn_targets = {pawn_target: distance_to_move_pawn}  # update pawn_targets to be a dictionary specifying how much this/each pawn is desired to be moved
                                         else:
                                             pawn_targets[pawn_target] = distance_to_move_pawn
-                                        if not is_some_valid_split_for_seven(pawn_targets, player_to_play.name, all_pawns, are_teams, seven_remaining_distance, can_sevens_be_split_across_more_than_two_pawns):  # verify there is some valid movement given the current movement distribution of the seven, otherwise call the last provided pawn target invalid
+                                        if not (possible_play_trie.is_valid_prefix(card_to_play, pawn_targets) if not can_sevens_be_split_across_more_than_two_pawns else is_some_valid_split_for_seven(pawn_targets, player_to_play.name, all_pawns, are_teams, seven_remaining_distance, can_sevens_be_split_across_more_than_two_pawns)):  # (possible plays splitting a '7' across more than two pawns are only enumerated in one order of the pawns, so other orders are checked by search) verify there is some valid movement given the current movement distribution of the seven, otherwise call the last provided pawn target invalid
                                             pawn_targets.pop(pawn_target)  # remove invalid pawn selection
                                 else:
                                     if not isinstance(pawn_targets, dict):
@@ -1024,7 +1864,7 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                                     else:
                                         pawn_targets.update(default_choice)
                             elif card_to_play == '10':
-                                if is_some_valid_move_for_ten(pawn_targets, player_to_play.name, all_pawns, are_teams):  # if at least one of the ways to play the ten are valid, ask the user for which method they intended (then again check if what they chose is valid)
+                                if possible_play_trie.is_valid_prefix(card_to_play, pawn_targets):  # if at least one of the ways to play the ten are valid, ask the user for which method they intended (then again check if what they chose is valid)
                                     is_card_a_ten_as_backward_one = ('b' if "backward" in default_choice_string else ('f' if "forward" in default_choice_string else None))
                                     while is_card_a_ten_as_backward_one not in ['c', 'b', 'f']:
                                         is_card_a_ten_as_backward_one = input(f"Do you want to use this card to move {pawn_targets[len(pawn_targets) - 1]} forward (f) by ten spaces, backward (b) by one space, or cancel/redo card choice (c)? ")
@@ -1036,12 +1876,12 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                                 else:
                                     pawn_targets.pop()  # remove invalid pawn selection
                             elif card_to_play == '11':
-                                is_some_valid_swap = is_some_valid_swap_for_eleven(pawn_targets[0], player_to_play.name, all_pawns, are_teams)
-                                num_times_eleven_prompted_validly += is_some_valid_swap  # ignore counting this prompt for the eleven card if the response was unacceptable
-                                if not is_some_valid_swap:
+                                if not possible_play_trie.is_valid_prefix(card_to_play, pawn_targets):
                                     pawn_targets.pop()  # remove invalid pawn selection
+                                elif len(pawn_targets) == 2 or possible_play_trie.get_next_choices(card_to_play, pawn_targets):  # only count this prompt for the eleven card if the response was acceptable and (for a first pawn that could also move forward alone) a swap could follow it
+                                    num_times_eleven_prompted_validly += 1
                             elif card_to_play == 'Sorry':
-                                if not is_some_valid_play_for_sorry(pawn_targets[0], player_to_play.name, all_pawns, are_teams):
+                                if not possible_play_trie.is_valid_prefix(card_to_play, pawn_targets):
                                     pawn_targets.pop()  # remove invalid pawn selection
                     if 'd' in pawn_targets:
                         continue
@@ -1049,8 +1889,8 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                     is_valid_play = False
                 elif card_to_play == '2':  # play the 2 then continue the player's turn by having them choose an additional card to play
                     num_played_2s += 1
+                    play_card_and_publish_events(event_bus, player_to_play.name, {'card_to_play': card_to_play, 'pawn_targets': pawn_targets}, all_pawns)
                     if not do_no_movement_for_2:
-                        play_card(card_to_play, pawn_targets, all_pawns)
                         pawn_targets = []  # reset
                         for pawn in all_pawns:  # need to update the players' copies of the pawns with any adjustments
                             for player in players:
@@ -1060,11 +1900,14 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                     player_to_play.cards_in_hand.remove(card_to_play)
                     discard_pile.append(card_to_play)
                     if is_immediate_draw_after_playing_a_2:
-                        drawn_card, num_times_to_show_last_discard_pile = draw_card(draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
-                        player_to_play.cards_in_hand.append(drawn_card)
+                        drawn_card, num_times_to_show_last_discard_pile = draw_card_into_hand(event_bus, player_to_play, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
+                        console_event_renderer.render_events()
                         if is_card_after_playing_a_2_force_played:  # otherwise card_to_play will be reset at the beginning of the next loop iteration
                             card_to_play = drawn_card
                     is_valid_play = False  # need to complete the play by playing another card
+                    if speculative_analysis is not None:
+                        speculative_analysis.cancel()
+                    speculative_analysis = SpeculativeAnalysis(player_to_play.cards_in_hand, player_to_play.name, all_pawns, discard_pile, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, players[(players_turn + 1) % num_players] if hand_size != 0 else None, restore_game_state(players, hand_size, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, players_turn, num_played_2s))  # analyze the rest of the turn from the position the '2' led to
                     print_current_gameboard(all_pawns)
                     if num_times_to_show_last_discard_pile != 0:
                         print_last_discard_pile(last_discard_pile)
@@ -1076,22 +1919,19 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                 forced_card = []
                 while not is_turn_done:
                     is_turn_done = True  # to be corrected as necessary
-                    possible_plays = enumerate_possible_plays(player_to_play.cards_in_hand if not forced_card else forced_card, player_to_play.name, all_pawns, are_teams, False, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, discard_pile)
-                    max_score = 0
-                    index_of_play_with_max_score = None
-                    index = 0
-                    for possible_play in possible_plays:
-                        if possible_play['play_score'] > max_score:
-                            max_score = possible_play['play_score']
-                            index_of_play_with_max_score = index
-                        index += 1
+                    possible_plays, are_plays_rescored = speculative_analysis.get_next_player_possible_plays(player_to_play.cards_in_hand, player_to_play.name, all_pawns, discard_pile) if speculative_analysis is not None and not forced_card else (None, False)  # already analyzed (and rescored, if there was time) if the previous (human-controlled) player's play was anticipated
+                    if possible_plays is None:
+                        possible_plays = enumerate_possible_plays_on_board(STANDARD_BOARD, player_to_play.cards_in_hand if not forced_card else forced_card, player_to_play.name, get_standard_board_pawns(all_pawns), are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, discard_pile, random, play_scoring_model)
+                    if (rollout_evaluator is not None or endgame_tablebase is not None) and not are_plays_rescored:
+                        rescore_computer_plays(restore_game_state(players, hand_size, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, players_turn, num_played_2s, forced_card if forced_card or hand_size != 0 else list(player_to_play.cards_in_hand)), possible_plays)
+                    index_of_play_with_max_score = select_play_with_max_score(possible_plays)
                     card_to_play = possible_plays[index_of_play_with_max_score]['card_to_play']
                     pawn_targets = possible_plays[index_of_play_with_max_score]['pawn_targets']
-                    if card_to_play == '2':
+                    if card_to_play == '2' and 'd' not in pawn_targets:  # (a discarded '2' is handled as any other last card of the turn)
                         num_played_2s += 1
                         is_turn_done = False
+                        play_card_and_publish_events(event_bus, player_to_play.name, possible_plays[index_of_play_with_max_score], all_pawns)
                         if pawn_targets:
-                            play_card(card_to_play, pawn_targets, all_pawns, is_card_a_ten_as_backward_one)
                             for pawn in all_pawns:  # need to update the players' copies of the pawns with any adjustments
                                 for player in players:
                                     if player.name[0] == pawn[0]:
@@ -1100,16 +1940,19 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                         player_to_play.cards_in_hand.remove(card_to_play)
                         discard_pile.append(card_to_play)
                         if is_immediate_draw_after_playing_a_2:  # if best play requires waiting to see the next drawn card
-                            drawn_card, num_times_to_show_last_discard_pile = draw_card(draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
-                            player_to_play.cards_in_hand.append(drawn_card)
+                            drawn_card, num_times_to_show_last_discard_pile = draw_card_into_hand(event_bus, player_to_play, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
+                            console_event_renderer.render_events()
                             if is_card_after_playing_a_2_force_played:  # otherwise card_to_play will be reset at the beginning of the next loop iteration
                                 card_to_play = drawn_card
                                 forced_card = [card_to_play]
                     else:  # the last card to play gets handled by the logic following the loop
                         is_card_a_ten_as_backward_one = possible_plays[index_of_play_with_max_score]['is_card_a_ten_as_backward_one'] if 'is_card_a_ten_as_backward_one' in possible_plays[index_of_play_with_max_score] else False
+                speculative_analysis = None  # only the turn right after a human-controlled player's could have been analyzed
+        if player_to_play.player_type == PlayerType.HUMAN and speculative_analysis is not None:
+            speculative_analysis.cancel()  # the human's play is in, so stop analyzing replies to plays they didn't make
 
+        play_card_and_publish_events(event_bus, player_to_play.name, {'card_to_play': card_to_play, 'pawn_targets': pawn_targets, 'is_card_a_ten_as_backward_one': is_card_a_ten_as_backward_one}, all_pawns)
         if 'd' not in pawn_targets:
-            play_card(card_to_play, pawn_targets, all_pawns, is_card_a_ten_as_backward_one)
             for pawn in all_pawns:  # need to update the players' copies of the pawns with any adjustments
                 for player in players:
                     if player.name[0] == pawn[0]:
@@ -1118,12 +1961,12 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
         player_to_play.cards_in_hand.remove(card_to_play)
         discard_pile.append(card_to_play)
         if hand_size != 0:
-            drawn_card, num_times_to_show_last_discard_pile = draw_card(draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
-            player_to_play.cards_in_hand.append(drawn_card)
+            drawn_card, num_times_to_show_last_discard_pile = draw_card_into_hand(event_bus, player_to_play, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
+            console_event_renderer.render_events()
             if num_played_2s != 0 and not is_immediate_draw_after_playing_a_2:  # if it's time to draw the extra card(s) for having played some number of '2's
                 for i in range(num_played_2s):
-                    drawn_card, num_times_to_show_last_discard_pile = draw_card(draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
-                    player_to_play.cards_in_hand.append(drawn_card)
+                    drawn_card, num_times_to_show_last_discard_pile = draw_card_into_hand(event_bus, player_to_play, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, num_players)
+                    console_event_renderer.render_events()
             if player_to_play.player_type == PlayerType.HUMAN:
                 print_hand_of_cards(player_to_play)  # allow the user to see their draw before yielding their turn to the next player
                 input("Press enter to complete your turn.")
@@ -1142,23 +1985,1900 @@ def sorry_boardgame():  # returns zero on success and nonzero (some other intege
                     break
         players_turn += 1
         players_turn %= num_players
+        if checkpoint_path is not None and not is_game_won:
+            save_checkpoint(checkpoint_path, restore_game_state(players, hand_size, are_teams, can_sevens_be_split_across_more_than_two_pawns, is_immediate_draw_after_playing_a_2, is_card_after_playing_a_2_force_played, draw_pile, discard_pile, last_discard_pile, num_times_to_show_last_discard_pile, players_turn), do_show_card_descriptions)
 
+    if checkpoint_path is not None and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)  # the game is over
     print("State of the game board:")
     all_pawns = {}
     for player in players:
         all_pawns.update(player.pawns)
     print_board(all_pawns)
-    victors = []
-    for player in players:
-        is_player_victor = True  # to be corrected as necessary
-        for pawn in player.pawns:
-            if player.pawns[pawn] != SpecialLocation.HOME.value:
-                is_player_victor = False
+    for victor in get_victors(players):
+        publish_game_event(event_bus, GameEventType.GAME_WON, victor)
+    console_event_renderer.render_events()
+    return 0
+
+
+def get_play_for_client(play):  # returns a copy of a possible play without any computer-only scoring, ready to be sent to a client
+    return {key: value for key, value in play.items() if key != 'play_score'}
+
+
+def get_game_state_message(game_state, seat_letter=None):  # returns a JSON-compatible description of the game state as visible from the given seat (None for a spectator, who sees no hand)
+    message = {'type': 'state', 'pawns': serialize_pawn_locations(get_all_pawns(game_state.players)), 'players': [player.name for player in game_state.players], 'players_turn': game_state.players[game_state.players_turn].name, 'discard_pile': list(game_state.discard_pile), 'draw_pile_size': len(game_state.draw_pile), 'hand_sizes': {player.name: len(player.cards_in_hand) for player in game_state.players}, 'is_game_won': game_state.is_game_won}
+    for player in game_state.players:
+        if player.name[0] == seat_letter:
+            message['hand'] = list(player.cards_in_hand)
+    return message
+
+
+def get_game_state_delta_message(previous_message, message):  # returns a JSON-compatible description of what changed between two game state messages (see get_game_state_message()) as visible from one seat: the pawns that moved (including any bumped or swapped), the cards added to the discard pile (or the whole pile, if it was shuffled back into the draw pile), the hand sizes that changed, and any other field that changed
+    delta_message = {'type': 'state_delta'}
+    moved_pawns = {pawn_label: location for pawn_label, location in message['pawns'].items() if previous_message['pawns'].get(pawn_label) != location}
+    if moved_pawns:
+        delta_message['pawns'] = moved_pawns
+    previous_discard_pile = previous_message['discard_pile']
+    if message['discard_pile'][:len(previous_discard_pile)] != previous_discard_pile:
+        delta_message['discard_pile'] = message['discard_pile']
+    elif len(message['discard_pile']) > len(previous_discard_pile):
+        delta_message['discarded'] = message['discard_pile'][len(previous_discard_pile):]
+    changed_hand_sizes = {player_name: hand_size for player_name, hand_size in message['hand_sizes'].items() if previous_message['hand_sizes'].get(player_name) != hand_size}
+    if changed_hand_sizes:
+        delta_message['hand_sizes'] = changed_hand_sizes
+    for field_name in ['players_turn', 'draw_pile_size', 'is_game_won', 'hand']:
+        if field_name in message and message[field_name] != previous_message.get(field_name):
+            delta_message[field_name] = message[field_name]
+    return delta_message
+
+
+def get_game_event_message(event, is_for_spectator=False):  # returns a JSON-compatible description of a GameEvent; spectators are not shown which cards are drawn (as those go into a player's hand)
+    message = {'type': 'event', 'event': event.event_type.value}
+    for field_name in GameEvent._fields[1:]:
+        if getattr(event, field_name) is not None and (field_name != 'card' or event.event_type != GameEventType.CARD_DRAWN or not is_for_spectator):
+            message[field_name] = getattr(event, field_name)
+    return message
+
+
+def get_percentile(samples, percentile):  # returns the nearest-rank percentile (0-100) of the samples, or None if there are none
+    if not samples:
+        return None
+    sorted_samples = sorted(samples)
+    return sorted_samples[max(0, math.ceil(percentile / 100 * len(sorted_samples)) - 1)]
+
+
+class BotEffort(Enum):  # how hard a computer-controlled player thinks about a turn, stepped down as the host comes under load (see BotTurnScheduler)
+    FULL = 'full'  # played out as many times (and for as long) as the RolloutEvaluator in use is set to
+    REDUCED = 'reduced'  # played out fewer times, and for less time, the more loaded the host
+    BUILTIN = 'builtin'  # only scored by the one pass of add_play_score_attribute() (or the loaded play scoring model)
+
+
+class BotTurnScheduler:  # resolves the computer-controlled turns of every table of a SorryServer in its executor, at most max_concurrent_turns at once (first come, first served), giving each turn a BotEffort by how loaded the host is when the turn starts, and keeps the recent queue waits and decision times of the turns
+    def __init__(self, executor, max_concurrent_turns=None, reduced_effort_pressure=1.0, builtin_effort_pressure=2.0, turn_latency_target=None, num_latency_samples=10000):  # a turn is given reduced effort once the pressure (see get_pressure()) reaches reduced_effort_pressure and built-in effort once it reaches builtin_effort_pressure; turn_latency_target (if provided) is the number of seconds the 99th percentile of recent turns (from being queued to being decided) should stay under
+        self.executor = executor
+        self.max_concurrent_turns = max_concurrent_turns if max_concurrent_turns is not None else os.cpu_count() or 1
+        self.reduced_effort_pressure = reduced_effort_pressure
+        self.builtin_effort_pressure = builtin_effort_pressure
+        self.turn_latency_target = turn_latency_target
+        self.turn_slots = asyncio.Semaphore(self.max_concurrent_turns)
+        self.num_waiting_turns = 0
+        self.queue_waits = collections.deque(maxlen=num_latency_samples)  # seconds each recent turn waited for a turn slot
+        self.decision_times = collections.deque(maxlen=num_latency_samples)  # seconds each recent turn took to decide once started
+        self.recent_turn_latencies = collections.deque(maxlen=100)  # seconds each of the last 100 turns took from being queued to being decided, held to turn_latency_target
+        self.num_turns_by_effort = {effort: 0 for effort in BotEffort}
+        self.turn_futures = set()  # the concurrent.futures.Future of each turn submitted to the executor and not yet decided
+
+    def get_pressure(self):  # returns how loaded the host is: the largest of the number of turns waiting per turn slot, the runnable processes beyond one per CPU (per CPU, over the last minute, where the platform reports it), and (if there is a turn latency target) the recent 99th percentile turn latency as a multiple of the target
+        pressure = self.num_waiting_turns / self.max_concurrent_turns
+        if hasattr(os, 'getloadavg'):
+            num_cpus = os.cpu_count() or 1
+            pressure = max(pressure, (os.getloadavg()[0] - num_cpus) / num_cpus)
+        if self.turn_latency_target is not None and self.recent_turn_latencies:
+            pressure = max(pressure, get_percentile(self.recent_turn_latencies, 99) / self.turn_latency_target)
+        return pressure
+
+    def get_effort(self, pressure):  # returns the BotEffort for a turn started under the given pressure and, for reduced effort, the number of games to play out and the time limit (both None to keep the RolloutEvaluator's)
+        if rollout_evaluator is None or pressure >= self.builtin_effort_pressure:
+            return BotEffort.BUILTIN if rollout_evaluator is not None else BotEffort.FULL, None, None  # without a RolloutEvaluator, every turn only takes one pass anyway
+        if pressure < self.reduced_effort_pressure:
+            return BotEffort.FULL, None, None
+        effort_fraction = 1 / (1 + pressure)
+        return BotEffort.REDUCED, max(1, int(rollout_evaluator.num_rollouts * effort_fraction)), rollout_evaluator.time_limit * effort_fraction if rollout_evaluator.time_limit is not None else None
+
+    async def choose_play(self, game_state):  # returns the possible play the computer-controlled player whose turn it is makes (see choose_computer_play()), once a turn slot is free
+        queued_time = time.monotonic()
+        self.num_waiting_turns += 1
+        try:
+            await self.turn_slots.acquire()
+        finally:
+            self.num_waiting_turns -= 1
+        try:
+            started_time = time.monotonic()
+            effort, num_rollouts, time_limit = self.get_effort(self.get_pressure())
+            turn_future = self.executor.submit(choose_computer_play, game_state, effort != BotEffort.BUILTIN, num_rollouts, time_limit)
+            self.turn_futures.add(turn_future)
+            try:
+                play = await asyncio.wrap_future(turn_future)
+            finally:
+                self.turn_futures.discard(turn_future)
+        finally:
+            self.turn_slots.release()
+        decided_time = time.monotonic()
+        self.queue_waits.append(started_time - queued_time)
+        self.decision_times.append(decided_time - started_time)
+        self.recent_turn_latencies.append(decided_time - queued_time)
+        self.num_turns_by_effort[effort] += 1
+        return play
+
+    def cancel_turns(self):  # cancels every submitted turn the executor has not started, so shutting the executor down waits only on the turns being decided
+        for turn_future in list(self.turn_futures):
+            turn_future.cancel()
+
+    def get_statistics(self):  # returns a JSON-compatible description of the turns waiting and the percentiles (in seconds) of the recent queue waits and decision times
+        return {'waiting_turns': self.num_waiting_turns, 'max_concurrent_turns': self.max_concurrent_turns, 'pressure': self.get_pressure(), 'turns_by_effort': {effort.value: num_turns for effort, num_turns in self.num_turns_by_effort.items()}, 'queue_wait_percentiles': {f"p{percentile}": get_percentile(self.queue_waits, percentile) for percentile in [50, 90, 99]}, 'decision_time_percentiles': {f"p{percentile}": get_percentile(self.decision_times, percentile) for percentile in [50, 90, 99]}}
+
+
+class RemoteTable:  # a game hosted by a SorryServer along with the clients seated at it
+    def __init__(self, table_id, game_state):
+        self.table_id = table_id
+        self.game_state = game_state
+        self.seat_writers = {}  # maps the first letter of a human-controlled player's name to the stream writer of the client seated as them
+        self.pending_plays = asyncio.Queue()  # (seat letter, requested play) pairs received from seated clients
+        self.are_all_seats_filled = asyncio.Event()
+        self.task = None
+        self.record_path = None  # where the game's plays are recorded (see SorryServer.record_play()), once the first is made
+        self.possible_play_trie = None  # the PossiblePlayTrie of the human-controlled player to play, while the table waits on them
+        self.event_bus = game_state.event_bus  # kept while the table is dormant (see SorryServer.make_table_dormant()), so its subscribers stay subscribed
+        self.sequence_number = 0  # the number of plays made at the table, which numbers the state messages sent to its clients (see SorryServer.send_state_deltas())
+        self.last_state_messages = {}  # maps a seat letter (None for spectators) to the game state message of the current sequence number as visible from there, which the next state delta is computed against
+        self.encoded_spectator_delta = None  # the state delta message leading spectators to the current sequence number, encoded (as a line) once for all of them
+        self.spectator_wakeups = set()  # an asyncio.Event for each spectator streamed state deltas, set after each play
+        self.dormant_game_state = None  # the compressed encoded game state (see encode_game_state()) of a dormant table whose game is not checkpointed
+        self.were_all_seats_filled = False  # whether every human-controlled seat was filled when the table was made dormant (which, like its game, drops its queue, event, and task)
+        self.checkpoint_loading = None  # the future of a dormant table's checkpoint being read (see SorryServer.wake_table()), which every client waking the table meanwhile awaits
+
+    def get_human_seat_letters(self):
+        return [player.name[0] for player in self.game_state.players if player.player_type == PlayerType.HUMAN]
+
+
+class SorryServer:  # hosts many concurrent tables in one process, exchanging newline-delimited JSON messages with clients over TCP
+    def __init__(self, executor=None, spectator_queue_size=256, checkpoint_directory=None, record_directory=None, idle_table_timeout=None, bot_turn_scheduler=None):  # bot_turn_scheduler (if provided) is the BotTurnScheduler computer-controlled turns are queued with, otherwise one using the executor with default settings is; idle_table_timeout (if provided) is how many seconds a table may wait on its human-controlled players before it is made dormant (see make_table_dormant()); record_directory (if provided) is where every game's plays are recorded for later analysis (see analyze_game_records()); executor (if provided) resolves computer-controlled turns, otherwise a thread pool does; spectator_queue_size bounds how many events a slow spectator streamed events (rather than state deltas) may fall behind by before their oldest events are dropped; checkpoint_directory (if provided) is where every table's game is saved after each play so it survives a restart (see resume_checkpointed_tables())
+        self.spectator_queue_size = spectator_queue_size
+        self.checkpoint_directory = checkpoint_directory
+        self.record_directory = record_directory
+        self.idle_table_timeout = idle_table_timeout
+        self.tables = {}  # maps table IDs to RemoteTable objects
+        self.executor = executor if executor is not None else concurrent.futures.ThreadPoolExecutor()
+        self.bot_turn_scheduler = bot_turn_scheduler if bot_turn_scheduler is not None else BotTurnScheduler(self.executor)
+        self.io_executor = concurrent.futures.ThreadPoolExecutor()  # writes the tables' files, so a slow disk holds up only the tables waiting on it rather than the event loop
+        self.next_table_id = 1
+        self.server = None
+        self.client_writers = set()  # stream writers of every connected client
+
+    async def start(self, host='127.0.0.1', port=0):  # returns the port being listened on (useful when port is 0 for an arbitrary free port)
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        for table in list(self.tables.values()):
+            if table.task is not None:  # (not for a dormant table)
+                table.task.cancel()
+        for writer in list(self.client_writers):
+            writer.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.io_executor.shutdown(wait=False)  # (any files being written are still finished)
+
+    def create_table(self, player_types, **rules):  # takes a dictionary mapping Color members to PlayerType members and any keyword arguments of new_game_state(); returns the new RemoteTable, whose game begins once every human-controlled seat is filled
+        return self.add_table(self.next_table_id, new_game_state(player_types, event_bus=GameEventBus(), **rules))
+
+    def add_table(self, table_id, game_state):  # hosts the given game; returns its RemoteTable
+        table = RemoteTable(table_id, game_state)
+        self.next_table_id = max(self.next_table_id, table_id + 1)
+        self.tables[table.table_id] = table
+        if not table.get_human_seat_letters():
+            table.are_all_seats_filled.set()
+        table.task = asyncio.ensure_future(self.run_table(table))
+        return table
+
+    def get_table_checkpoint_path(self, table_id):
+        return os.path.join(self.checkpoint_directory, f"table-{table_id}.sorry")
+
+    async def save_table_checkpoint(self, table):  # encodes the table's game on the event loop, then writes (and flushes) its checkpoint in the I/O executor
+        if self.checkpoint_directory is not None:
+            await asyncio.get_running_loop().run_in_executor(self.io_executor, write_checkpoint, self.get_table_checkpoint_path(table.table_id), encode_game_state(table.game_state))
+
+    async def record_play(self, table, play):  # appends the play about to be made at the table (and the game state it is made from, encoded on the event loop) to the table's game record in the I/O executor, if games are recorded
+        if self.record_directory is not None:
+            if table.record_path is None:
+                table.record_path = os.path.join(self.record_directory, f"{time.strftime('%Y%m%d-%H%M%S')}-table-{table.table_id}.jsonl")
+            await asyncio.get_running_loop().run_in_executor(self.io_executor, append_game_record_line, table.record_path, get_game_record_line(table.game_state, play))
+
+    def make_table_dormant(self, table):  # drops the game of a table that has waited too long on its human-controlled players, keeping only its compact encoded form (its checkpoint, if games are checkpointed, otherwise a compressed copy in memory) until wake_table() restores it
+        if self.checkpoint_directory is None:
+            table.dormant_game_state = zlib.compress(encode_game_state(table.game_state))
+        table.were_all_seats_filled = table.are_all_seats_filled.is_set()
+        table.last_state_messages = {}
+        table.encoded_spectator_delta = None
+        table.game_state = table.possible_play_trie = table.pending_plays = table.are_all_seats_filled = table.task = None  # the task is finishing (see run_table())
+
+    async def wake_table(self, table):  # restores the game of a dormant table (doing nothing for a table that is not dormant), reading and decoding its checkpoint in the I/O executor, and resumes playing it, without telling a player whose turn it was again
+        if table.game_state is not None:
+            return
+        if table.dormant_game_state is not None:
+            game_state = decode_game_state(zlib.decompress(table.dormant_game_state))[0]
+        else:
+            if table.checkpoint_loading is None:  # (otherwise another client is already waking the table)
+                table.checkpoint_loading = asyncio.get_running_loop().run_in_executor(self.io_executor, load_checkpoint, self.get_table_checkpoint_path(table.table_id))
+            game_state = (await asyncio.shield(table.checkpoint_loading))[0]
+            if table.game_state is not None:  # another client woke the table first
+                return
+            table.checkpoint_loading = None
+        table.game_state = game_state
+        table.dormant_game_state = None
+        table.game_state.event_bus = table.event_bus
+        table.pending_plays = asyncio.Queue()
+        table.are_all_seats_filled = asyncio.Event()
+        if table.were_all_seats_filled:
+            table.are_all_seats_filled.set()
+        if table.were_all_seats_filled and table.game_state.players[table.game_state.players_turn].player_type == PlayerType.HUMAN:
+            table.possible_play_trie = PossiblePlayTrie(get_possible_plays_for_game_state(table.game_state))
+        table.task = asyncio.ensure_future(self.run_table(table))
+
+    def get_num_dormant_tables(self):
+        return sum(table.game_state is None for table in self.tables.values())
+
+    async def resume_checkpointed_tables(self):  # hosts every game saved in the checkpoint directory (with their human-controlled seats open to be rejoined), reading and decoding the checkpoints in the I/O executor; returns the number of tables resumed
+        num_resumed_tables = 0
+        for file_name in sorted(os.listdir(self.checkpoint_directory)):
+            if file_name.startswith('table-') and file_name.endswith('.sorry'):
+                try:
+                    game_state = (await asyncio.get_running_loop().run_in_executor(self.io_executor, load_checkpoint, os.path.join(self.checkpoint_directory, file_name)))[0]
+                    table_id = int(file_name[len('table-'):-len('.sorry')])
+                except ValueError:
+                    continue  # not a checkpoint of this server
+                game_state.event_bus = GameEventBus()
+                self.add_table(table_id, game_state)
+                num_resumed_tables += 1
+        return num_resumed_tables
+
+    async def send(self, writer, message):
+        if writer is None or writer.is_closing():
+            return
+        writer.write(json.dumps(message).encode() + b'\n')
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    def get_state_snapshot_message(self, table, seat_letter=None):  # returns the game state message of the table's current sequence number as visible from the given seat (None for a spectator); the table must not be dormant (see wake_table())
+        message = get_game_state_message(table.game_state, seat_letter)
+        message['sequence_number'] = table.sequence_number
+        table.last_state_messages[seat_letter] = message
+        return message
+
+    async def broadcast_state(self, table, extra_message=None):  # sends every seated client a snapshot of the game state (as they may see it), merged with any extra message
+        for seat_letter, writer in list(table.seat_writers.items()):
+            message = dict(self.get_state_snapshot_message(table, seat_letter))
+            if extra_message is not None:
+                message.update(extra_message)
+            await self.send(writer, message)
+
+    async def send_missing_snapshots(self, table):  # sends a snapshot of the game state to every seated client not yet sent one of the table's current sequence number (a client that joined was sent one then), so each client is sent one snapshot that the state deltas follow on from
+        for seat_letter, writer in list(table.seat_writers.items()):
+            last_state_message = table.last_state_messages.get(seat_letter)
+            if last_state_message is None or last_state_message['sequence_number'] != table.sequence_number:
+                await self.send(writer, self.get_state_snapshot_message(table, seat_letter))
+
+    def get_next_state_message(self, table, seat_letter=None):  # returns the state delta (see get_game_state_delta_message()) leading from the table's last state message as visible from the given seat (None for a spectator) to its current sequence number, or a snapshot if there is no last state message to compute a delta against
+        previous_message = table.last_state_messages.get(seat_letter)
+        message = self.get_state_snapshot_message(table, seat_letter)
+        if previous_message is None:
+            return dict(message)
+        delta_message = get_game_state_delta_message(previous_message, message)
+        delta_message['sequence_number'] = table.sequence_number
+        return delta_message
+
+    async def send_state_deltas(self, table, extra_message):  # numbers the game state after a play and sends each seated client what changed since the last (merged with the extra message), then wakes each spectator to be sent the one delta encoded for all of them (see stream_state_to_spectator())
+        table.sequence_number += 1
+        for seat_letter in list(table.last_state_messages):
+            if seat_letter is not None and seat_letter not in table.seat_writers:
+                table.last_state_messages.pop(seat_letter)  # a client rejoining the seat is sent a snapshot
+        for seat_letter, writer in list(table.seat_writers.items()):
+            message = self.get_next_state_message(table, seat_letter)
+            message.update(extra_message)
+            await self.send(writer, message)
+        if table.spectator_wakeups:
+            message = self.get_next_state_message(table)
+            message.update(extra_message)
+            table.encoded_spectator_delta = json.dumps(message).encode() + b'\n'
+            for is_state_changed in table.spectator_wakeups:
+                is_state_changed.set()
+        else:
+            table.last_state_messages.pop(None, None)
+            table.encoded_spectator_delta = None
+
+    async def stream_events_to_spectator(self, table, writer):  # sends a spectator the events of a table's game as they happen, skipping events the spectator fell too far behind on rather than holding up the game
+        loop = asyncio.get_running_loop()
+        is_event_available = asyncio.Event()
+        event_bus = table.event_bus
+        subscription = event_bus.subscribe(self.spectator_queue_size, OverflowPolicy.DROP_OLDEST, None, lambda: loop.call_soon_threadsafe(is_event_available.set))
+        try:
+            is_game_over = table.game_state.is_game_won
+            while not is_game_over and not writer.is_closing():
+                await is_event_available.wait()
+                is_event_available.clear()
+                for event in subscription.get_all_nowait():
+                    writer.write(json.dumps(get_game_event_message(event, True)).encode() + b'\n')
+                    is_game_over = is_game_over or event.event_type == GameEventType.GAME_WON
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    async def stream_state_to_spectator(self, table, writer):  # sends a spectator the state delta of each play at a table as it is made, or a fresh snapshot in place of any deltas they fell behind on while their connection drained, so a slow spectator neither holds up the game nor has messages queued for them
+        is_state_changed = asyncio.Event()
+        table.spectator_wakeups.add(is_state_changed)
+        try:
+            sequence_number = table.sequence_number
+            is_game_over = table.game_state.is_game_won
+            while not is_game_over and not writer.is_closing():
+                await is_state_changed.wait()
+                is_state_changed.clear()
+                if table.sequence_number == sequence_number + 1 and table.encoded_spectator_delta is not None:
+                    writer.write(table.encoded_spectator_delta)
+                else:
+                    await self.wake_table(table)
+                    writer.write(json.dumps(self.get_state_snapshot_message(table)).encode() + b'\n')
+                sequence_number = table.sequence_number
+                is_game_over = table.game_state is not None and table.game_state.is_game_won
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            table.spectator_wakeups.discard(is_state_changed)
+
+    async def run_table(self, table):  # plays out the game of the given table, waiting on human-controlled seats and resolving computer-controlled seats in the executor so other tables are never blocked; returns early (keeping the table) if the table is made dormant
+        is_dormant = False
+        try:
+            await self.save_table_checkpoint(table)  # (before the table can be made dormant, which may leave the checkpoint as the only copy of its game)
+            try:
+                await asyncio.wait_for(table.are_all_seats_filled.wait(), self.idle_table_timeout)
+            except asyncio.TimeoutError:
+                self.make_table_dormant(table)
+                is_dormant = True
+                return
+            game_state = table.game_state
+            if table.possible_play_trie is None:  # otherwise the table was woken during a human-controlled player's turn, after everyone was sent the game state and that player was told of their turn
+                await self.send_missing_snapshots(table)
+            while not game_state.is_game_won:
+                player_to_play = game_state.players[game_state.players_turn]
+                if player_to_play.player_type == PlayerType.COMPUTER:
+                    play = await self.bot_turn_scheduler.choose_play(game_state)
+                else:
+                    if table.possible_play_trie is None:
+                        possible_plays = get_possible_plays_for_game_state(game_state)
+                        table.possible_play_trie = PossiblePlayTrie(possible_plays)
+                        await self.send(table.seat_writers.get(player_to_play.name[0]), {'type': 'your_turn', 'hand': player_to_play.cards_in_hand, 'forced_card': game_state.forced_card, 'possible_plays': [get_play_for_client(possible_play) for possible_play in possible_plays]})
+                    play = None
+                    while play is None:
+                        try:
+                            seat_letter, requested_play = await asyncio.wait_for(table.pending_plays.get(), self.idle_table_timeout)
+                        except asyncio.TimeoutError:
+                            self.make_table_dormant(table)
+                            is_dormant = True
+                            return
+                        play = table.possible_play_trie.find_possible_play(requested_play) if seat_letter == player_to_play.name[0] else None
+                        if play is None:
+                            await self.send(table.seat_writers.get(seat_letter), {'type': 'error', 'message': "invalid play"})
+                    table.possible_play_trie = None
+                await self.record_play(table, play)
+                apply_play_to_game_state(game_state, play)
+                await self.save_table_checkpoint(table)
+                await self.send_state_deltas(table, {'last_play': get_play_for_client(play), 'last_player': player_to_play.name})
+            await self.broadcast_state(table, {'type': 'game_over', 'victors': get_victors(game_state.players)})
+            if self.checkpoint_directory is not None:
+                await asyncio.get_running_loop().run_in_executor(self.io_executor, os.remove, self.get_table_checkpoint_path(table.table_id))
+        finally:
+            if not is_dormant:
+                self.tables.pop(table.table_id, None)
+
+    async def handle_client(self, reader, writer):  # serves one client connection until it disconnects
+        table = None
+        seat_letter = None
+        spectated_table = None
+        spectator_task = None
+        self.client_writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    message_type = message['type']
+                except (ValueError, KeyError, TypeError):
+                    await self.send(writer, {'type': 'error', 'message': "malformed message"})
+                    continue
+                if table is not None:
+                    await self.wake_table(table)
+                if message_type == 'create_table':
+                    try:
+                        player_types = {Color[color_name.upper()]: PlayerType(player_type) for color_name, player_type in message['seats'].items() if color_name.upper() != Color.RESET.name}
+                        rules = {rule: message[rule] for rule in ['hand_size', 'are_teams', 'can_sevens_be_split_across_more_than_two_pawns', 'is_immediate_draw_after_playing_a_2', 'is_card_after_playing_a_2_force_played', 'is_faster_play'] if rule in message}
+                        num_players = sum(player_type != PlayerType.NONEXISTENT for player_type in player_types.values())
+                        hand_size = rules.get('hand_size', 5)
+                        if any(player_color not in STANDARD_BOARD.geometry.side_colors for player_color in player_types) or num_players == 0:  # hosted games are played on the standard board
+                            raise ValueError
+                        if not isinstance(hand_size, int) or isinstance(hand_size, bool) or not 0 <= hand_size <= len(create_draw_pile()) / num_players:  # must have enough cards in the deck to deal
+                            raise ValueError
+                        if any(not isinstance(value, bool) for rule, value in rules.items() if rule != 'hand_size'):
+                            raise ValueError
+                        new_table = self.create_table(player_types, **rules)
+                    except (KeyError, ValueError, TypeError, AttributeError):
+                        await self.send(writer, {'type': 'error', 'message': "invalid table settings"})
+                        continue
+                    await self.send(writer, {'type': 'table_created', 'table_id': new_table.table_id})
+                elif message_type == 'join':
+                    requested_table = self.tables.get(message.get('table_id'))
+                    if requested_table is not None:
+                        await self.wake_table(requested_table)
+                    requested_seat_letter = str(message.get('color', '')).upper()[:1]
+                    if table is not None or requested_table is None or requested_seat_letter not in requested_table.get_human_seat_letters() or requested_seat_letter in requested_table.seat_writers:
+                        await self.send(writer, {'type': 'error', 'message': "cannot join that seat"})
+                        continue
+                    table = requested_table
+                    seat_letter = requested_seat_letter
+                    table.seat_writers[seat_letter] = writer
+                    await self.send(writer, {'type': 'joined', 'table_id': table.table_id, 'color': seat_letter})
+                    await self.send(writer, self.get_state_snapshot_message(table, seat_letter))
+                    if len(table.seat_writers) == len(table.get_human_seat_letters()):
+                        table.are_all_seats_filled.set()
+                elif message_type == 'spectate':
+                    requested_table = self.tables.get(message.get('table_id'))
+                    if requested_table is not None:
+                        await self.wake_table(requested_table)
+                    if spectator_task is not None or requested_table is None:
+                        await self.send(writer, {'type': 'error', 'message': "cannot spectate that table"})
+                        continue
+                    spectated_table = requested_table
+                    await self.send(writer, self.get_state_snapshot_message(spectated_table))
+                    spectator_task = asyncio.ensure_future(self.stream_events_to_spectator(spectated_table, writer) if message.get('events') else self.stream_state_to_spectator(spectated_table, writer))
+                elif message_type == 'resync':  # a client that missed a numbered state message is sent a fresh snapshot
+                    if table is None and spectated_table is None:
+                        await self.send(writer, {'type': 'error', 'message': "not seated or spectating"})
+                        continue
+                    if table is None:
+                        await self.wake_table(spectated_table)
+                    await self.send(writer, self.get_state_snapshot_message(table, seat_letter) if table is not None else self.get_state_snapshot_message(spectated_table))
+                elif message_type == 'play':
+                    if table is None or table.game_state.players[table.game_state.players_turn].name[0] != seat_letter:
+                        await self.send(writer, {'type': 'error', 'message': "not your turn"})
+                        continue
+                    table.pending_plays.put_nowait((seat_letter, message))
+                elif message_type == 'complete_play':  # what can complete a partly chosen play (a card_to_play and the pawn_targets chosen so far), so a client can offer only valid choices and a default
+                    possible_play_trie = table.possible_play_trie if table is not None and table.game_state.players[table.game_state.players_turn].name[0] == seat_letter else None
+                    if possible_play_trie is None:
+                        await self.send(writer, {'type': 'error', 'message': "not your turn"})
+                        continue
+                    card_to_play = message.get('card_to_play')
+                    pawn_targets = message.get('pawn_targets', [])
+                    only_completion = possible_play_trie.get_only_completion(card_to_play, pawn_targets)
+                    await self.send(writer, {'type': 'completions', 'card_to_play': card_to_play, 'pawn_targets': pawn_targets, 'is_valid_prefix': possible_play_trie.is_valid_prefix(card_to_play, pawn_targets), 'next_choices': possible_play_trie.get_next_choices(card_to_play, pawn_targets), 'only_completion': [get_play_for_client(possible_play) for possible_play in only_completion] if only_completion is not None else None})
+                elif message_type == 'stats':  # how many tables are hosted and how long computer-controlled turns are taking, for monitoring
+                    await self.send(writer, {'type': 'stats', 'num_tables': len(self.tables), 'num_dormant_tables': self.get_num_dormant_tables(), 'bot_turns': self.bot_turn_scheduler.get_statistics()})
+                else:
+                    await self.send(writer, {'type': 'error', 'message': f"unknown message type {message_type}"})
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if spectator_task is not None:
+                spectator_task.cancel()
+            self.client_writers.discard(writer)
+            if table is not None and table.seat_writers.get(seat_letter) is writer:
+                table.seat_writers.pop(seat_letter)  # the seat can be rejoined
+            writer.close()
+
+
+def get_card_kinds():  # returns each distinct card value in the order they first appear in the deck
+    return list(dict.fromkeys(create_draw_pile()))
+
+
+def get_pawn_slot(pawn_label):  # returns the index (0-15) of a pawn among every possible pawn (in the order of play, then by pawn number)
+    return [Color.BLUE.name[0], Color.YELLOW.name[0], Color.GREEN.name[0], Color.RED.name[0]].index(pawn_label[0]) * 4 + int(pawn_label[1:]) - 1
+
+
+def get_track_index(coordinates):  # returns the index (0-59, clockwise from the top left corner) of the square of the outer track at the given coordinates
+    if coordinates[Coordinate.Y] == Coordinate.MIN_Y.value:
+        return coordinates[Coordinate.X]
+    elif coordinates[Coordinate.X] == Coordinate.MAX_X.value:
+        return Coordinate.MAX_X.value + coordinates[Coordinate.Y]
+    elif coordinates[Coordinate.Y] == Coordinate.MAX_Y.value:
+        return 2 * Coordinate.MAX_X.value + Coordinate.MAX_X.value - coordinates[Coordinate.X]
+    return 3 * Coordinate.MAX_X.value + Coordinate.MAX_Y.value - coordinates[Coordinate.Y]  # on the left edge
+
+
+def get_safety_zone_entrance(player_letter):  # returns the coordinates of the given player's safety zone entrance, or None on error
+    if player_letter == Color.BLUE.name[0]:
+        return Location.BLUE_SAFETY_ZONE_ENTRANCE.value
+    elif player_letter == Color.GREEN.name[0]:
+        return Location.GREEN_SAFETY_ZONE_ENTRANCE.value
+    elif player_letter == Color.RED.name[0]:
+        return Location.RED_SAFETY_ZONE_ENTRANCE.value
+    elif player_letter == Color.YELLOW.name[0]:
+        return Location.YELLOW_SAFETY_ZONE_ENTRANCE.value
+    return None
+
+
+def get_pawn_progress(pawn_label, location):  # returns how far along its path home a pawn is: 0 at its start, 1 on the square just behind its start exit, 2 on its start exit and so on around the board to 60 on its safety zone entrance, 61-65 in its safety zone, and 66 at its home
+    if location == SpecialLocation.START.value:
+        return 0
+    elif location == SpecialLocation.HOME.value:
+        return 66
+    track_length = 4 * Coordinate.MAX_X.value
+    if location[Coordinate.X] not in [Coordinate.MIN_X.value, Coordinate.MAX_X.value] and location[Coordinate.Y] not in [Coordinate.MIN_Y.value, Coordinate.MAX_Y.value]:  # if in a safe zone
+        safety_zone_entrance = get_safety_zone_entrance(pawn_label[0])
+        return 60 + abs(location[Coordinate.X] - safety_zone_entrance[Coordinate.X]) + abs(location[Coordinate.Y] - safety_zone_entrance[Coordinate.Y])
+    squares_past_start_exit = (get_track_index(location) - get_track_index(get_start_exit_location(pawn_label[0]))) % track_length
+    return squares_past_start_exit + 2 if squares_past_start_exit <= track_length - 2 else 1  # the only square between a pawn's safety zone entrance and its start exit is just behind its start exit
+
+
+POSITION_FEATURE_WIDTH = 16 + 11 + 11 + 1  # pawn progresses, counts of each card kind in hand, counts of each card kind not yet seen by the player to move (neither in their hand nor in the discard pile), and the seat to move
+PLAY_FEATURE_WIDTH = 2 + 2 * 4  # card kind, flags, then up to four (pawn slot, distance) pairs
+TRAINING_ROW_WIDTH = POSITION_FEATURE_WIDTH + PLAY_FEATURE_WIDTH + 1  # followed by whether the player to move went on to win
+
+
+def write_position_features(row, hand_of_cards, name_of_player_to_play, all_pawns, discard_pile):  # fills the first POSITION_FEATURE_WIDTH elements of a NumPy row with the featurized game state (see get_pawn_progress(); nonexistent pawns have a progress of -1) as known to the player whose turn it is
+    card_kinds = get_card_kinds()
+    row[:POSITION_FEATURE_WIDTH] = 0
+    row[:16] = -1
+    for pawn_label in all_pawns:
+        row[get_pawn_slot(pawn_label)] = get_pawn_progress(pawn_label, all_pawns[pawn_label])
+    for card in create_draw_pile():
+        row[16 + 11 + card_kinds.index(card)] += 1
+    for card in hand_of_cards:
+        row[16 + card_kinds.index(card)] += 1
+        row[16 + 11 + card_kinds.index(card)] -= 1
+    for card in discard_pile:
+        row[16 + 11 + card_kinds.index(card)] -= 1
+    row[POSITION_FEATURE_WIDTH - 1] = get_pawn_slot(name_of_player_to_play[0] + '1') // 4
+
+
+def write_play_features(row, play):  # fills PLAY_FEATURE_WIDTH elements of a NumPy row with a possible play: the card kind's index (see get_card_kinds()), flags (1 for a 10 played backward, 2 for a discard), then (pawn slot, distance) pairs with -1 marking unused pairs (distances are zero other than for a 7)
+    row[:PLAY_FEATURE_WIDTH] = -1
+    row[0] = get_card_kinds().index(play['card_to_play'])
+    row[1] = (1 if play.get('is_card_a_ten_as_backward_one', False) else 0) + (2 if 'd' in play['pawn_targets'] else 0)
+    if 'd' not in play['pawn_targets']:
+        pawn_target_index = 0
+        for pawn_label in play['pawn_targets']:
+            row[2 + 2 * pawn_target_index] = get_pawn_slot(pawn_label)
+            row[3 + 2 * pawn_target_index] = play['pawn_targets'][pawn_label] if isinstance(play['pawn_targets'], dict) else 0
+            pawn_target_index += 1
+
+
+class NpyShardWriter:  # appends fixed-width rows to a series of preallocated, memory-mapped .npy shard files named <path prefix>-<shard number>.npy, truncating the last shard to the rows actually written on close()
+    def __init__(self, path_prefix, row_width, dtype, rows_per_shard=1 << 20):
+        self.path_prefix = path_prefix
+        self.row_width = row_width
+        self.dtype = numpy.dtype(dtype)
+        self.rows_per_shard = rows_per_shard
+        self.shard_paths = []
+        self.shard = None  # the memory map of the shard being filled
+        self.num_rows_in_shard = 0
+        self.num_rows = 0
+
+    def start_shard(self):
+        self.shard_paths.append(f"{self.path_prefix}-{len(self.shard_paths):05d}.npy")
+        self.shard = numpy.lib.format.open_memmap(self.shard_paths[-1], mode='w+', dtype=self.dtype, shape=(self.rows_per_shard, self.row_width))
+        self.num_rows_in_shard = 0
+
+    def append_rows(self, rows):  # copies a two-dimensional array of rows into the shard(s), starting new shards as they fill
+        num_rows_copied = 0
+        while num_rows_copied < len(rows):
+            if self.shard is None or self.num_rows_in_shard == self.rows_per_shard:
+                self.finish_shard()
+                self.start_shard()
+            num_rows_to_copy = min(len(rows) - num_rows_copied, self.rows_per_shard - self.num_rows_in_shard)
+            self.shard[self.num_rows_in_shard:self.num_rows_in_shard + num_rows_to_copy] = rows[num_rows_copied:num_rows_copied + num_rows_to_copy]
+            self.num_rows_in_shard += num_rows_to_copy
+            num_rows_copied += num_rows_to_copy
+        self.num_rows += num_rows_copied
+
+    def finish_shard(self):  # flushes the shard being filled and shrinks its file (rewriting the .npy header in place) if it wasn't filled
+        if self.shard is None:
+            return
+        self.shard.flush()
+        self.shard = None  # releases the memory map
+        if self.num_rows_in_shard != self.rows_per_shard:
+            with open(self.shard_paths[-1], 'r+b') as shard_file:
+                version = numpy.lib.format.read_magic(shard_file)
+                if version == (1, 0):
+                    numpy.lib.format.read_array_header_1_0(shard_file)
+                else:
+                    numpy.lib.format.read_array_header_2_0(shard_file)
+                header_length = shard_file.tell()
+                shard_file.seek(0)
+                header = {'descr': numpy.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False, 'shape': (self.num_rows_in_shard, self.row_width)}
+                if version == (1, 0):
+                    numpy.lib.format.write_array_header_1_0(shard_file, header)
+                else:
+                    numpy.lib.format.write_array_header_2_0(shard_file, header)
+                if shard_file.tell() != header_length:  # .npy headers are padded so the length of the first axis can change in place, so this shouldn't happen
+                    raise ValueError(f"could not shrink {self.shard_paths[-1]} in place")
+                shard_file.truncate(header_length + self.num_rows_in_shard * self.row_width * self.dtype.itemsize)
+
+    def close(self):
+        self.finish_shard()
+
+
+def generate_self_play_data(path_prefix, num_games, player_types=None, rows_per_shard=1 << 20, **rules):  # plays num_games all-computer games (with the seats of player_types, by default four computer-controlled players, and any keyword arguments of new_game_state()), streaming a TRAINING_ROW_WIDTH int8 row per play into .npy shards (see NpyShardWriter); returns the number of rows written
+    if numpy is None:
+        raise RuntimeError("generating self-play data requires NumPy")
+    if player_types is None:
+        player_types = {player_color: PlayerType.COMPUTER for player_color in [Color.BLUE, Color.YELLOW, Color.GREEN, Color.RED]}
+    shard_writer = NpyShardWriter(path_prefix, TRAINING_ROW_WIDTH, numpy.int8, rows_per_shard)
+    game_rows = numpy.empty((1024, TRAINING_ROW_WIDTH), numpy.int8)  # the rows of the game being played, held back until its outcome is known (and grown as needed)
+    try:
+        for game_number in range(num_games):
+            game_state = new_game_state(player_types, **rules)
+            num_game_rows = 0
+            while not game_state.is_game_won:
+                possible_plays = get_possible_plays_for_game_state(game_state, True, play_scoring_model)
+                play = possible_plays[select_play_with_max_score(possible_plays)]
+                if num_game_rows == len(game_rows):
+                    game_rows = numpy.concatenate([game_rows, numpy.empty_like(game_rows)])
+                write_position_features(game_rows[num_game_rows], game_state.forced_card if game_state.forced_card else game_state.players[game_state.players_turn].cards_in_hand, game_state.players[game_state.players_turn].name, get_all_pawns(game_state.players), game_state.discard_pile)
+                write_play_features(game_rows[num_game_rows, POSITION_FEATURE_WIDTH:], play)
+                num_game_rows += 1
+                apply_play_to_game_state(game_state, play)
+            winning_seats = [get_pawn_slot(victor[0] + '1') // 4 for victor in get_victors(game_state.players)]
+            game_rows[:num_game_rows, TRAINING_ROW_WIDTH - 1] = numpy.isin(game_rows[:num_game_rows, POSITION_FEATURE_WIDTH - 1], winning_seats)
+            shard_writer.append_rows(game_rows[:num_game_rows])
+    finally:
+        shard_writer.close()
+    return shard_writer.num_rows
+
+
+def cross_check_turn(game_state):  # compares, for the player whose turn it is in a game on STANDARD_BOARD, the possible plays enumerate_possible_plays_on_board() lists with those the reference engine's enumerate_possible_plays() lists, and the pawns play_card_on_board() leaves after each play with those play_card() leaves; returns a description of each divergence (none if the engines agree); does not adjust game_state or the random module's state
+    player_to_play = game_state.players[game_state.players_turn]
+    cards_to_play_from = game_state.forced_card if game_state.forced_card else player_to_play.cards_in_hand
+    board_pawns = get_all_pawns(game_state.players)
+    divergences = []
+    try:
+        reference_plays = enumerate_possible_plays(cards_to_play_from, player_to_play.name, get_coordinate_pawns(board_pawns), game_state.are_teams, False, game_state.can_sevens_be_split_across_more_than_two_pawns, game_state.is_immediate_draw_after_playing_a_2, game_state.is_card_after_playing_a_2_force_played, None, random.Random(0))  # the reference engine scores plays as it lists them, which would otherwise change the game's random numbers
+    except Exception as error:  # a reference engine failure is itself a divergence worth reproducing
+        return [f"the reference engine raised {error!r} enumerating the plays of {cards_to_play_from} for {player_to_play.name} with pawns {board_pawns}"]
+    board_plays = enumerate_possible_plays_on_board(STANDARD_BOARD, cards_to_play_from, player_to_play.name, board_pawns, game_state.are_teams, game_state.can_sevens_be_split_across_more_than_two_pawns, game_state.is_immediate_draw_after_playing_a_2)
+    reference_plays_by_key = {get_play_key(possible_play): possible_play for possible_play in reference_plays}
+    board_plays_by_key = {get_play_key(possible_play): possible_play for possible_play in board_plays}
+    for engine_name, play_keys in [("compiled board", board_plays_by_key.keys() - reference_plays_by_key.keys()), ("reference", reference_plays_by_key.keys() - board_plays_by_key.keys())]:
+        if play_keys:
+            divergences.append(f"only the {engine_name} engine lists the plays {sorted(play_keys, key=repr)} of {cards_to_play_from} for {player_to_play.name} with pawns {board_pawns}")
+    for play_key in board_plays_by_key.keys() & reference_plays_by_key.keys():
+        possible_play = board_plays_by_key[play_key]
+        if 'd' in possible_play['pawn_targets'] or not possible_play['pawn_targets']:
+            continue
+        board_pawns_after_play = dict(board_pawns)
+        play_card_on_board(STANDARD_BOARD, possible_play['card_to_play'], possible_play['pawn_targets'], board_pawns_after_play, possible_play.get('is_card_a_ten_as_backward_one', False))
+        reference_pawns_after_play = get_coordinate_pawns(board_pawns)
+        try:
+            play_card(possible_play['card_to_play'], possible_play['pawn_targets'], reference_pawns_after_play, possible_play.get('is_card_a_ten_as_backward_one', False))
+        except Exception as error:
+            divergences.append(f"the reference engine raised {error!r} applying {play_key} with pawns {board_pawns}")
+            continue
+        reference_pawns_after_play = get_standard_board_pawns(reference_pawns_after_play)
+        if reference_pawns_after_play != board_pawns_after_play:
+            divergences.append(f"{play_key} with pawns {board_pawns} leaves the compiled board engine's pawns {board_pawns_after_play} but the reference engine's {reference_pawns_after_play}")
+    return divergences
+
+
+class EngineCrossChecker:  # checks a random fraction of the turns of simulated games against the reference engine (see cross_check_turn()), writing each divergence to log_file with the game's seed and the play it occurred at so that it can be reproduced; its own sampling never disturbs the games' random numbers
+    def __init__(self, fraction, seed=0, log_file=sys.stderr):
+        self.fraction = fraction
+        self.sampler = random.Random(seed)
+        self.log_file = log_file
+        self.num_turns_checked = 0
+        self.num_divergences = 0
+
+    def check(self, game_state, game_seed, play_number):  # cross-checks the turn of the player whose turn it is with probability fraction
+        if game_state.board is not STANDARD_BOARD or self.sampler.random() >= self.fraction:
+            return
+        self.num_turns_checked += 1
+        for divergence in cross_check_turn(game_state):
+            self.num_divergences += 1
+            print(f"Divergence in the game seeded {game_seed!r} before play {play_number}: {divergence}", file=self.log_file, flush=True)
+
+
+def get_slides(slides_specification):  # returns the (offset, length) pairs of slides given as comma-separated offset:length pairs (such as '1:3,9:4', or '' for none); raises ValueError for any other specification
+    slides = []
+    for part in slides_specification.split(','):
+        if part:
+            offset, separator, length = part.partition(':')
+            if not separator or not offset.strip().isdigit() or not length.strip().isdigit():
+                raise ValueError(f"slides are comma-separated offset:length pairs, not {part!r}")
+            slides.append((int(offset), int(length)))
+    return slides
+
+
+def simulate_computer_games(num_games, board=STANDARD_BOARD, seed=None, cross_checker=None, **rules):  # plays num_games games between computer-controlled players seated at every side of the given CompiledBoard (see get_compiled_board()) with any keyword arguments of new_game_state(), dealing and playing each game with a random.Random seeded with f"{seed}-{game number}" if a seed is provided (or picked, to cross-check turns with cross_checker, an EngineCrossChecker, if provided); returns the number of plays made and a Counter of each victor's name
+    num_plays = 0
+    victors = collections.Counter()
+    if seed is None and cross_checker is not None:
+        seed = random.randrange(1 << 32)  # so that any divergence found can be reproduced
+    for game_number in range(num_games):
+        game_seed = f"{seed}-{game_number}" if seed is not None else None
+        game_state = new_game_state({side_color: PlayerType.COMPUTER for side_color in board.geometry.side_colors}, board=board, random_generator=random.Random(game_seed) if game_seed is not None else None, **rules)
+        play_number = 0
+        while not game_state.is_game_won:
+            if cross_checker is not None:
+                cross_checker.check(game_state, game_seed, play_number)
+            apply_play_to_game_state(game_state, choose_computer_play(game_state))
+            play_number += 1
+        num_plays += play_number
+        victors.update(get_victors(game_state.players))
+    return num_plays, victors
+
+
+def get_coordinates_from_track_index(track_index):  # inverse of get_track_index()
+    side_length = Coordinate.MAX_X.value
+    if track_index < side_length:
+        return {Coordinate.X: track_index, Coordinate.Y: Coordinate.MIN_Y.value}
+    elif track_index < 2 * side_length:
+        return {Coordinate.X: Coordinate.MAX_X.value, Coordinate.Y: track_index - side_length}
+    elif track_index < 3 * side_length:
+        return {Coordinate.X: 3 * side_length - track_index, Coordinate.Y: Coordinate.MAX_Y.value}
+    return {Coordinate.X: Coordinate.MIN_X.value, Coordinate.Y: 4 * side_length - track_index}
+
+
+def get_location_from_pawn_progress(pawn_label, progress):  # inverse of get_pawn_progress(); returns a new location object
+    if progress == 0:
+        return SpecialLocation.START.value
+    elif progress == 66:
+        return SpecialLocation.HOME.value
+    elif progress > 60:  # in its safety zone, which leads from its entrance straight toward the center of the board
+        location = get_safety_zone_entrance(pawn_label[0]).copy()
+        if location[Coordinate.Y] == Coordinate.MIN_Y.value:
+            location[Coordinate.Y] += progress - 60
+        elif location[Coordinate.X] == Coordinate.MAX_X.value:
+            location[Coordinate.X] -= progress - 60
+        elif location[Coordinate.Y] == Coordinate.MAX_Y.value:
+            location[Coordinate.Y] -= progress - 60
+        else:
+            location[Coordinate.X] += progress - 60
+        return location
+    return get_coordinates_from_track_index((get_track_index(get_start_exit_location(pawn_label[0])) + progress - 2) % (4 * Coordinate.MAX_X.value))
+
+
+def get_standard_board_pawns(all_pawns):  # returns a copy of all_pawns (located by coordinates) with each pawn located as on STANDARD_BOARD instead
+    return {pawn_label: STANDARD_BOARD.locations_by_progress[pawn_label[0]][get_pawn_progress(pawn_label, all_pawns[pawn_label])] for pawn_label in all_pawns}
+
+
+def get_coordinate_pawns(board_pawns):  # inverse of get_standard_board_pawns()
+    return {pawn_label: get_location_from_pawn_progress(pawn_label, STANDARD_BOARD.progresses_by_location[pawn_label[0]][board_pawns[pawn_label]]) for pawn_label in board_pawns}
+
+
+CHECKPOINT_MAGIC = b'SRY\x01'
+
+
+def encode_game_state(game_state, do_show_card_descriptions=False):  # returns the game state (of a game on the standard board, located by coordinates or on STANDARD_BOARD) packed into a compact checkpoint (a few hundred bytes at most): a header, each player's color, type, card selection method, pawn progresses (see get_pawn_progress()), and hand, then the draw, discard, last discard, and forced card piles (cards being indices into get_card_kinds()), then a CRC-32 of everything before it
+    card_kinds = get_card_kinds()
+    card_select_methods = [None, CardSelectMethod.BY_INDEX, CardSelectMethod.BY_VALUE]
+    flags = game_state.are_teams | game_state.can_sevens_be_split_across_more_than_two_pawns << 1 | game_state.is_immediate_draw_after_playing_a_2 << 2 | game_state.is_card_after_playing_a_2_force_played << 3 | game_state.is_game_won << 4 | do_show_card_descriptions << 5
+    data = bytearray(CHECKPOINT_MAGIC)
+    data += struct.pack('<BBBBBB', flags, game_state.hand_size, len(game_state.players), game_state.players_turn, game_state.num_times_to_show_last_discard_pile, game_state.num_played_2s)
+    for player in game_state.players:
+        data += struct.pack('<BBB', get_pawn_slot(player.name[0] + '1') // 4, ord(player.player_type.value), card_select_methods.index(player.card_select_method))
+        data += bytes((get_pawn_progress(pawn_label, player.pawns[pawn_label]) if game_state.board is None else game_state.board.progresses_by_location[pawn_label[0]][player.pawns[pawn_label]]) for pawn_label in player.pawns)
+        data += bytes([len(player.cards_in_hand)] + [card_kinds.index(card) for card in player.cards_in_hand])
+    for pile in [game_state.draw_pile, game_state.discard_pile, game_state.last_discard_pile, game_state.forced_card]:
+        data += bytes([len(pile)] + [card_kinds.index(card) for card in pile])
+    data += struct.pack('<I', zlib.crc32(data))
+    return bytes(data)
+
+
+def decode_game_state(data):  # inverse of encode_game_state(); returns the GameState and whether card descriptions are shown; raises ValueError if the data is not an intact checkpoint
+    if len(data) < len(CHECKPOINT_MAGIC) + 10 or not data.startswith(CHECKPOINT_MAGIC) or struct.unpack_from('<I', data, len(data) - 4)[0] != zlib.crc32(data[:-4]):
+        raise ValueError("not an intact checkpoint")
+    card_kinds = get_card_kinds()
+    card_select_methods = [None, CardSelectMethod.BY_INDEX, CardSelectMethod.BY_VALUE]
+    player_colors = [Color.BLUE, Color.YELLOW, Color.GREEN, Color.RED]
+    try:
+        flags, hand_size, num_players, players_turn, num_times_to_show_last_discard_pile, num_played_2s = struct.unpack_from('<BBBBBB', data, len(CHECKPOINT_MAGIC))
+        offset = len(CHECKPOINT_MAGIC) + 6
+        players = []
+        for player_index in range(num_players):
+            color_index, player_type, card_select_method_index = struct.unpack_from('<BBB', data, offset)
+            offset += 3
+            player = Player(player_colors[color_index], PlayerType(chr(player_type)), hand_size, card_select_methods[card_select_method_index])
+            for pawn_label in player.pawns:
+                player.pawns[pawn_label] = get_location_from_pawn_progress(pawn_label, data[offset])
+                offset += 1
+            player.cards_in_hand = [card_kinds[card_index] for card_index in data[offset + 1:offset + 1 + data[offset]]]
+            offset += 1 + data[offset]
+            players.append(player)
+        piles = []
+        for pile_index in range(4):
+            piles.append([card_kinds[card_index] for card_index in data[offset + 1:offset + 1 + data[offset]]])
+            offset += 1 + data[offset]
+    except (struct.error, IndexError) as error:
+        raise ValueError("malformed checkpoint") from error
+    return restore_game_state(players, hand_size, bool(flags & 1), bool(flags & 2), bool(flags & 4), bool(flags & 8), piles[0], piles[1], piles[2], num_times_to_show_last_discard_pile, players_turn, num_played_2s, piles[3], bool(flags & 16)), bool(flags & 32)
+
+
+def save_checkpoint(path, game_state, do_show_card_descriptions=False, do_fsync=True):  # atomically replaces the file at path with the encoded game state (see write_checkpoint())
+    write_checkpoint(path, encode_game_state(game_state, do_show_card_descriptions), do_fsync)
+
+
+def write_checkpoint(path, data, do_fsync=True):  # atomically replaces the file at path with an encoded game state (so a crash leaves either the old or the new checkpoint, never a partial one)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'wb') as checkpoint_file:
+        checkpoint_file.write(data)
+        if do_fsync:
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path):  # returns the GameState saved at path and whether card descriptions are shown (see decode_game_state())
+    with open(path, 'rb') as checkpoint_file:
+        return decode_game_state(checkpoint_file.read())
+
+
+class SharedTables:  # named NumPy arrays laid out in one memory-mapped file (in /dev/shm where there is one, so it never touches a disk) that every process attached to it (see get_shared_tables()) views in place, so a pool's workers neither rebuild nor unpickle copies of their own and the memory is counted once however many workers there are
+    def __init__(self, path, layout, is_owner=False):  # (see create_shared_tables() and get_shared_tables())
+        self.path = path
+        self.layout = layout  # maps each table's name to its (offset, NumPy dtype string, shape)
+        self.is_owner = is_owner
+        with open(path, 'r+b') as tables_file:
+            self.mapping = mmap.mmap(tables_file.fileno(), 0)
+        self.tables = {table_name: numpy.frombuffer(self.mapping, dtype, math.prod(shape), offset).reshape(shape) for table_name, (offset, dtype, shape) in layout.items()}
+
+    def get_descriptor(self):  # returns what another process passes to get_shared_tables() to attach to these tables (small enough to send with every task)
+        return self.path, self.layout
+
+    def close(self):  # detaches this process (the arrays already handed out stay valid until they are released); the owner also removes the file, after which no other process can attach
+        attached_shared_tables.pop(self.path, None)
+        self.tables = {}
+        try:
+            self.mapping.close()
+        except BufferError:  # arrays viewing the mapping are still referenced; it is unmapped once they are released
+            pass
+        if self.is_owner and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+attached_shared_tables = {}  # the SharedTables this process has created or attached to, by path
+
+
+def create_shared_tables(arrays):  # returns SharedTables owned by this process holding copies of a dictionary of named NumPy arrays (each aligned to a 64-byte boundary); requires NumPy
+    if numpy is None:
+        raise RuntimeError("shared tables require NumPy")
+    layout = {}
+    size = 0
+    for table_name, array in arrays.items():
+        offset = -(-size // 64) * 64
+        layout[table_name] = (offset, array.dtype.str, array.shape)
+        size = offset + array.nbytes
+    file_descriptor, path = tempfile.mkstemp(prefix='sorry-tables-', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    with os.fdopen(file_descriptor, 'wb') as tables_file:
+        tables_file.truncate(max(size, 1))  # an empty file cannot be memory-mapped
+    shared_tables = SharedTables(path, layout, True)
+    for table_name, array in arrays.items():
+        shared_tables.tables[table_name][...] = array
+    attached_shared_tables[path] = shared_tables
+    return shared_tables
+
+
+def get_shared_tables(shared_tables_descriptor):  # returns the SharedTables a descriptor (see SharedTables.get_descriptor()) names, attaching this process to them the first time (a process forked after they were created or attached to already has them mapped)
+    path, layout = shared_tables_descriptor
+    if path not in attached_shared_tables:
+        attached_shared_tables[path] = SharedTables(path, layout)
+    return attached_shared_tables[path]
+
+
+play_scoring_model_tables = {}  # SharedTables holding play scoring models' arrays for worker processes (see create_process_pool()), by the path of the model's file
+
+
+def attach_play_scoring_model(shared_tables_descriptor, path):  # loads the play scoring model (used by every computer-controlled player of this process) from SharedTables created by create_process_pool() rather than from its file at path
+    global play_scoring_model, play_scoring_model_path
+    tables = get_shared_tables(shared_tables_descriptor).tables
+    layer_weights = [tables[f"weights_{layer_index}"] for layer_index in range(len(tables) // 2)]
+    layer_biases = [tables[f"biases_{layer_index}"] for layer_index in range(len(tables) // 2)]
+    for array in layer_weights + layer_biases:
+        array.setflags(write=False)
+    play_scoring_model = PlayScoringModel(layer_weights, layer_biases)
+    play_scoring_model_path = path
+
+
+def initialize_worker_process(play_scoring_model_descriptor, rollout_evaluator_settings, policy_cache_settings, endgame_tablebase_path):  # sets up a worker process of create_process_pool() so its computer-controlled players play as those of the process that created the pool do: attaching to the play scoring model (a (SharedTables descriptor, path) pair, see attach_play_scoring_model()) and making a RolloutEvaluator (playing games out in the worker itself), PolicyCache, and EndgameTablebase of the same settings as that process's (each None if it had none)
+    global rollout_evaluator, policy_cache
+    if play_scoring_model_descriptor is not None:
+        attach_play_scoring_model(*play_scoring_model_descriptor)
+    if rollout_evaluator_settings is not None:
+        rollout_evaluator = RolloutEvaluator(*rollout_evaluator_settings)
+    if policy_cache_settings is not None:
+        policy_cache = PolicyCache(*policy_cache_settings)
+    if endgame_tablebase_path is not None:
+        load_endgame_tablebase(endgame_tablebase_path)
+
+
+def create_process_pool(num_workers):  # returns a ProcessPoolExecutor whose workers play as this process's computer-controlled players do (see initialize_worker_process()), with the play scoring model's arrays shared as SharedTables rather than loaded again; the workers are started by a fork server where there is one (otherwise spawned) rather than forked from this process, which may be running threads or an event loop by then
+    play_scoring_model_descriptor = None
+    if play_scoring_model is not None:
+        if play_scoring_model_path not in play_scoring_model_tables:
+            play_scoring_model_tables[play_scoring_model_path] = create_shared_tables({**{f"weights_{layer_index}": weights for layer_index, weights in enumerate(play_scoring_model.layer_weights)}, **{f"biases_{layer_index}": biases for layer_index, biases in enumerate(play_scoring_model.layer_biases)}})
+            atexit.register(play_scoring_model_tables[play_scoring_model_path].close)
+        play_scoring_model_descriptor = (play_scoring_model_tables[play_scoring_model_path].get_descriptor(), play_scoring_model_path)
+    rollout_evaluator_settings = (rollout_evaluator.num_rollouts, 0, rollout_evaluator.time_limit, rollout_evaluator.rollouts_per_task, rollout_evaluator.table_size) if rollout_evaluator is not None else None
+    policy_cache_settings = (policy_cache.path, policy_cache.size, policy_cache.search_name) if policy_cache is not None else None
+    endgame_tablebase_path = endgame_tablebase.path if endgame_tablebase is not None else None
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+    return concurrent.futures.ProcessPoolExecutor(num_workers, context, initializer=initialize_worker_process, initargs=(play_scoring_model_descriptor, rollout_evaluator_settings, policy_cache_settings, endgame_tablebase_path))
+
+
+ROLLOUT_PLAY_LIMIT = 5000  # plays after which a game being played out is abandoned (counting as a loss)
+ROLLOUT_RECORDED_DECISIONS = 2  # how many of the player's own later decisions each game played out records the outcome of (see RolloutEvaluator)
+
+
+def get_search_position_key(game_state):  # returns a hashable key of what the player whose turn it is knows of the game (every pawn's location on STANDARD_BOARD, the cards they are to play from, and how far into the game and their turn it is), under which a RolloutEvaluator keeps the statistics of their plays
+    all_pawns = get_all_pawns(game_state.players)
+    if game_state.board is None:
+        all_pawns = get_standard_board_pawns(all_pawns)
+    cards_to_play_from = game_state.forced_card if game_state.forced_card else game_state.players[game_state.players_turn].cards_in_hand
+    return tuple(sorted(all_pawns.items())), game_state.players_turn, tuple(sorted(cards_to_play_from)), game_state.num_played_2s, len(game_state.discard_pile), game_state.hand_size, game_state.are_teams
+
+
+def get_play_key(play):  # returns a hashable key of a possible play that two plays share only if they would be applied identically
+    return play['card_to_play'], tuple(get_play_pawn_targets_in_order(play['pawn_targets'])), play.get('is_card_a_ten_as_backward_one', False)
+
+
+def play_out_possible_play(serialized_game_state, play, rollout_seeds, deadline=None):  # plays out one game per seed (seeding a random.Random of the game's own, so the random module is left alone for other threads) from the encoded game state (see encode_game_state()) after the given possible play of the player whose turn it is, with the cards that player has not seen dealt anew and every player playing as a computer-controlled player would, on STANDARD_BOARD for speed; stops early once time.monotonic() passes deadline (if provided); returns the number of those games the player (or their team) won, the number of games played out, and a dictionary mapping (search position key, play key) pairs (see get_search_position_key() and get_play_key()) of the player's first ROLLOUT_RECORDED_DECISIONS decisions after the play to the [number of wins, number of games] of the games they were made in
+    num_wins = 0
+    num_rollouts = 0
+    decision_statistics = {}
+    for rollout_seed in rollout_seeds:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        game_state = decode_game_state(serialized_game_state)[0]
+        game_state.random_generator = random.Random(rollout_seed)
+        player_to_play = game_state.players[game_state.players_turn]
+        other_players = [player for player in game_state.players if player is not player_to_play]
+        unseen_cards = game_state.draw_pile + [card for player in other_players for card in player.cards_in_hand]
+        game_state.random_generator.shuffle(unseen_cards)
+        for player in other_players:
+            player.cards_in_hand = [unseen_cards.pop() for card in player.cards_in_hand]
+        game_state.draw_pile = unseen_cards
+        for player in game_state.players:
+            player.pawns = get_standard_board_pawns(player.pawns)
+        game_state.board = STANDARD_BOARD
+        apply_play_to_game_state(game_state, play)
+        num_plays = 0
+        decisions = []
+        while not game_state.is_game_won and num_plays < ROLLOUT_PLAY_LIMIT:
+            play_to_make = choose_computer_play(game_state, False)
+            if len(decisions) < ROLLOUT_RECORDED_DECISIONS and game_state.players[game_state.players_turn] is player_to_play:
+                decisions.append((get_search_position_key(game_state), get_play_key(play_to_make)))
+            apply_play_to_game_state(game_state, play_to_make)
+            num_plays += 1
+        winner = game_state.players[game_state.players_turn]  # the turn is not passed on once the game is won
+        is_won = game_state.is_game_won and (winner is player_to_play or (game_state.are_teams and STANDARD_BOARD.teammate_letters.get(winner.name[0]) == player_to_play.name[0]))
+        num_wins += is_won
+        num_rollouts += 1
+        for decision in decisions:
+            statistics = decision_statistics.setdefault(decision, [0, 0])
+            statistics[0] += is_won
+            statistics[1] += 1
+    return num_wins, num_rollouts, decision_statistics
+
+
+class RolloutEvaluator:  # scores a computer-controlled player's possible plays by how many of the games played out after each (see play_out_possible_play()) they go on to win, spreading the play-outs across a persistent pool of worker processes; the games played out also record the player's own next decisions, whose statistics are kept (in a table of table_size positions, evicting the least recently used) so that when the game reaches one of those positions its plays need fewer new play-outs
+    def __init__(self, num_rollouts, num_workers=0, time_limit=None, rollouts_per_task=4, table_size=10000):  # num_rollouts is the number of games to play out per possible play (counting those kept from earlier turns); time_limit (if provided) is the number of seconds the play-outs of a turn may take, after which those not yet started are skipped; with no workers, the play-outs run in the calling process; a table_size of zero keeps no statistics between turns
+        self.num_rollouts = num_rollouts
+        self.time_limit = time_limit
+        self.rollouts_per_task = rollouts_per_task
+        self.table_size = table_size
+        self.position_statistics = collections.OrderedDict()  # maps search position keys (see get_search_position_key()) to dictionaries mapping play keys (see get_play_key()) to [number of wins, number of games played out], least recently used first
+        self.lock = threading.Lock()  # guards position_statistics, as a server's computer-controlled turns may score plays in several threads at once
+        self.executor = create_process_pool(num_workers) if num_workers > 0 else None
+
+    def record_statistics(self, position_key, play_key, num_wins, num_rollouts):  # adds the outcomes of games played out to the kept statistics of a play from a position, evicting the least recently used positions beyond table_size; the lock must be held
+        if self.table_size <= 0:
+            return
+        play_statistics = self.position_statistics.setdefault(position_key, {})
+        self.position_statistics.move_to_end(position_key)
+        statistics = play_statistics.setdefault(play_key, [0, 0])
+        statistics[0] += num_wins
+        statistics[1] += num_rollouts
+        while len(self.position_statistics) > self.table_size:
+            self.position_statistics.popitem(last=False)
+
+    def score_possible_plays(self, game_state, possible_plays, num_rollouts=None, time_limit=None):  # sets the 'play_score' of each possible play of the player whose turn it is to their estimated chance of winning after it; the scores only depend on the game state, the plays, the statistics kept from earlier turns, and how many games were played out in time (not on how the play-outs were spread across workers); games on larger boards are left as scored; num_rollouts and time_limit (if provided) override the evaluator's for this call only
+        if len(possible_plays) < 2 or game_state.board not in [None, STANDARD_BOARD]:
+            return
+        target_num_rollouts = num_rollouts if num_rollouts is not None else self.num_rollouts
+        time_limit = time_limit if time_limit is not None else self.time_limit
+        position_key = get_search_position_key(game_state)
+        play_keys = [get_play_key(possible_play) for possible_play in possible_plays]
+        with self.lock:
+            kept_play_statistics = self.position_statistics.get(position_key, {})
+            if kept_play_statistics:
+                self.position_statistics.move_to_end(position_key)
+            num_wins = [kept_play_statistics.get(play_key, [0, 0])[0] for play_key in play_keys]
+            num_rollouts = [kept_play_statistics.get(play_key, [0, 0])[1] for play_key in play_keys]
+        serialized_game_state = encode_game_state(game_state)
+        rollout_seeds = [f"{zlib.crc32(serialized_game_state)}-{rollout_index}" for rollout_index in range(target_num_rollouts)]  # every play is played out with the same seeds, so the plays are compared over the same deals and draws
+        deadline = time.monotonic() + time_limit if time_limit is not None else None
+        tasks = [(play_index, rollout_seeds[first_rollout:min(first_rollout + self.rollouts_per_task, target_num_rollouts - num_rollouts[play_index])]) for first_rollout in range(0, target_num_rollouts, self.rollouts_per_task) for play_index in range(len(possible_plays)) if first_rollout < target_num_rollouts - num_rollouts[play_index]]  # interleaved so that, if time runs out, every play was played out about as many times
+        if self.executor is not None:
+            futures = [self.executor.submit(play_out_possible_play, serialized_game_state, possible_plays[play_index], seeds, deadline) for play_index, seeds in tasks]
+            results = [future.result() for future in futures]
+        else:
+            results = [play_out_possible_play(serialized_game_state, possible_plays[play_index], seeds, deadline) for play_index, seeds in tasks]
+        with self.lock:
+            for (play_index, seeds), (task_num_wins, task_num_rollouts, decision_statistics) in zip(tasks, results):
+                num_wins[play_index] += task_num_wins
+                num_rollouts[play_index] += task_num_rollouts
+                self.record_statistics(position_key, play_keys[play_index], task_num_wins, task_num_rollouts)
+                for (decision_position_key, decision_play_key), (decision_num_wins, decision_num_rollouts) in decision_statistics.items():
+                    self.record_statistics(decision_position_key, decision_play_key, decision_num_wins, decision_num_rollouts)
+        for play_index in range(len(possible_plays)):
+            possible_plays[play_index]['play_score'] = (num_wins[play_index] + 0.5) / (num_rollouts[play_index] + 1)  # a play not played out in time scores as even odds
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+rollout_evaluator = None  # the RolloutEvaluator computer-controlled players score plays with (None for scoring without playing out games); see use_rollout_evaluator()
+
+
+def use_rollout_evaluator(num_rollouts, num_workers=0, time_limit=None, table_size=10000):  # has every computer-controlled player of this process score its plays by playing out games (see RolloutEvaluator) from then on
+    global rollout_evaluator
+    if rollout_evaluator is not None:
+        rollout_evaluator.close()
+    rollout_evaluator = RolloutEvaluator(num_rollouts, num_workers, time_limit, table_size=table_size)
+
+
+def get_canonical_position(game_state, search_name=''):  # returns a hash (as a hexadecimal string) of the position of the game on the standard board (every pawn's location, the hand and any forced card of the player whose turn it is, how far into their turn it is, and the rules, but not which cards were discarded, which matters little to what to play) as seen from the seat of the player whose turn it is (so positions that are the same but for which side the players sit on share it, as do positions that are the same but for which pawn of a player is which), and a dictionary mapping each pawn label to the [seat, progress] pair standing in for it (see get_canonical_play()); search_name distinguishes positions searched differently
+    all_pawns = get_all_pawns(game_state.players)
+    players_letter = game_state.players[game_state.players_turn].name[0]
+    side_letters = STANDARD_BOARD.side_letters
+    canonical_pawns = {pawn_label: [(side_letters.index(pawn_label[0]) - side_letters.index(players_letter)) % len(side_letters), STANDARD_BOARD.progresses_by_location[pawn_label[0]][all_pawns[pawn_label]] if game_state.board is not None else get_pawn_progress(pawn_label, all_pawns[pawn_label])] for pawn_label in all_pawns}  # seats count clockwise (the order of play) from the player whose turn it is
+    seat_progresses = [None] * len(side_letters)  # the sorted progresses of the pawns of the player in each seat (None for an empty seat)
+    for seat, progress in canonical_pawns.values():
+        seat_progresses[seat] = (seat_progresses[seat] or []) + [progress]
+    position = (search_name, tuple(tuple(sorted(progresses)) if progresses is not None else None for progresses in seat_progresses), tuple(sorted(game_state.players[game_state.players_turn].cards_in_hand)), tuple(game_state.forced_card), game_state.num_played_2s, game_state.hand_size, game_state.are_teams, game_state.can_sevens_be_split_across_more_than_two_pawns, game_state.is_immediate_draw_after_playing_a_2, game_state.is_card_after_playing_a_2_force_played)
+    return hashlib.blake2b(repr(position).encode(), digest_size=16).hexdigest(), canonical_pawns
+
+
+def get_canonical_play(play, canonical_pawns):  # returns a JSON-compatible form of a possible play with each pawn target replaced by the [seat, progress] pair standing in for it (see get_canonical_position()), which a possible play of a position of the same hash shares only if it is the same play as seen from that position's seat
+    pawn_targets = play['pawn_targets']
+    if isinstance(pawn_targets, dict):
+        canonical_pawn_targets = [[canonical_pawns[pawn_label], distance] for pawn_label, distance in pawn_targets.items()]
+    else:
+        canonical_pawn_targets = [canonical_pawns[pawn_target] if pawn_target != 'd' else pawn_target for pawn_target in pawn_targets]
+    return [play['card_to_play'], canonical_pawn_targets, play.get('is_card_a_ten_as_backward_one', False)]
+
+
+class PolicyCache:  # the best play (and its score) found by searching positions (see get_canonical_position()) before, kept in a least recently used table in memory and (if a path is provided) appended to a file of one line of JSON per position, which is read the first time the cache is consulted, so that a position is searched once across turns, games, and runs
+    def __init__(self, path=None, size=10000, search_name=''):  # size bounds the positions kept in memory (those only in the file are read from it as needed); search_name distinguishes searches whose results should not be shared (see get_canonical_position())
+        self.path = path
+        self.size = size
+        self.search_name = search_name
+        self.entries = collections.OrderedDict()  # maps position hashes to (canonical play, score) pairs, least recently used first
+        self.file_offsets = None  # maps position hashes to the offset of their (latest) line in the file, once the file is read
+        self.is_last_line_unfinished = False  # whether the file ends partway through a line (such as after a crash), which the next line appended must not run on from
+        self.num_hits = 0
+        self.num_misses = 0
+        self.lock = threading.Lock()  # guards the table, the file, and the counts, as a server's computer-controlled turns may consult the cache in several threads at once
+
+    def get_file_offsets(self):  # (the lock must be held)
+        if self.file_offsets is None:
+            self.file_offsets = {}
+            if self.path is not None and os.path.exists(self.path):
+                with open(self.path, 'rb') as file:
+                    offset = 0
+                    for line in file:
+                        try:
+                            self.file_offsets[json.loads(line)['position']] = offset
+                        except (ValueError, KeyError, TypeError):  # an unfinished or malformed line is skipped
+                            pass
+                        offset += len(line)
+                        self.is_last_line_unfinished = not line.endswith(b'\n')
+        return self.file_offsets
+
+    def add_entry(self, position_hash, entry):  # (the lock must be held)
+        self.entries[position_hash] = entry
+        self.entries.move_to_end(position_hash)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def get_best_play(self, game_state, possible_plays):  # returns the possible play cached as the best of the player whose turn it is, and its score, or (None, None) if the position was not searched before
+        position_hash, canonical_pawns = get_canonical_position(game_state, self.search_name)
+        with self.lock:
+            entry = self.entries.get(position_hash)
+            if entry is not None:
+                self.entries.move_to_end(position_hash)
+            elif position_hash in self.get_file_offsets():
+                with open(self.path, 'rb') as file:
+                    file.seek(self.file_offsets[position_hash])
+                    record = json.loads(file.readline())
+                entry = record['play'], record['score']
+                self.add_entry(position_hash, entry)
+            if entry is not None:
+                for possible_play in possible_plays:
+                    if get_canonical_play(possible_play, canonical_pawns) == entry[0]:
+                        self.num_hits += 1
+                        return possible_play, entry[1]
+            self.num_misses += 1
+            return None, None
+
+    def add_best_play(self, game_state, play, score):  # caches the best possible play (and its score) of the player whose turn it is, as found by searching
+        position_hash, canonical_pawns = get_canonical_position(game_state, self.search_name)
+        canonical_play = get_canonical_play(play, canonical_pawns)
+        with self.lock:
+            self.add_entry(position_hash, (canonical_play, score))
+            if self.path is not None:
+                file_offsets = self.get_file_offsets()
+                with open(self.path, 'ab') as file:
+                    if self.is_last_line_unfinished:
+                        file.write(b'\n')
+                        self.is_last_line_unfinished = False
+                    file_offsets[position_hash] = file.tell()
+                    file.write(json.dumps({'position': position_hash, 'play': canonical_play, 'score': score}).encode() + b'\n')
+
+
+policy_cache = None  # the PolicyCache of the plays computer-controlled players find by playing out games (None for searching every position anew); see use_policy_cache()
+
+
+def use_policy_cache(path=None, size=10000):  # has every computer-controlled player of this process that plays out games (see use_rollout_evaluator(), which must be called first) make the play cached for a position searched before (in this process or, if a path is provided, any run appending to the file at path) instead of searching it again
+    global policy_cache
+    policy_cache = PolicyCache(path, size, f"rollouts:{rollout_evaluator.num_rollouts}" if rollout_evaluator is not None else '')
+
+
+class ModelPlayScorer:  # scores plays with a PlayScoringModel of its own rather than the one loaded for every computer-controlled player (see load_play_scoring_model()), such as for comparing models on a RatingLadder
+    def __init__(self, path):  # (see read_play_scoring_model())
+        self.model = read_play_scoring_model(path)
+
+    def score_possible_plays(self, game_state, possible_plays):  # sets the 'play_score' of each possible play of the player whose turn it is in game_state (a game on the standard board)
+        player_to_play = game_state.players[game_state.players_turn]
+        all_pawns = get_all_pawns(game_state.players)
+        add_play_score_attributes_in_batch(possible_plays, game_state.forced_card if game_state.forced_card else player_to_play.cards_in_hand, player_to_play.name, get_coordinate_pawns(all_pawns) if game_state.board is STANDARD_BOARD else all_pawns, game_state.discard_pile, self.model)
+
+
+class ThreatAwareScorer:  # scores plays by how much progress the player's (and any teammate's) pawns keep after them, less what each can expect to lose to being bumped next (see ThreatMap.get_exposure()), less the opponents' pawns' progress; keeps one ThreatMap up to date across plays and turns rather than rebuilding it
+    def __init__(self):
+        self.threat_map = None
+
+    def score_possible_plays(self, game_state, possible_plays):  # sets the 'play_score' of each possible play of the player whose turn it is in game_state
+        board = game_state.board if game_state.board is not None else STANDARD_BOARD
+        all_pawns = get_all_pawns(game_state.players) if game_state.board is not None else get_standard_board_pawns(get_all_pawns(game_state.players))
+        if self.threat_map is None or self.threat_map.board is not board:
+            self.threat_map = ThreatMap(board)
+        player_letter = game_state.players[game_state.players_turn].name[0]
+        friendly_letters = [player_letter, board.teammate_letters.get(player_letter)] if game_state.are_teams else [player_letter]
+        for possible_play in possible_plays:
+            all_pawns_after_play = dict(all_pawns)
+            if 'd' not in possible_play['pawn_targets'] and possible_play['pawn_targets']:
+                play_card_on_board(board, possible_play['card_to_play'], possible_play['pawn_targets'], all_pawns_after_play, possible_play.get('is_card_a_ten_as_backward_one', False))
+            self.threat_map.update(all_pawns_after_play)
+            play_score = 0.0
+            for pawn_label, location in all_pawns_after_play.items():
+                progress = board.progresses_by_location[pawn_label[0]][location]
+                if pawn_label[0] in friendly_letters:
+                    play_score += progress * (1 - self.threat_map.get_exposure(pawn_label, game_state.are_teams))
+                else:
+                    play_score -= progress
+            possible_play['play_score'] = play_score
+        self.threat_map.update(all_pawns)
+
+
+def get_bot(bot_specification, num_rollout_workers=0):  # returns the play scorer (see choose_bot_play()) a bot specification names: 'builtin' (None), 'model:<path of a .npz file>' (a ModelPlayScorer), or 'rollouts:<number of games played out per play>' (a RolloutEvaluator with num_rollout_workers workers), 'tablebase:<path of an endgame tablebase>' (an EndgameTablebase, built-in scoring outside the endgame), or 'threats' (a ThreatAwareScorer); raises ValueError for any other specification
+    kind, separator, argument = bot_specification.partition(':')
+    if kind == 'builtin' and not separator:
+        return None
+    if kind == 'model' and argument:
+        return ModelPlayScorer(argument)
+    if kind == 'rollouts' and argument.isdigit() and int(argument) > 0:
+        return RolloutEvaluator(int(argument), num_rollout_workers)
+    if kind == 'tablebase' and argument:
+        return EndgameTablebase(argument)
+    if kind == 'threats' and not separator:
+        return ThreatAwareScorer()
+    raise ValueError(f"unknown bot {bot_specification!r} (expected builtin, model:<path>, rollouts:<number>, tablebase:<path>, or threats)")
+
+
+def choose_bot_play(game_state, bot):  # returns the possible play the bot would make for the player whose turn it is; bot is a play scorer (anything with a score_possible_plays(game_state, possible_plays) method, such as a RolloutEvaluator or ModelPlayScorer) rescoring the plays after the built-in scoring (see add_play_score_attribute()), or None to keep the built-in scores
+    possible_plays = get_possible_plays_for_game_state(game_state, True)
+    if bot is not None:
+        bot.score_possible_plays(game_state, possible_plays)
+    return possible_plays[select_play_with_max_score(possible_plays)]
+
+
+class SequentialTestOutcome(Enum):  # the outcome of a sequential probability ratio test of whether one bot is stronger than another (see RatingLadder.play_match())
+    STRONGER = 'stronger'  # H1 was accepted
+    NOT_STRONGER = 'not stronger'  # H0 was accepted
+    UNDECIDED = 'undecided'  # the match reached its maximum number of games first
+
+
+MatchResult = collections.namedtuple('MatchResult', ['first_bot_name', 'second_bot_name', 'num_games', 'num_first_bot_wins', 'log_likelihood_ratio', 'outcome'])  # outcome is a SequentialTestOutcome
+
+
+def get_elo_win_probability(rating_difference):  # returns the probability of winning a game against an opponent rated rating_difference Elo points lower
+    return 1 / (1 + 10 ** (-rating_difference / 400))
+
+
+class RatingLadder:  # Elo (Bradley-Terry) ratings of bots updated after every game of the head-to-head, two-player, all-computer matches it plays, each match stopping as soon as a sequential probability ratio test decides it
+    def __init__(self, bots, ratings=None, k_factor=16, initial_rating=1500):  # bots maps each bot's name to its play scorer (see choose_bot_play()); ratings (if provided) maps bot names to the ratings they earned before (see read_ratings())
+        self.bots = bots
+        self.k_factor = k_factor
+        self.ratings = dict(ratings) if ratings is not None else {}
+        for bot_name in bots:
+            self.ratings.setdefault(bot_name, initial_rating)
+
+    def update_ratings(self, winner_name, loser_name):
+        rating_change = self.k_factor * (1 - get_elo_win_probability(self.ratings[winner_name] - self.ratings[loser_name]))
+        self.ratings[winner_name] += rating_change
+        self.ratings[loser_name] -= rating_change
+
+    def play_game(self, first_bot_name, second_bot_name, game_number, seed=0, **rules):  # plays a game (on STANDARD_BOARD, with any keyword arguments of new_game_state()) between the bots seated on opposite sides, rotating the sides with every pair of games; both games of a pair deal the same cards (by dealing and playing each with a random.Random seeded alike) with the bots trading seats; returns the name of the winning bot
+        pair_number = game_number // 2
+        player_colors = [Color.BLUE, Color.YELLOW, Color.GREEN, Color.RED]
+        seat_colors = [player_colors[pair_number % 4], player_colors[(pair_number + 2) % 4]]
+        if game_number % 2 == 1:
+            seat_colors.reverse()
+        game_state = new_game_state({seat_color: PlayerType.COMPUTER for seat_color in seat_colors}, board=STANDARD_BOARD, random_generator=random.Random(f"{seed}-{pair_number}"), **rules)
+        bot_names_by_letter = {seat_colors[0].name[0]: first_bot_name, seat_colors[1].name[0]: second_bot_name}
+        while not game_state.is_game_won:
+            apply_play_to_game_state(game_state, choose_bot_play(game_state, self.bots[bot_names_by_letter[game_state.players[game_state.players_turn].name[0]]]))
+        return bot_names_by_letter[game_state.players[game_state.players_turn].name[0]]  # the turn is not passed on once the game is won
+
+    def play_match(self, first_bot_name, second_bot_name, elo0=0, elo1=50, alpha=0.05, beta=0.05, max_games=10000, seed=0, **rules):  # plays games (see play_game()) until a sequential probability ratio test of H0 (the first bot is elo0 Elo points stronger than the second) against H1 (it is elo1 points stronger) accepts either hypothesis, with false positive rate alpha and false negative rate beta, or until max_games were played; returns a MatchResult
+        lower_bound = math.log(beta / (1 - alpha))
+        upper_bound = math.log((1 - beta) / alpha)
+        win_probability_0 = get_elo_win_probability(elo0)
+        win_probability_1 = get_elo_win_probability(elo1)
+        win_log_likelihood_ratio = math.log(win_probability_1 / win_probability_0)
+        loss_log_likelihood_ratio = math.log((1 - win_probability_1) / (1 - win_probability_0))
+        log_likelihood_ratio = 0.0
+        num_first_bot_wins = 0
+        outcome = SequentialTestOutcome.UNDECIDED
+        num_games = 0
+        while num_games < max_games and outcome == SequentialTestOutcome.UNDECIDED:
+            if self.play_game(first_bot_name, second_bot_name, num_games, seed, **rules) == first_bot_name:
+                num_first_bot_wins += 1
+                log_likelihood_ratio += win_log_likelihood_ratio
+                self.update_ratings(first_bot_name, second_bot_name)
+            else:
+                log_likelihood_ratio += loss_log_likelihood_ratio
+                self.update_ratings(second_bot_name, first_bot_name)
+            num_games += 1
+            if log_likelihood_ratio >= upper_bound:
+                outcome = SequentialTestOutcome.STRONGER
+            elif log_likelihood_ratio <= lower_bound:
+                outcome = SequentialTestOutcome.NOT_STRONGER
+        return MatchResult(first_bot_name, second_bot_name, num_games, num_first_bot_wins, log_likelihood_ratio, outcome)
+
+    def play_round_robin(self, **match_options):  # plays a match (see play_match()) between every pair of bots, in the order the bots were given; returns the MatchResults
+        bot_names = list(self.bots)
+        return [self.play_match(bot_names[first_index], bot_names[second_index], **match_options) for first_index in range(len(bot_names)) for second_index in range(first_index + 1, len(bot_names))]
+
+
+def read_ratings(path):  # returns the ratings (mapping bot names to ratings) saved at path by write_ratings(), or an empty dictionary if there is no file there
+    if not os.path.exists(path):
+        return {}
+    with open(path) as ratings_file:
+        return json.load(ratings_file)
+
+
+def write_ratings(path, ratings):  # atomically replaces the file at path with the ratings (see save_checkpoint())
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'w') as ratings_file:
+        json.dump(ratings, ratings_file, indent=2, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+ENDGAME_MAX_DISTANCE = 12  # pawns within this many squares of their home (their safety zone, its entrance, and the six squares before it, none of which are on or just before a slide they ride) are in the endgame
+ENDGAME_TABLEBASE_MAGIC = b'SRYE'
+ENDGAME_TABLEBASE_VERSION = 1
+ENDGAME_TABLEBASE_HEADER_FORMAT = '<4sBBI'  # magic, version, ENDGAME_MAX_DISTANCE, number of endgame positions; followed by a little-endian uint16 win probability (scaled by 65535) for every ordered pair of endgame positions
+ENDGAME_TABLEBASE_HEADER_SIZE = struct.calcsize(ENDGAME_TABLEBASE_HEADER_FORMAT)
+NUM_ENDGAME_POSITIONS = math.comb(ENDGAME_MAX_DISTANCE + 4, 4)  # one per multiset of four pawns' distances from home
+
+
+def get_endgame_index(distances):  # takes the sorted distances from home of a player's four pawns (see get_endgame_distances()) and returns the position's index among all NUM_ENDGAME_POSITIONS endgame positions (its rank in the combinatorial number system); the position with every pawn home has index 0
+    return math.comb(distances[0], 1) + math.comb(distances[1] + 1, 2) + math.comb(distances[2] + 2, 3) + math.comb(distances[3] + 3, 4)
+
+
+def get_endgame_distances(pawns, board=None, do_clamp=False):  # takes a player's pawns (located by coordinates, or on board if provided) and returns the sorted tuple of their distances from home if every pawn is in the endgame (see ENDGAME_MAX_DISTANCE), otherwise None (or, if do_clamp, the distances with any pawn beyond the endgame treated as at its edge)
+    if board is None:
+        distances = sorted(66 - get_pawn_progress(pawn_label, location) for pawn_label, location in pawns.items())
+    else:
+        distances = sorted(board.home_progress - board.progresses_by_location[pawn_label[0]][location] for pawn_label, location in pawns.items())
+    if len(distances) != 4 or (distances[-1] > ENDGAME_MAX_DISTANCE and not do_clamp):
+        return None
+    return tuple(min(distance, ENDGAME_MAX_DISTANCE) for distance in distances)
+
+
+def move_endgame_pawn(distances, pawn_index, num_spaces):  # returns the distances (as a list) after moving the indexed pawn num_spaces toward home (away from it if negative), or None if the move is invalid (overshooting home or landing on a pawn of the same player); a pawn moved beyond the endgame stops at its edge
+    distance = distances[pawn_index]
+    destination = min(distance - num_spaces, ENDGAME_MAX_DISTANCE)
+    if distance == 0 or destination < 0 or (destination != 0 and destination != distance and destination in distances):
+        return None
+    moved_distances = list(distances)
+    moved_distances[pawn_index] = destination
+    return moved_distances
+
+
+def get_endgame_moves(distances, card):  # returns the set of sorted distance tuples the card's possible plays (with sevens split across at most two pawns) lead to from an endgame position, ignoring any other player's pawns (so an '11' only moves forward and a 'Sorry' never has a play); an empty set means the card can only be discarded (or a '2' played purely as a draw)
+    moves = set()
+    if card == '7':
+        for first_pawn_index in range(4):
+            for second_pawn_index in range(4):
+                for first_num_spaces in range(1, 8):
+                    if (first_num_spaces == 7) != (first_pawn_index == second_pawn_index):
+                        continue
+                    moved_distances = move_endgame_pawn(distances, first_pawn_index, first_num_spaces)
+                    if moved_distances is not None and first_num_spaces != 7:
+                        moved_distances = move_endgame_pawn(moved_distances, second_pawn_index, 7 - first_num_spaces)
+                    if moved_distances is not None:
+                        moves.add(tuple(sorted(moved_distances)))
+        return moves
+    if card == 'Sorry':
+        return moves
+    for num_spaces in {'4': [-4], '10': [10, -1]}.get(card, [int(card)]):
+        for pawn_index in range(4):
+            moved_distances = move_endgame_pawn(distances, pawn_index, num_spaces)
+            if moved_distances is not None:
+                moves.add(tuple(sorted(moved_distances)))
+    return moves
+
+
+endgame_transitions = None  # see get_endgame_transitions()
+
+
+def get_endgame_transitions():  # returns, for each endgame position index, a list of (card, probability of drawing it, indices of the positions its plays lead to) for every kind of card in the deck, computing them the first time they are requested
+    global endgame_transitions
+    if endgame_transitions is None:
+        draw_pile = create_draw_pile()
+        card_probabilities = [(card, draw_pile.count(card) / len(draw_pile)) for card in dict.fromkeys(draw_pile)]
+        endgame_transitions = [None] * NUM_ENDGAME_POSITIONS
+        for distances in itertools.combinations_with_replacement(range(ENDGAME_MAX_DISTANCE + 1), 4):
+            endgame_transitions[get_endgame_index(distances)] = [(card, probability, sorted(get_endgame_index(moved_distances) for moved_distances in get_endgame_moves(distances, card))) for card, probability in card_probabilities]
+    return endgame_transitions
+
+
+def sweep_endgame_win_probabilities(shared_tables_descriptor, first_index, num_indices):  # writes the next value iteration estimate (see generate_endgame_tablebase()) of the rows first_index up to first_index + num_indices of the win probabilities into the 'next_values' table of the SharedTables the descriptor names, from its 'values' and 'opponent_values' tables; returns the largest change to any of those probabilities
+    tables = get_shared_tables(shared_tables_descriptor).tables
+    values = tables['values']
+    opponent_values = tables['opponent_values']  # opponent_values[a] is the chance the opponent fails to win from each of their positions when it becomes their turn with the player at position a
+    transitions = get_endgame_transitions()
+    row = numpy.empty(NUM_ENDGAME_POSITIONS)
+    change = 0.0
+    for index in range(first_index, first_index + num_indices):
+        row[:] = 1 if index == 0 else 0  # the player with every pawn home has already won
+        for card, probability, moved_indices in transitions[index] if index != 0 else []:
+            if 0 in moved_indices:
+                row += probability
+                continue
+            best_values = None
+            for moved_index in moved_indices:
+                move_values = values[moved_index] if card == '2' else opponent_values[moved_index]  # a '2' continues the turn
+                best_values = move_values if best_values is None else numpy.maximum(best_values, move_values)
+            if best_values is None:
+                best_values = values[index] if card == '2' else opponent_values[index]
+            row += probability * best_values
+        row[0] = 0  # an opponent with every pawn home has already won
+        change = max(change, float(numpy.abs(row - values[index]).max()))
+        tables['next_values'][index] = row
+    return change
+
+
+def generate_endgame_tablebase(path, num_workers=0, tolerance=1e-5, max_sweeps=1000):  # solves every two-player endgame (both players' pawns all in the endgame, see ENDGAME_MAX_DISTANCE) for the chance the player whose turn it is wins the race home, drawing from the deck of create_draw_pile() one card a turn and ignoring interaction between the players; value iteration sweeps are split across num_workers worker processes (zero sweeps in this process); stops sweeping once no probability changes by more than tolerance (about the precision they are stored with); writes the tablebase to path (see EndgameTablebase) and returns the number of sweeps made; requires NumPy
+    if numpy is None:
+        raise RuntimeError("generating an endgame tablebase requires NumPy")
+    values = numpy.full((NUM_ENDGAME_POSITIONS, NUM_ENDGAME_POSITIONS), 0.5)
+    values[:, 0] = 0
+    values[0] = 1
+    shared_tables = create_shared_tables({'values': values, 'opponent_values': 1 - values.T, 'next_values': values})  # the workers read the estimate in place and write their rows of the next one in place, rather than each being sent (and sending back) copies
+    tables = shared_tables.tables
+    executor = create_process_pool(num_workers) if num_workers > 0 else None
+    num_rows_per_task = -(-NUM_ENDGAME_POSITIONS // max(num_workers, 1))
+    try:
+        tasks = [(shared_tables.get_descriptor(), first_index, min(num_rows_per_task, NUM_ENDGAME_POSITIONS - first_index)) for first_index in range(0, NUM_ENDGAME_POSITIONS, num_rows_per_task)]
+        for num_sweeps in range(1, max_sweeps + 1):
+            change = max(executor.map(sweep_endgame_win_probabilities, *zip(*tasks)) if executor is not None else [sweep_endgame_win_probabilities(*task) for task in tasks])
+            tables['values'][...] = tables['next_values']
+            numpy.subtract(1, tables['values'].T, out=tables['opponent_values'])
+            if change < tolerance:
                 break
-        if is_player_victor:
-            victors.append(player.name)
-    print(victors[0] + (" and " + victors[1] if len(victors) == 2 else ""), "won! Congratulations!")
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as tablebase_file:
+            tablebase_file.write(struct.pack(ENDGAME_TABLEBASE_HEADER_FORMAT, ENDGAME_TABLEBASE_MAGIC, ENDGAME_TABLEBASE_VERSION, ENDGAME_MAX_DISTANCE, NUM_ENDGAME_POSITIONS))
+            tablebase_file.write(numpy.rint(tables['values'] * 65535).astype('<u2').tobytes())
+        os.replace(temporary_path, path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        shared_tables.close()
+    return num_sweeps
+
+
+class EndgameTablebase:  # a tablebase written by generate_endgame_tablebase(), memory-mapped so each probe reads two bytes in place (and every process mapping the file shares the operating system's cached copy of it); doubles as a play scorer (see choose_bot_play()) for endgames
+    def __init__(self, path):  # raises ValueError if the file at path is not a tablebase of this version
+        self.path = path
+        with open(path, 'rb') as tablebase_file:
+            self.mapping = mmap.mmap(tablebase_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapping) != ENDGAME_TABLEBASE_HEADER_SIZE + 2 * NUM_ENDGAME_POSITIONS ** 2 or struct.unpack_from(ENDGAME_TABLEBASE_HEADER_FORMAT, self.mapping) != (ENDGAME_TABLEBASE_MAGIC, ENDGAME_TABLEBASE_VERSION, ENDGAME_MAX_DISTANCE, NUM_ENDGAME_POSITIONS):
+            self.mapping.close()
+            raise ValueError(f"{path} is not a Sorry! endgame tablebase (of version {ENDGAME_TABLEBASE_VERSION})")
+
+    def probe(self, distances, opponent_distances):  # returns the chance the player whose turn it is wins the race home from their endgame position (see get_endgame_distances()) against their opponent's
+        return struct.unpack_from('<H', self.mapping, ENDGAME_TABLEBASE_HEADER_SIZE + 2 * (get_endgame_index(distances) * NUM_ENDGAME_POSITIONS + get_endgame_index(opponent_distances)))[0] / 65535
+
+    def score_possible_plays(self, game_state, possible_plays):  # if there are no teams and every pawn of every player is in the endgame, sets the 'play_score' of each possible play of the player whose turn it is to their chance of then winning the race home against (with more than one opponent) the opponent they are least likely to beat; otherwise leaves the scores as they are
+        player_to_play = game_state.players[game_state.players_turn]
+        opponents_distances = [get_endgame_distances(player.pawns, game_state.board) for player in game_state.players if player is not player_to_play]
+        if game_state.are_teams or None in opponents_distances or get_endgame_distances(player_to_play.pawns, game_state.board) is None:
+            return
+        all_pawns = get_all_pawns(game_state.players)
+        for possible_play in possible_plays:
+            card_to_play = possible_play['card_to_play']
+            pawn_targets = possible_play['pawn_targets']
+            all_pawns_after_play = copy.deepcopy(all_pawns)
+            if 'd' not in pawn_targets and pawn_targets:
+                if game_state.board is not None:
+                    play_card_on_board(game_state.board, card_to_play, pawn_targets, all_pawns_after_play, possible_play.get('is_card_a_ten_as_backward_one', False))
+                else:
+                    play_card(card_to_play, pawn_targets, all_pawns_after_play, possible_play.get('is_card_a_ten_as_backward_one', False))
+            distances = get_endgame_distances({pawn_label: all_pawns_after_play[pawn_label] for pawn_label in player_to_play.pawns}, game_state.board, True)
+            if not any(distances):
+                possible_play['play_score'] = 1.0
+            elif card_to_play == '2' and 'd' not in pawn_targets:  # the turn continues
+                possible_play['play_score'] = min(self.probe(distances, opponent_distances) for opponent_distances in opponents_distances)
+            else:
+                possible_play['play_score'] = min(1 - self.probe(opponent_distances, distances) for opponent_distances in opponents_distances)
+
+    def close(self):
+        self.mapping.close()
+
+
+endgame_tablebase = None  # the EndgameTablebase computer-controlled players of this process score their endgame plays with (None for not probing one); see load_endgame_tablebase()
+
+
+def load_endgame_tablebase(path):  # has every computer-controlled player of this process score its plays with the endgame tablebase at path whenever the game reaches a position it covers (see EndgameTablebase.score_possible_plays())
+    global endgame_tablebase
+    endgame_tablebase = EndgameTablebase(path)
+
+
+def get_game_record_line(game_state, play):  # returns a line of JSON holding the encoded game state (see encode_game_state()) and the play made from it
+    return json.dumps({'state': base64.b64encode(encode_game_state(game_state)).decode('ascii'), 'play': get_play_for_client(play)}) + '\n'
+
+
+def append_game_record_line(path, line):  # appends a line (see get_game_record_line()) to the game record at path
+    with open(path, 'a') as record_file:
+        record_file.write(line)
+
+
+
+def read_game_record(path):  # yields the game state and the play made from it of each line of the game record at path (see get_game_record_line()); raises ValueError if a line is malformed
+    with open(path) as record_file:
+        for line_number, line in enumerate(record_file, 1):
+            try:
+                entry = json.loads(line)
+                yield decode_game_state(base64.b64decode(entry['state'], validate=True))[0], entry['play']
+            except (ValueError, KeyError, TypeError) as error:
+                raise ValueError(f"{path}, line {line_number}: not a game record entry ({error})") from error
+
+
+analysis_bots = {}  # the bots analyze_game_record() has built in this process, by specification (kept so that, for example, a RolloutEvaluator's statistics carry over from game to game)
+
+
+def analyze_game_record(path, bot_specification='rollouts:64', blunder_threshold=0.1):  # replays the game record at path, rescoring the possible plays of every decision that had more than one with the bot the specification names (see get_bot()); returns the number of such decisions and a list of blunders, JSON-compatible dictionaries describing each play that scored at least blunder_threshold (in the bot's scores, chances of winning for rollouts) below its decision's best play; raises ValueError if the record is malformed
+    if bot_specification not in analysis_bots:
+        analysis_bots[bot_specification] = get_bot(bot_specification)
+    bot = analysis_bots[bot_specification]
+    num_decisions = 0
+    blunders = []
+    for play_number, (game_state, recorded_play) in enumerate(read_game_record(path)):
+        possible_plays = get_possible_plays_for_game_state(game_state, True)
+        play = find_possible_play(possible_plays, recorded_play)
+        if play is None:
+            raise ValueError(f"{path}, play {play_number}: the recorded play is not a possible play")
+        if len(possible_plays) < 2:
+            continue
+        num_decisions += 1
+        if bot is not None:
+            bot.score_possible_plays(game_state, possible_plays)
+        best_play = possible_plays[select_play_with_max_score(possible_plays)]
+        if best_play['play_score'] - play['play_score'] >= blunder_threshold:
+            player_to_play = game_state.players[game_state.players_turn]
+            blunders.append({'game': path, 'play_number': play_number, 'player': player_to_play.name, 'player_type': player_to_play.player_type.value, 'play': get_play_for_client(play), 'score': play['play_score'], 'best_play': get_play_for_client(best_play), 'best_score': best_play['play_score']})
+    return num_decisions, blunders
+
+
+def analyze_game_records(record_directory, bot_specification='rollouts:64', blunder_threshold=0.1, num_workers=0):  # analyzes every game record (.jsonl file) in record_directory (see analyze_game_record()), spreading the games across num_workers worker processes (zero analyzes them in this process); yields the path, number of decisions, blunders, and error message (None unless the record is malformed) of each game as soon as its analysis finishes
+    paths = [os.path.join(record_directory, file_name) for file_name in sorted(os.listdir(record_directory)) if file_name.endswith('.jsonl')]
+    if num_workers <= 0:
+        for path in paths:
+            try:
+                yield (path, *analyze_game_record(path, bot_specification, blunder_threshold), None)
+            except ValueError as error:
+                yield path, 0, [], str(error)
+        return
+    with create_process_pool(num_workers) as executor:
+        paths_by_future = {executor.submit(analyze_game_record, path, bot_specification, blunder_threshold): path for path in paths}
+        for future in concurrent.futures.as_completed(paths_by_future):
+            try:
+                yield (paths_by_future[future], *future.result(), None)
+            except ValueError as error:
+                yield paths_by_future[future], 0, [], str(error)
+
+
+async def serve_sorry_tables(host, port, num_bot_processes, checkpoint_directory=None, record_directory=None, idle_table_timeout=None, turn_latency_target=None):  # runs a SorryServer (resuming any tables checkpointed in checkpoint_directory, recording games in record_directory, making tables idle for idle_table_timeout seconds dormant, and stepping down computer-controlled players' effort to hold turns under turn_latency_target seconds) until interrupted or terminated (SIGTERM, where there is one), stopping its bot processes along with it; returns zero on success
+    executor = create_process_pool(num_bot_processes) if num_bot_processes > 0 else concurrent.futures.ThreadPoolExecutor()
+    bot_turn_scheduler = BotTurnScheduler(executor, num_bot_processes if num_bot_processes > 0 else None, turn_latency_target=turn_latency_target)
+    sorry_server = SorryServer(executor, checkpoint_directory=checkpoint_directory, record_directory=record_directory, idle_table_timeout=idle_table_timeout, bot_turn_scheduler=bot_turn_scheduler)
+    if record_directory is not None:
+        os.makedirs(record_directory, exist_ok=True)
+    if checkpoint_directory is not None:
+        os.makedirs(checkpoint_directory, exist_ok=True)
+        print(f"Resumed {await sorry_server.resume_checkpointed_tables()} checkpointed table(s)")
+    bound_port = await sorry_server.start(host, port)
+    print(f"Hosting Sorry! tables on {host}:{bound_port}")
+    is_terminated = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, is_terminated.set)
+    except NotImplementedError:  # (on Windows)
+        pass
+    try:
+        await is_terminated.wait()  # (the server is already serving)
+    finally:
+        await sorry_server.close()
+        bot_turn_scheduler.cancel_turns()
+        executor.shutdown()  # otherwise bot processes outlive the server
     return 0
 
 
-sorry_boardgame()  # execute
+def get_load_test_rules(variant_specification):  # returns the keyword arguments of new_game_state() (as sent in a create_table message) that a load test variant names: 'standard', 'teams', 'hand:<hand size>', or several of these joined by '+' (such as 'teams+hand:4'); raises ValueError for any other specification
+    rules = {}
+    for part in variant_specification.split('+'):
+        kind, separator, argument = part.partition(':')
+        if kind == 'standard' and not separator:
+            continue
+        elif kind == 'teams' and not separator:
+            rules['are_teams'] = True
+        elif kind == 'hand' and argument.isdigit() and int(argument) <= len(create_draw_pile()) // 4:
+            rules['hand_size'] = int(argument)
+        else:
+            raise ValueError(f"unknown variant {variant_specification!r} (expected standard, teams, hand:<hand size>, or several joined by +)")
+    return rules
+
+
+def get_process_memory(process_id):  # returns the resident set size (in bytes) of the process with the given ID, or None where /proc does not report it
+    try:
+        with open(f"/proc/{process_id}/status") as status_file:
+            for line in status_file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class LoadTestStatistics:  # what the synthetic clients of a load test observed, kept since the last report (see LoadTest.report()) and in total
+    def __init__(self):
+        self.num_turns = 0  # plays made at every table (each counted by one seat of its table)
+        self.num_games = 0
+        self.num_errors = 0  # error messages the server sent any client
+        self.play_latencies = []  # seconds from a client sending a play to being sent the state after it, since the last report
+        self.all_play_latencies = []
+
+
+class LoadTest:  # plays games at many tables of a Sorry! server on this host with synthetic clients (each seated as a human-controlled player, playing a legal play chosen at random from those the server offers, either at once or after a human-paced think), reporting throughput, play latency percentiles, and the server's memory over time
+    def __init__(self, host, port, num_clients, num_computer_seats=0, human_paced_fraction=0.5, think_time=2.0, variants=('standard',), ramp_up_time=5.0, server_process_id=None, seed=None):  # num_clients are spread across tables of 4 - num_computer_seats clients each (the other seats being computer-controlled); each table plays the rule variants (see get_load_test_rules()) in turn; the clients of each table join over ramp_up_time seconds; server_process_id (if provided) is the server process whose memory is reported
+        if not 0 <= num_computer_seats < 4:
+            raise ValueError("a table needs one to four client seats")
+        self.host = host
+        self.port = port
+        self.num_computer_seats = num_computer_seats
+        self.num_tables = math.ceil(num_clients / (4 - num_computer_seats))
+        self.human_paced_fraction = human_paced_fraction
+        self.think_time = think_time
+        self.variants = [get_load_test_rules(variant) for variant in variants]
+        self.ramp_up_time = ramp_up_time
+        self.server_process_id = server_process_id
+        self.random = random.Random(seed)
+        self.statistics = LoadTestStatistics()
+        self.start_time = None
+        self.last_report_time = None
+        self.num_turns_at_last_report = 0
+
+    async def play_seat(self, reader, writer, table_id, seat_letter, is_human_paced, is_counting_turns):  # seats a client at the table and plays for it until the game is over
+        writer.write(json.dumps({'type': 'join', 'table_id': table_id, 'color': seat_letter}).encode() + b'\n')
+        await writer.drain()
+        play_sent_time = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            message = json.loads(line)
+            if message['type'] == 'your_turn':
+                if is_human_paced:
+                    await asyncio.sleep(self.random.expovariate(1 / self.think_time))
+                writer.write(json.dumps({'type': 'play', **self.random.choice(message['possible_plays'])}).encode() + b'\n')
+                await writer.drain()
+                play_sent_time = time.monotonic()
+            elif message['type'] in ['state', 'state_delta'] and 'last_play' in message:
+                self.statistics.num_turns += is_counting_turns
+                if play_sent_time is not None and message['last_player'][0] == seat_letter:
+                    play_latency = time.monotonic() - play_sent_time
+                    self.statistics.play_latencies.append(play_latency)
+                    self.statistics.all_play_latencies.append(play_latency)
+                    play_sent_time = None
+            elif message['type'] == 'game_over':
+                self.statistics.num_games += is_counting_turns
+                return
+            elif message['type'] == 'error':
+                self.statistics.num_errors += 1
+
+    async def play_table(self, table_index):  # plays game after game at a new table each time (cycling through the rule variants), after waiting out the table's share of the ramp up
+        await asyncio.sleep(self.ramp_up_time * table_index / self.num_tables)
+        colors = [Color.BLUE, Color.YELLOW, Color.GREEN, Color.RED]
+        for game_number in itertools.count():
+            connections = [await asyncio.open_connection(self.host, self.port) for color in colors[self.num_computer_seats:]]
+            try:
+                writer = connections[0][1]
+                seats = {color.name.lower(): PlayerType.COMPUTER.value if color_index < self.num_computer_seats else PlayerType.HUMAN.value for color_index, color in enumerate(colors)}
+                writer.write(json.dumps({'type': 'create_table', 'seats': seats, **self.variants[(table_index + game_number) % len(self.variants)]}).encode() + b'\n')
+                await writer.drain()
+                table_id = json.loads(await connections[0][0].readline())['table_id']
+                await asyncio.gather(*[self.play_seat(reader, writer, table_id, color.name[0], self.random.random() < self.human_paced_fraction, seat_index == 0) for seat_index, ((reader, writer), color) in enumerate(zip(connections, colors[self.num_computer_seats:]))])
+            finally:
+                for reader, writer in connections:
+                    writer.close()
+
+    async def get_server_statistics(self):  # returns the server's answer to a stats message (see SorryServer.handle_client())
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(b'{"type": "stats"}\n')
+            await writer.drain()
+            return json.loads(await reader.readline())
+        finally:
+            writer.close()
+
+    async def report(self):  # prints (and returns) one line of what was observed since the last report
+        now = time.monotonic()
+        server_statistics = await self.get_server_statistics()
+        server_memory = get_process_memory(self.server_process_id) if self.server_process_id is not None else None
+        play_latencies = self.statistics.play_latencies
+        report_line = f"{now - self.start_time:7.1f}s  {server_statistics['num_tables']:5} tables  {(self.statistics.num_turns - self.num_turns_at_last_report) / max(now - self.last_report_time, 1e-9):8.1f} turns/s  play latency (ms) p50 {get_percentile(play_latencies, 50) * 1000 if play_latencies else 0:7.1f} p90 {get_percentile(play_latencies, 90) * 1000 if play_latencies else 0:7.1f} p99 {get_percentile(play_latencies, 99) * 1000 if play_latencies else 0:7.1f}  bot decision p99 (ms) {(server_statistics['bot_turns']['decision_time_percentiles']['p99'] or 0) * 1000:7.1f}" + (f"  server memory {server_memory / (1 << 20):7.1f} MiB" if server_memory is not None else "")
+        print(report_line, flush=True)
+        self.statistics.play_latencies = []
+        self.num_turns_at_last_report = self.statistics.num_turns
+        self.last_report_time = now
+        return report_line
+
+    async def run(self, duration, report_interval=5.0):  # plays for duration seconds, reporting every report_interval seconds; returns the LoadTestStatistics
+        self.start_time = self.last_report_time = time.monotonic()
+        table_tasks = [asyncio.ensure_future(self.play_table(table_index)) for table_index in range(self.num_tables)]
+        try:
+            while time.monotonic() - self.start_time < duration:
+                await asyncio.sleep(min(report_interval, duration - (time.monotonic() - self.start_time)))
+                for table_task in table_tasks:
+                    if table_task.done() and not table_task.cancelled() and table_task.exception() is not None:
+                        raise table_task.exception()
+                await self.report()
+        finally:
+            for table_task in table_tasks:
+                table_task.cancel()
+            await asyncio.gather(*table_tasks, return_exceptions=True)
+        return self.statistics
+
+
+def raise_open_file_limit():  # raises this process's (and its future child processes') limit on open files to the most it may be, as every client connection of a load test takes a file descriptor at each end
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return
+    soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit != hard_limit:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard_limit, hard_limit))
+
+
+async def run_load_test(duration, num_clients, port=None, server_arguments=(), report_interval=5.0, **load_test_options):  # runs a LoadTest (with any keyword arguments of LoadTest()) for duration seconds against the server on port of this host, or (if port is None) against a new server process run with the given command-line arguments (such as ['--rollouts', '8', 'serve', '--bot-processes', '4']) and stopped afterwards; returns the LoadTestStatistics
+    raise_open_file_limit()
+    server_process = None
+    if port is None:
+        server_process = await asyncio.create_subprocess_exec(sys.executable, '-u', os.path.abspath(__file__), *server_arguments, '--port', '0', stdout=asyncio.subprocess.PIPE)
+        line = (await server_process.stdout.readline()).decode()
+        if not line.startswith("Hosting"):
+            server_process.kill()
+            raise ValueError(f"the server did not start: {line.strip()!r}")
+        port = int(line.strip().rpartition(':')[2])
+    try:
+        load_test = LoadTest('127.0.0.1', port, num_clients, server_process_id=server_process.pid if server_process is not None else None, **load_test_options)
+        return await load_test.run(duration, report_interval)
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            await server_process.wait()
+
+
+def main():  # parses the command-line arguments and runs the requested mode; returns zero on success and nonzero (some other integer) on failure
+    parser = argparse.ArgumentParser(description="Play the Sorry! boardgame in the console (the default) or in another mode.")
+    parser.add_argument('--checkpoint', help="(when playing in the console) save the game to this file after every turn and offer to resume the game saved there")
+    parser.add_argument('--play-scoring-model', help="score computer-controlled players' plays with the model in this .npz file (requires NumPy; see load_play_scoring_model())")
+    parser.add_argument('--rollouts', type=int, default=0, help="score computer-controlled players' plays by playing out this many games after each (see RolloutEvaluator)")
+    parser.add_argument('--rollout-workers', type=int, default=0, help="play out games in this many worker processes (zero plays them out in the process making the play)")
+    parser.add_argument('--move-time', type=float, help="seconds the play-outs of a computer-controlled turn may take")
+    parser.add_argument('--rollout-table-size', type=int, default=10000, help="positions whose play-out statistics are kept from turn to turn (zero keeps none)")
+    parser.add_argument('--policy-cache', help="(with --rollouts) make the play cached in this file for a position whose plays were played out before, and cache the best play of every position played out (see PolicyCache)")
+    parser.add_argument('--policy-cache-size', type=int, default=10000, help="positions of the policy cache kept in memory (the rest are read from its file as needed)")
+    parser.add_argument('--endgame-tablebase', help="score computer-controlled players' endgame plays with the tablebase in this file (see generate-tablebase)")
+    subparsers = parser.add_subparsers(dest='mode')
+    serve_parser = subparsers.add_parser('serve', help="host many concurrent tables for clients connecting over TCP")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8642)
+    serve_parser.add_argument('--bot-processes', type=int, default=0, help="resolve computer-controlled turns in this many worker processes (zero resolves them in threads)")
+    serve_parser.add_argument('--checkpoint-directory', help="save every table's game here after each play and resume the tables saved here on startup")
+    serve_parser.add_argument('--record-directory', help="record every game's plays here (see analyze)")
+    serve_parser.add_argument('--turn-latency-target', type=float, help="seconds the 99th percentile of computer-controlled turns should stay under; computer-controlled players play out fewer games (or none) when turns run slower, as they do when turns queue up or the CPUs are overloaded")
+    serve_parser.add_argument('--idle-table-timeout', type=float, help="seconds a table may wait on its human-controlled players before its game is only kept in compact encoded form (its checkpoint, with --checkpoint-directory) until its next message arrives")
+    load_test_parser = subparsers.add_parser('load-test', help="play games at many tables of a server on this host with synthetic clients and report turns per second, play latency, and the server's memory over time")
+    load_test_parser.add_argument('--clients', type=int, default=100, help="number of synthetic clients, each seated as a human-controlled player")
+    load_test_parser.add_argument('--duration', type=float, default=60, help="seconds to play for")
+    load_test_parser.add_argument('--port', type=int, help="load the server already listening on this port of this host (its memory is not reported) rather than starting one")
+    load_test_parser.add_argument('--computer-seats', type=int, default=0, help="computer-controlled seats at each table (zero to three), the other seats being the clients'")
+    load_test_parser.add_argument('--human-paced', type=float, default=0.5, metavar='FRACTION', help="fraction of clients that think before each play (for --think-time seconds on average) rather than playing at once")
+    load_test_parser.add_argument('--think-time', type=float, default=2.0)
+    load_test_parser.add_argument('--variants', nargs='+', default=['standard'], help="rule variants the tables take turns playing: standard, teams, hand:<hand size>, or several joined by + (such as teams+hand:4)")
+    load_test_parser.add_argument('--ramp-up', type=float, default=5.0, help="seconds over which the tables are started")
+    load_test_parser.add_argument('--report-interval', type=float, default=5.0)
+    load_test_parser.add_argument('--seed', type=int)
+    load_test_parser.add_argument('--bot-processes', type=int, default=0, help="(for the server started) see serve")
+    load_test_parser.add_argument('--turn-latency-target', type=float, help="(for the server started) see serve")
+    load_test_parser.add_argument('--idle-table-timeout', type=float, help="(for the server started) see serve")
+    load_test_parser.add_argument('--max-p99-latency', type=float, help="exit with a nonzero status if the 99th percentile play latency of the whole test exceeds this many seconds")
+    generate_data_parser = subparsers.add_parser('generate-data', help="write self-play training data from all-computer games to memory-mapped .npy shards")
+    generate_data_parser.add_argument('path_prefix', help="shards are written to <path_prefix>[-w<worker>]-<shard number>.npy")
+    generate_data_parser.add_argument('--games', type=int, default=100)
+    generate_data_parser.add_argument('--workers', type=int, default=1, help="number of processes generating games, each writing its own shards")
+    generate_data_parser.add_argument('--rows-per-shard', type=int, default=1 << 20)
+    generate_data_parser.add_argument('--hand-size', type=int, default=5)
+    generate_data_parser.add_argument('--teams', action='store_true')
+    generate_data_parser.add_argument('--faster-play', action='store_true')
+    simulate_parser = subparsers.add_parser('simulate', help="play all-computer games on the standard board or a larger one and report how fast they were simulated")
+    simulate_parser.add_argument('--sides', type=int, default=4, help="number of sides (and players) of the board, from three to six")
+    simulate_parser.add_argument('--squares-per-side', type=int, help="number of squares along each side of the board (15 on the standard board)")
+    simulate_parser.add_argument('--slides', help="the slides along each side of the board as comma-separated offset:length pairs, offsets counted in squares from the side's first corner (1:3,9:4 on the standard board)")
+    simulate_parser.add_argument('--safety-zone-depth', type=int, help="number of squares of each safety zone (5 on the standard board)")
+    simulate_parser.add_argument('--games', type=int, default=100)
+    simulate_parser.add_argument('--hand-size', type=int, default=5)
+    simulate_parser.add_argument('--teams', action='store_true')
+    simulate_parser.add_argument('--faster-play', action='store_true')
+    simulate_parser.add_argument('--seed', type=int, help="seed the games (so that they can be replayed) with this number")
+    simulate_parser.add_argument('--cross-check', type=float, default=0, metavar='FRACTION', help="(on the standard board) check this fraction of turns' possible plays and outcomes against the reference engine, reporting any divergence")
+    generate_tablebase_parser = subparsers.add_parser('generate-tablebase', help="solve two-player races home from within a dozen squares of it and write the win probabilities to a tablebase file (requires NumPy)")
+    generate_tablebase_parser.add_argument('path')
+    generate_tablebase_parser.add_argument('--workers', type=int, default=0, help="number of processes sharing each value iteration sweep (zero sweeps in this process)")
+    analyze_parser = subparsers.add_parser('analyze', help="flag the plays of recorded games (see serve --record-directory) that score far below the best play by a strong bot")
+    analyze_parser.add_argument('record_directory')
+    analyze_parser.add_argument('--bot', default='rollouts:64', help="bot to rescore every decision with (see ladder)")
+    analyze_parser.add_argument('--threshold', type=float, default=0.1, help="how far below the best play's score (a chance of winning, for rollouts) a play must score to be flagged")
+    analyze_parser.add_argument('--workers', type=int, default=0, help="number of processes analyzing games (zero analyzes them in this process)")
+    ladder_parser = subparsers.add_parser('ladder', help="rate bots against one another in head-to-head matches, each stopped as soon as its result is statistically decided")
+    ladder_parser.add_argument('bots', nargs='+', help="bots to rate: builtin, model:<path of a .npz file>, rollouts:<number of games played out per play>, tablebase:<path of an endgame tablebase>, or threats")
+    ladder_parser.add_argument('--ratings', help="carry the ratings over from (and save them to) this JSON file")
+    ladder_parser.add_argument('--elo0', type=float, default=0, help="Elo difference of the null hypothesis (that the first bot of a match is this much stronger)")
+    ladder_parser.add_argument('--elo1', type=float, default=50, help="Elo difference of the alternative hypothesis")
+    ladder_parser.add_argument('--alpha', type=float, default=0.05)
+    ladder_parser.add_argument('--beta', type=float, default=0.05)
+    ladder_parser.add_argument('--max-games', type=int, default=10000, help="maximum number of games per match")
+    ladder_parser.add_argument('--seed', type=int, default=0)
+    ladder_parser.add_argument('--hand-size', type=int, default=5)
+    ladder_parser.add_argument('--faster-play', action='store_true')
+    arguments = parser.parse_args()
+    if arguments.play_scoring_model is not None:
+        load_play_scoring_model(arguments.play_scoring_model)
+    if arguments.endgame_tablebase is not None:
+        load_endgame_tablebase(arguments.endgame_tablebase)
+    if arguments.rollouts > 0:  # after loading whatever the rollout workers are set up with (see create_process_pool())
+        use_rollout_evaluator(arguments.rollouts, arguments.rollout_workers, arguments.move_time, arguments.rollout_table_size)
+        if arguments.policy_cache is not None:
+            use_policy_cache(arguments.policy_cache, arguments.policy_cache_size)
+    elif arguments.policy_cache is not None:
+        print("a policy cache requires --rollouts")
+        return 1
+    if arguments.mode == 'serve':
+        try:
+            return asyncio.run(serve_sorry_tables(arguments.host, arguments.port, arguments.bot_processes, arguments.checkpoint_directory, arguments.record_directory, arguments.idle_table_timeout, arguments.turn_latency_target))
+        except KeyboardInterrupt:
+            return 0
+    elif arguments.mode == 'load-test':
+        server_arguments = (['--rollouts', str(arguments.rollouts)] if arguments.rollouts > 0 else []) + ['serve', '--bot-processes', str(arguments.bot_processes)] + (['--turn-latency-target', str(arguments.turn_latency_target)] if arguments.turn_latency_target is not None else []) + (['--idle-table-timeout', str(arguments.idle_table_timeout)] if arguments.idle_table_timeout is not None else [])
+        try:
+            statistics = asyncio.run(run_load_test(arguments.duration, arguments.clients, arguments.port, server_arguments, arguments.report_interval, num_computer_seats=arguments.computer_seats, human_paced_fraction=arguments.human_paced, think_time=arguments.think_time, variants=arguments.variants, ramp_up_time=arguments.ramp_up, seed=arguments.seed))
+        except (OSError, ValueError) as error:
+            print(error)
+            return 1
+        play_latency_p99 = get_percentile(statistics.all_play_latencies, 99)
+        print(f"Played {statistics.num_turns} turns ({statistics.num_turns / arguments.duration:.1f} per second) and finished {statistics.num_games} games; 99th percentile play latency {play_latency_p99 * 1000 if play_latency_p99 is not None else 0:.1f} ms; {statistics.num_errors} errors.")
+        return 1 if statistics.num_errors or (arguments.max_p99_latency is not None and play_latency_p99 is not None and play_latency_p99 > arguments.max_p99_latency) else 0
+    elif arguments.mode == 'generate-data':
+        rules = {'hand_size': arguments.hand_size, 'are_teams': arguments.teams, 'is_faster_play': arguments.faster_play}
+        if arguments.workers <= 1:
+            num_rows = generate_self_play_data(arguments.path_prefix, arguments.games, None, arguments.rows_per_shard, **rules)
+        else:
+            with create_process_pool(arguments.workers) as executor:
+                futures = [executor.submit(generate_self_play_data, f"{arguments.path_prefix}-w{worker}", arguments.games // arguments.workers + (worker < arguments.games % arguments.workers), None, arguments.rows_per_shard, **rules) for worker in range(arguments.workers)]
+                num_rows = sum(future.result() for future in futures)
+        print(f"Wrote {num_rows} positions.")
+        return 0
+    elif arguments.mode == 'generate-tablebase':
+        start_time = time.perf_counter()
+        num_sweeps = generate_endgame_tablebase(arguments.path, arguments.workers)
+        print(f"Solved {NUM_ENDGAME_POSITIONS ** 2} endgames in {num_sweeps} sweeps ({time.perf_counter() - start_time:.1f} seconds).")
+        return 0
+    elif arguments.mode == 'analyze':
+        try:
+            analysis_bots[arguments.bot] = get_bot(arguments.bot)  # built here so a bad specification is reported before any game is analyzed (each worker process builds its own)
+        except (OSError, ValueError) as error:
+            print(error)
+            return 1
+        num_games = num_decisions = num_blunders = num_malformed_records = 0
+        for path, num_game_decisions, blunders, error_message in analyze_game_records(arguments.record_directory, arguments.bot, arguments.threshold, arguments.workers):
+            if error_message is not None:
+                print(error_message, file=sys.stderr)
+                num_malformed_records += 1
+                continue
+            for blunder in blunders:
+                print(json.dumps(blunder), flush=True)  # one line per blunder, streamed as each game's analysis finishes
+            num_games += 1
+            num_decisions += num_game_decisions
+            num_blunders += len(blunders)
+        print(f"Analyzed {num_games} games ({num_decisions} decisions): {num_blunders} blunders.", file=sys.stderr)
+        return 1 if num_malformed_records else 0
+    elif arguments.mode == 'ladder':
+        try:
+            bots = {bot_specification: get_bot(bot_specification, arguments.rollout_workers) for bot_specification in arguments.bots}
+        except (OSError, ValueError) as error:
+            print(error)
+            return 1
+        if len(bots) < 2:
+            print("a ladder needs at least two different bots")
+            return 1
+        rating_ladder = RatingLadder(bots, read_ratings(arguments.ratings) if arguments.ratings is not None else None)
+        for match_result in rating_ladder.play_round_robin(elo0=arguments.elo0, elo1=arguments.elo1, alpha=arguments.alpha, beta=arguments.beta, max_games=arguments.max_games, seed=arguments.seed, hand_size=arguments.hand_size, is_faster_play=arguments.faster_play):
+            print(f"{match_result.first_bot_name} vs {match_result.second_bot_name}: {match_result.num_first_bot_wins}-{match_result.num_games - match_result.num_first_bot_wins} after {match_result.num_games} games ({match_result.first_bot_name} is {match_result.outcome.value})")
+            if arguments.ratings is not None:
+                write_ratings(arguments.ratings, rating_ladder.ratings)
+        for bot_name in sorted(bots, key=rating_ladder.ratings.get, reverse=True):
+            print(f"{rating_ladder.ratings[bot_name]:7.1f}  {bot_name}")
+        return 0
+    elif arguments.mode == 'simulate':
+        try:
+            board = get_compiled_board(arguments.sides, arguments.squares_per_side, get_slides(arguments.slides) if arguments.slides is not None else None, arguments.safety_zone_depth)
+        except ValueError as error:
+            print(error)
+            return 1
+        if arguments.cross_check > 0 and board is not STANDARD_BOARD:
+            print("only games on the standard board can be cross-checked against the reference engine")
+            return 1
+        cross_checker = EngineCrossChecker(arguments.cross_check, arguments.seed if arguments.seed is not None else 0) if arguments.cross_check > 0 else None
+        start_time = time.perf_counter()
+        num_plays, victors = simulate_computer_games(arguments.games, board, arguments.seed, cross_checker, hand_size=arguments.hand_size, are_teams=arguments.teams, is_faster_play=arguments.faster_play)
+        elapsed_time = time.perf_counter() - start_time
+        print(f"Played {arguments.games} games ({num_plays} plays) in {elapsed_time:.2f} seconds ({num_plays / max(elapsed_time, 1e-9):.0f} plays per second).")
+        print("Wins: " + ", ".join(f"{victor_name} {num_wins}" for victor_name, num_wins in sorted(victors.items())))
+        if cross_checker is not None:
+            print(f"Cross-checked {cross_checker.num_turns_checked} turns against the reference engine: {cross_checker.num_divergences} divergences.")
+            return 1 if cross_checker.num_divergences else 0
+        return 0
+    return sorry_boardgame(arguments.checkpoint)
+
+
+if __name__ == '__main__':
+    sys.exit(main())  # execute